@@ -0,0 +1,104 @@
+# 代码生成优化遍基准测试 - 统计逐个启用各优化遍后生成代码中的调用数
+#
+# 用法: python benchmarks/bench_codegen_passes.py [设计文件.pqd/.ui ...]
+# 不指定文件时使用一个包含各类控件、部分属性被修改过的表单设计。
+import os
+import re
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QPoint
+
+from components import WIDGET_TYPES
+from designer import DesignCanvas, CodeGenerator
+from codegen_ir import remove_dead_properties, elide_qt_defaults, fuse_calls
+from project import IndexedProject, is_indexed_project, load_legacy_project
+from uifile import iter_ui_records
+
+# 逐个累加的优化遍组合：(名称, Python 优化遍, .ui 优化遍)
+STAGES = [
+    ("不优化", (), ()),
+    ("+删除无效属性", (remove_dead_properties,), (remove_dead_properties,)),
+    ("+省略 Qt 默认值", (remove_dead_properties, elide_qt_defaults),
+     (remove_dead_properties, elide_qt_defaults)),
+    ("+合并调用", (remove_dead_properties, elide_qt_defaults, fuse_calls),
+     (remove_dead_properties, elide_qt_defaults)),
+]
+
+# 生成的 Python 代码中的方法调用（不含构建控件本身）
+PYTHON_CALL = re.compile(r"^\s+self\.\w+\.\w+\(", re.M)
+
+# .ui 文件中设置属性的元素
+UI_CALL = re.compile(r"<(property|attribute|item)\b")
+
+
+def build_form(canvas, count=600):
+    """构建一个表单设计：约五分之一的控件修改了文本，一半数值控件修改了范围"""
+    types = [t for t in WIDGET_TYPES if t != "QTableWidget"]
+    for i in range(count):
+        widget_type = types[i % len(types)]
+        widget = canvas.create_widget(widget_type, QPoint((i % 20) * 220, (i // 20) * 200))
+        info = canvas.widgets[-1]
+        properties = info["properties"]
+        edits = {}
+        if i % 5 == 0 and "text" in properties:
+            edits["text"] = f"字段{i}"
+        if (i // len(types)) % 2 == 0 and "maximum" in properties:
+            edits["minimum"], edits["maximum"] = 10, 1000
+        if i % 4 == 0 and widget_type == "QGroupBox":
+            edits["checkable"], edits["checked"] = True, True
+        for prop_name, value in edits.items():
+            properties[prop_name] = value
+            canvas.apply_property(widget, prop_name, value)
+
+
+def load_design(canvas, file_name):
+    """把 .pqd 或 .ui 设计文件加载到画布"""
+    if file_name.endswith(".ui"):
+        records = list(iter_ui_records(file_name))
+    elif is_indexed_project(file_name):
+        project = IndexedProject(file_name)
+        records = [record for _, record in project.read_records(project.entries)]
+    else:
+        records = load_legacy_project(file_name)
+    canvas.load_records([(None, record) for record in records])
+
+
+def main():
+    app = QApplication(sys.argv)
+    designs = sys.argv[1:] or [None]
+
+    for design in designs:
+        canvas = DesignCanvas()
+        if design is None:
+            build_form(canvas)
+            name = "示例表单"
+        else:
+            load_design(canvas, design)
+            name = os.path.basename(design)
+        generator = CodeGenerator(canvas)
+
+        print(f"{name}: {len(canvas.widgets)} 个控件")
+        print(f"{'优化遍':16s} {'Python 调用':>12s} {'.ui 属性':>10s} {'生成时间':>10s}")
+        baseline = None
+        for stage, python_passes, ui_passes in STAGES:
+            generator.python_passes = python_passes
+            generator.ui_passes = ui_passes
+            start = time.perf_counter()
+            python_code = generator.generate_python_code()
+            ui_code = generator.generate_ui_code()
+            elapsed = time.perf_counter() - start
+            counts = (len(PYTHON_CALL.findall(python_code)), len(UI_CALL.findall(ui_code)))
+            baseline = baseline or counts
+            print(f"{stage:16s} {counts[0]:12d} {counts[1]:10d} {elapsed * 1000:8.1f}ms")
+        print(f"Python 调用减少 {100 * (1 - counts[0] / baseline[0]):.1f}%，"
+              f".ui 属性减少 {100 * (1 - counts[1] / baseline[1]):.1f}%")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# 拖拽预览基准测试 - 比较开始拖拽时创建临时控件并绘制预览图与查表取得缓存预览图的耗时，
+# 以及启动后空闲时预热的总耗时和单次最长耗时
+#
+# 用法: python benchmarks/bench_drag_preview.py [每种类型的重复次数]
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PyQt5.QtWidgets import QApplication
+
+import components
+from components import WIDGET_TYPES, WidgetBox, render_drag_pixmap
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    app = QApplication(sys.argv)
+    types = list(WIDGET_TYPES)
+
+    # 原来的做法：每次开始拖拽都创建临时控件读取建议尺寸，再从头绘制预览图
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for widget_type in types:
+            components._SIZE_HINTS.clear()
+            render_drag_pixmap(widget_type)
+            app.processEvents()  # 删除临时控件
+    uncached = (time.perf_counter() - start) / (repeat * len(types))
+
+    # 空闲时预热：每次定时器触发绘制一张
+    components._SIZE_HINTS.clear()
+    components._DRAG_PIXMAPS.clear()
+    box = WidgetBox()
+    ticks = []
+    box.start_warmup()
+    while box.warmup_timer.isActive():
+        start = time.perf_counter()
+        box._warm_up_next()
+        ticks.append(time.perf_counter() - start)
+
+    # 预热之后：开始拖拽时查表
+    start = time.perf_counter()
+    for _ in range(repeat * 100):
+        for widget_type in types:
+            box.drag_pixmap(widget_type)
+    cached = (time.perf_counter() - start) / (repeat * 100 * len(types))
+
+    print(f"{len(types)} 种控件类型")
+    print(f"创建临时控件并绘制: 每次开始拖拽 {uncached * 1000:.3f} ms")
+    print(f"空闲预热: 共 {sum(ticks) * 1000:.1f} ms，分 {len(ticks)} 次，单次最长 {max(ticks) * 1000:.3f} ms")
+    print(f"查表取得缓存预览图: 每次开始拖拽 {cached * 1e6:.2f} us（{uncached / cached:.0f}x）")
+
+
+if __name__ == "__main__":
+    main()
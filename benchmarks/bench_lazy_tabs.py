@@ -0,0 +1,81 @@
+# 选项卡延迟构建基准测试 - 比较生成代码中一次构建全部页面与首次切换时才构建页面
+# 两种方式下窗口的构建时间
+#
+# 用法: python benchmarks/bench_lazy_tabs.py [页数] [每页控件数]
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PyQt5.QtWidgets import QApplication
+
+from designer import DesignCanvas, CodeGenerator
+
+# 页面中轮流放置的控件类型
+PAGE_WIDGET_TYPES = ["QPushButton", "QLabel", "QLineEdit", "QCheckBox", "QComboBox", "QSpinBox"]
+
+
+def build_canvas(pages, per_page):
+    """构建一个选项卡控件，每页放置 per_page 个控件"""
+    records = [{"uid": 1, "widget_type": "QTabWidget", "parent": None,
+                "properties": {"geometry": {"x": 0, "y": 0, "width": 1200, "height": 900}}}]
+    uid = 2
+    for page in range(pages):
+        for i in range(per_page):
+            records.append({
+                "uid": uid,
+                "widget_type": PAGE_WIDGET_TYPES[i % len(PAGE_WIDGET_TYPES)],
+                "parent": 1,
+                "page": page,
+                "properties": {"geometry": {"x": (i % 10) * 110, "y": 30 + (i // 10) * 35}},
+            })
+            uid += 1
+    canvas = DesignCanvas()
+    canvas.load_records([(None, record) for record in records])
+    return canvas
+
+
+def time_window(app, source):
+    """执行生成的模块并返回 (构建窗口并显示的时间, 切换到最后一页的时间)"""
+    namespace = {"__name__": "generated"}
+    exec(compile(source, "generated.py", "exec"), namespace)
+
+    start = time.perf_counter()
+    window = namespace["MyWindow"]()
+    window.show()
+    app.processEvents()
+    first_window = time.perf_counter() - start
+
+    tab = window.qtabwidget_1
+    start = time.perf_counter()
+    tab.setCurrentIndex(tab.count() - 1)
+    app.processEvents()
+    switch = time.perf_counter() - start
+
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return first_window, switch
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    per_page = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    app = QApplication(sys.argv)
+    generator = CodeGenerator(build_canvas(pages, per_page))
+
+    print(f"页数: {pages}，每页控件数: {per_page}")
+    results = {}
+    for name, lazy_tabs in (("全部构建", False), ("延迟构建", True)):
+        results[name] = time_window(app, generator.generate_python_code(lazy_tabs=lazy_tabs))
+        first_window, switch = results[name]
+        print(f"{name:8s} 首个窗口 {first_window * 1000:8.1f} ms   切换到最后一页 {switch * 1000:8.1f} ms")
+
+    eager, lazy = results["全部构建"][0], results["延迟构建"][0]
+    print(f"首个窗口显示加快 {eager / lazy:.1f} 倍")
+
+
+if __name__ == "__main__":
+    main()
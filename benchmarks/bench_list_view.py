@@ -0,0 +1,83 @@
+# 大型列表基准测试 - 比较把列表项放进属性再 addItems() 的 QListWidget 与
+# 从列表项文件按需读取的 QListView + LazyListModel 的创建时间和内存增长
+#
+# 用法: python benchmarks/bench_list_view.py [列表项数 ...]
+import gc
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PyQt5.QtWidgets import QApplication
+
+from components import WidgetFactory
+
+
+def rss_kb():
+    """当前进程的常驻内存（KB），无法读取时返回 0"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def build_list_widget(item_file):
+    """原有方式：列表项读入属性，再 clear() + addItems()"""
+    with open(item_file, encoding="utf-8") as f:
+        items = f.read().splitlines()
+    widget = WidgetFactory.create_widget("QListWidget")
+    widget.clear()
+    widget.addItems(items)
+    return widget
+
+
+def build_list_view(item_file):
+    """数据列表控件：模型只保存各行在文件中的偏移"""
+    widget = WidgetFactory.create_widget("QListView")
+    widget.model().setItemFile(item_file)
+    return widget
+
+
+def measure(app, build, item_file):
+    """返回 (创建并显示到最后一项的耗时, 内存增长 KB)"""
+    gc.collect()
+    before = rss_kb()
+    start = time.perf_counter()
+    widget = build(item_file)
+    widget.resize(300, 400)
+    widget.show()
+    widget.scrollToBottom()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    growth = rss_kb() - before
+    widget.close()
+    widget.deleteLater()
+    app.processEvents()
+    return elapsed, growth
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [5000, 50000, 500000]
+    app = QApplication(sys.argv)
+
+    print(f"{'列表项数':>8s} {'QListWidget':>22s} {'QListView + 模型':>22s}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in counts:
+            item_file = os.path.join(tmp, f"items{count}.txt")
+            with open(item_file, "w", encoding="utf-8") as f:
+                f.writelines(f"列表项 {i}\n" for i in range(count))
+            results = [measure(app, build, item_file)
+                       for build in (build_list_widget, build_list_view)]
+            print(f"{count:8d} " + " ".join(f"{t * 1000:10.1f}ms {kb / 1024:8.1f}MB"
+                                            for t, kb in results))
+
+
+if __name__ == "__main__":
+    main()
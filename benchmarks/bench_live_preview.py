@@ -0,0 +1,86 @@
+# 实时预览基准测试 - 比较增量刷新与完整重建预览的耗时，以及同一帧内多次变更的合并
+#
+# 用法: python benchmarks/bench_live_preview.py [控件数量 ...]
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QPoint
+
+from components import WIDGET_TYPES
+from designer import DesignCanvas
+from preview import PreviewWindow
+
+# 每次测量的编辑次数
+EDITS = 200
+
+
+def build_canvas(count):
+    """构建包含 count 个控件的画布"""
+    canvas = DesignCanvas()
+    types = [t for t in WIDGET_TYPES if t != "QTableWidget"]
+    for i in range(count):
+        canvas.create_widget(types[i % len(types)], QPoint((i % 100) * 160, (i // 100) * 60))
+    return canvas
+
+
+def edit(canvas, info, n):
+    """模拟在属性编辑器中修改一个属性"""
+    prop_name = "text" if "text" in info['properties'] else "objectName"
+    info['properties'][prop_name] = f"编辑{n}"
+    canvas.widget_changed.emit(info['widget'])
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [500, 2000, 5000]
+    app = QApplication(sys.argv)
+
+    print(f"{'控件数':>8s} {'首次构建':>10s} {'完整重建':>10s} {'增量刷新':>10s} {'加快':>8s}")
+    for count in counts:
+        canvas = build_canvas(count)
+
+        start = time.perf_counter()
+        preview = PreviewWindow(canvas)
+        preview.show()
+        app.processEvents()
+        first_build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        preview.rebuild()
+        app.processEvents()
+        rebuild = time.perf_counter() - start
+
+        # 每次编辑一个控件后刷新并处理重绘
+        infos = canvas.widgets
+        start = time.perf_counter()
+        for n in range(EDITS):
+            edit(canvas, infos[(n * 37) % count], n)
+            preview.refresh()
+            app.processEvents()
+        incremental = (time.perf_counter() - start) / EDITS
+        print(f"{count:8d} {first_build * 1000:8.1f}ms {rebuild * 1000:8.1f}ms "
+              f"{incremental * 1000:8.3f}ms {rebuild / incremental:7.0f}x")
+
+        # 拖动时同一帧内的多次变更只触发一次刷新
+        refreshes = []
+        preview.timer.timeout.connect(lambda: refreshes.append(preview.last_refresh))
+        for n in range(EDITS):
+            edit(canvas, infos[0], n)
+        deadline = time.perf_counter() + 0.2
+        while time.perf_counter() < deadline:
+            app.processEvents()
+        print(f"{'':8s} 同一帧内 {EDITS} 次变更 -> {len(refreshes)} 次刷新，"
+              f"共处理 {sum(refreshes)} 个控件")
+
+        preview.close()
+        preview.deleteLater()
+        canvas.deleteLater()
+        app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
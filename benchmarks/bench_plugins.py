@@ -0,0 +1,98 @@
+# 插件注册表基准测试 - 比较启动时只读取插件清单与导入全部插件模块的耗时，
+# 以及第一次放置插件控件（此时才导入其模块）的耗时
+#
+# 用法: python benchmarks/bench_plugins.py [插件数量] [每个模块的导入工作量]
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, ROOT)
+
+# 模拟较重的插件模块：导入时构建数据表
+MODULE_TEMPLATE = '''from PyQt5.QtWidgets import QLabel
+
+_TABLE = [i * i for i in range({work})]
+
+
+class {name}(QLabel):
+    def __init__(self, parent=None):
+        super().__init__("{name}", parent)
+
+    def setValue(self, value):
+        self.setText(f"{name}: {{value}}")
+'''
+
+
+def make_plugins(directory, count, work):
+    """生成 count 个插件清单及其模块，每个插件提供一个控件类型"""
+    package = os.path.join(directory, "bench_widgets")
+    os.makedirs(package)
+    open(os.path.join(package, "__init__.py"), "w").close()
+    for n in range(count):
+        name = f"BenchWidget{n}"
+        with open(os.path.join(package, f"w{n}.py"), "w", encoding="utf-8") as f:
+            f.write(MODULE_TEMPLATE.format(name=name, work=work))
+        manifest = {"module": f"bench_widgets.w{n}",
+                    "widgets": [{"class": name, "icon": "🧩", "text": f"插件控件{n}",
+                                 "size": [120, 40], "properties": {"value": 0}}]}
+        with open(os.path.join(directory, f"w{n}.plugin.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+
+def run_startup(directory, eager):
+    """在当前（全新的）进程中模拟启动：读取清单、可选地导入全部模块、创建控件工具箱"""
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QPoint
+    app = QApplication(sys.argv)
+    from components import WidgetBox, load_plugins
+    from designer import DesignCanvas
+    from plugins import PLUGINS
+
+    start = time.perf_counter()
+    load_plugins([directory])
+    if eager:
+        PLUGINS.import_all()
+    WidgetBox()
+    startup = time.perf_counter() - start
+
+    canvas = DesignCanvas()
+    start = time.perf_counter()
+    canvas.create_widget("BenchWidget0", QPoint(10, 10))
+    first_drop = time.perf_counter() - start
+    start = time.perf_counter()
+    canvas.create_widget("BenchWidget0", QPoint(10, 60))
+    second_drop = time.perf_counter() - start
+    imported = sum(plugin.module is not None for plugin in PLUGINS.plugins)
+    print(json.dumps([startup, first_drop, second_drop, imported, PLUGINS.scan_time]))
+
+
+def measure(directory, eager):
+    output = subprocess.run([sys.executable, __file__, "--run", directory, "eager" if eager else "lazy"],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--run":
+        run_startup(sys.argv[2], sys.argv[3] == "eager")
+        return
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    work = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    with tempfile.TemporaryDirectory() as directory:
+        make_plugins(directory, count, work)
+        print(f"{count} 个插件，每个模块导入时构建 {work} 项的数据表")
+        print(f"{'':10s} {'启动':>10s} {'读取清单':>10s} {'首次放置':>10s} {'再次放置':>10s} {'已导入':>6s}")
+        for label, eager in (("全部导入", True), ("按需导入", False)):
+            startup, first, second, imported, scan = measure(directory, eager)
+            print(f"{label:10s} {startup * 1000:8.1f}ms {scan * 1000:8.1f}ms "
+                  f"{first * 1000:8.2f}ms {second * 1000:8.2f}ms {imported:6d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# 项目文件基准测试 - 比较完整属性与省略默认值两种保存方式的文件大小，以及加载时调用的
+# 属性设置方法数：原来的加载方式对每个属性调用一次，现在只对与默认值不同的属性调用
+#
+# 加载时两种文件都先与默认模板比较、省略默认值，设置调用数相同，因此不比较两种文件的加载时间
+#
+# 用法: python benchmarks/bench_project.py [控件数量]
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QPoint
+
+from components import WIDGET_TYPES
+from designer import DesignCanvas
+from project import IndexedProject, encode_properties, dump_record, write_project
+
+
+def build_canvas(count):
+    """构建包含 count 个控件的画布，约十分之一的控件修改了文本"""
+    canvas = DesignCanvas()
+    types = [t for t in WIDGET_TYPES if t != "QTableWidget"]
+    for i in range(count):
+        widget_type = types[i % len(types)]
+        widget = canvas.create_widget(widget_type, QPoint((i % 100) * 160, (i // 100) * 60))
+        if i % 10 == 0 and "text" in canvas.widgets[-1]["properties"]:
+            canvas.widgets[-1]["properties"]["text"] = f"控件{i}"
+            canvas.apply_property(widget, "text", f"控件{i}")
+    return canvas
+
+
+def full_records(canvas):
+    """不省略默认值的记录（旧的保存方式）"""
+    records = {}
+    for w in canvas.widgets:
+        record = canvas.widget_record(w)
+        record["properties"] = encode_properties(w["properties"])
+        records[w["uid"]] = (dump_record(record), record)
+    return records
+
+
+def count_setter_calls(file_name):
+    """从项目文件批量加载全部控件，返回 (加载时间, 设置方法调用数, 原来的加载方式的调用数)
+
+    原来的加载方式对记录补全后的每个属性都调用一次设置方法。
+    """
+    canvas = DesignCanvas()
+    calls = 0
+    apply_property = canvas.apply_property
+
+    def counting_apply_property(widget, prop_name, value):
+        nonlocal calls
+        calls += 1
+        apply_property(widget, prop_name, value)
+
+    canvas.apply_property = counting_apply_property
+    start = time.perf_counter()
+    project = IndexedProject(file_name)
+    canvas.load_records(project.read_records(project.entries))
+    elapsed = time.perf_counter() - start
+    baseline = sum(len(w["properties"]) for w in canvas.widgets)
+    for w in canvas.widgets:
+        w["widget"].deleteLater()
+    return elapsed, calls, baseline
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    app = QApplication(sys.argv)
+    canvas = build_canvas(count)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sizes = {}
+        for name, records in (("完整属性", full_records(canvas)),
+                              ("省略默认值", canvas.collect_records())):
+            file_name = os.path.join(tmp, name + ".pqd")
+            write_project(file_name, records)
+            sizes[name] = os.path.getsize(file_name)
+        elapsed, calls, baseline = count_setter_calls(file_name)
+        app.processEvents()
+
+    print(f"控件数量: {count}")
+    for name, size in sizes.items():
+        print(f"{name:8s} 文件大小 {size / 1024:10.1f} KB")
+    full_size, lean_size = sizes.values()
+    print(f"文件缩小 {100 * (1 - lean_size / full_size):.1f}%")
+    print(f"加载 {elapsed * 1000:.1f} ms，设置方法调用 {calls} 次"
+          f"（原来的加载方式 {baseline} 次，减少 {100 * (1 - calls / baseline):.1f}%）")
+
+
+if __name__ == "__main__":
+    main()
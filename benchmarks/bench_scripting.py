@@ -0,0 +1,112 @@
+# 脚本接口基准测试 - 通过 scripting.Design 批量创建、修改、删除、保存控件并生成代码的吞吐量，
+# 以及事务对有监听者时的影响（事务中的修改只通知一次）。只有生成代码需要 PyQt5
+#
+# 用法: python benchmarks/bench_scripting.py [控件数量]
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from scripting import Design
+
+TYPES = ["QPushButton", "QLabel", "QLineEdit", "QCheckBox", "QComboBox", "QSpinBox", "QSlider"]
+
+
+def build(design, count):
+    """每 20 个控件放进一个分组框，其余控件位于顶层"""
+    box = None
+    for n in range(count):
+        if n % 20 == 0:
+            box = design.add("QGroupBox", 10 + 320 * (n // 20 % 10), 10 + 220 * (n // 200), 300, 200,
+                             title=f"分组{n}")
+        else:
+            design.add(TYPES[n % len(TYPES)], 20 + 320 * (n // 20 % 10), 10 + 220 * (n // 200) + n % 20 * 9,
+                       parent=box, text=f"控件{n}")
+
+
+def timed(label, count, function):
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    print(f"{label:24s} {elapsed * 1000:9.1f} ms  {count / elapsed:10.0f} 个/s")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{count} 个控件")
+
+    design = Design()
+    timed("添加", count, lambda: build(design, count))
+
+    design = Design()
+    def build_in_transaction():
+        with design.transaction():
+            build(design, count)
+    timed("添加（事务）", count, build_in_transaction)
+
+    notified = []
+    listener = lambda changed, removed: notified.append(len(changed) + len(removed))
+    listening = Design()
+    listening.listeners.append(listener)
+    timed("添加（有监听者）", count, lambda: build(listening, count))
+    calls = len(notified)
+    listening = Design()
+    listening.listeners.append(listener)
+    def build_listening_in_transaction():
+        with listening.transaction():
+            build(listening, count)
+    timed("添加（有监听者，事务）", count, build_listening_in_transaction)
+    print(f"    通知次数：逐个 {calls}，事务 {len(notified) - calls}")
+
+    uids = [record["uid"] for record in design]
+    def set_text():
+        with design.transaction():
+            for uid in uids:
+                design.set_property(uid, "toolTip", f"提示{uid}")
+    timed("设置属性（事务）", count, set_text)
+
+    def move_all():
+        with design.transaction():
+            for uid in uids:
+                x, y = design.get(uid)["properties"]["geometry"]["x"], design.get(uid)["properties"]["geometry"]["y"]
+                if design.get(uid)["parent"] is None:
+                    design.move(uid, x + 5, y + 5)
+    timed("移动顶层控件（事务）", count, move_all)
+
+    def rollback():
+        try:
+            with design.transaction():
+                for uid in uids:
+                    design.set_property(uid, "enabled", False)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+    timed("设置属性后撤销", count, rollback)
+
+    with tempfile.TemporaryDirectory() as directory:
+        project = os.path.join(directory, "design.pqd")
+        timed("保存", count, lambda: design.save(project))
+        opened = timed("打开", count, lambda: Design.open(project))
+        print(f"    文件 {os.path.getsize(project) / 1024 / 1024:.1f} MB，读回 {len(opened)} 个控件")
+        try:
+            import PyQt5.QtWidgets   # noqa: F401
+        except ImportError:
+            print("未安装 PyQt5，跳过生成代码")
+        else:
+            timed("生成 Python 代码", count,
+                  lambda: design.generate("py", os.path.join(directory, "design.py")))
+            timed("生成 Python 代码（数据表）", count,
+                  lambda: design.generate("py", os.path.join(directory, "table.py"), table=True))
+            timed("生成 .ui 文件", count, lambda: design.generate("ui", os.path.join(directory, "design.ui")))
+
+    def delete_all():
+        with design.transaction():
+            design.clear()
+    timed("删除全部（事务）", count, delete_all)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# 启动基准测试 - 在子进程中按 main.py 的方式启动设计器，测量从启动进程到主窗口第一次绘制
+# （首帧）和到控件库、属性编辑器、代码生成器全部就绪的耗时
+#
+# 用法: python benchmarks/bench_startup.py [启动次数]
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# 子进程：替换 QApplication.exec_，在首帧和全部就绪时记录时间后退出
+CHILD = r"""
+import sys, time, json
+sys.argv = ["main.py"]
+import main
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QEvent
+
+times = {"imported": time.time()}
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and "first_frame" not in times:
+            times["first_frame"] = time.time()
+        return False
+
+def ready(window):
+    return (getattr(window, "property_editor", None) is not None
+            and getattr(window, "code_generator", None) is not None
+            and window.widget_box.model().rowCount() > 0)
+
+def exec_(app):
+    window = next(w for w in app.topLevelWidgets() if isinstance(w, main.PyQtDesigner))
+    times["window"] = time.time()
+    window.installEventFilter(watcher)
+    while "first_frame" not in times or not ready(window):
+        app.processEvents()
+    times["ready"] = time.time()
+    print(json.dumps(times))
+    return 0
+
+watcher = FirstPaint()
+QApplication.exec_ = exec_
+try:
+    main.main()
+except SystemExit:
+    pass
+"""
+
+
+def launch():
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    start = time.time()
+    output = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    times = json.loads(output.strip().splitlines()[-1])
+    return {name: value - start for name, value in times.items()}
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    launch()   # 预热：生成 .pyc 和缩略图缓存
+    runs = [launch() for _ in range(repeat)]
+    print(f"启动 {repeat} 次（从启动进程开始计时，取中位数）")
+    for name, label in (("imported", "导入完成"), ("window", "创建主窗口"),
+                        ("first_frame", "首帧"), ("ready", "全部就绪")):
+        values = sorted(run[name] for run in runs)
+        print(f"{label:6s}: {values[len(values) // 2] * 1000:7.1f} ms  "
+              f"(最快 {values[0] * 1000:.1f}，最慢 {values[-1] * 1000:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# 大型表格基准测试 - 比较逐单元格创建条目的 QTableWidget 与按需生成数据的
+# QTableView + LazyTableModel 在不同行数下的创建时间和内存增长
+#
+# 用法: python benchmarks/bench_table_view.py [行数 ...]
+import gc
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PyQt5.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+
+from components import WidgetFactory
+
+# 表格列数
+COLUMNS = 4
+
+
+def rss_kb():
+    """当前进程的常驻内存（KB），无法读取时返回 0"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def build_table_widget(rows):
+    """每个单元格一个 QTableWidgetItem"""
+    widget = QTableWidget(rows, COLUMNS)
+    for i in range(rows):
+        for j in range(COLUMNS):
+            widget.setItem(i, j, QTableWidgetItem(f"({i},{j})"))
+    return widget
+
+
+def build_table_view(rows):
+    """设计器中的数据表格控件：模型只保存行数和列数"""
+    widget = WidgetFactory.create_widget("QTableView")
+    widget.model().setRowCount(rows)
+    widget.model().setColumnCount(COLUMNS)
+    return widget
+
+
+def measure(app, build, rows):
+    """返回 (创建并显示到最后一行的耗时, 内存增长 KB)"""
+    gc.collect()
+    before = rss_kb()
+    start = time.perf_counter()
+    widget = build(rows)
+    widget.resize(600, 400)
+    widget.show()
+    widget.scrollToBottom()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    growth = rss_kb() - before
+    widget.close()
+    widget.deleteLater()
+    app.processEvents()
+    return elapsed, growth
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    app = QApplication(sys.argv)
+
+    print(f"{'行数':>8s} {'QTableWidget':>22s} {'QTableView + 模型':>22s}")
+    for rows in counts:
+        results = [measure(app, build, rows) for build in (build_table_widget, build_table_view)]
+        print(f"{rows:8d} " + " ".join(f"{t * 1000:10.1f}ms {kb / 1024:8.1f}MB" for t, kb in results))
+
+
+if __name__ == "__main__":
+    main()
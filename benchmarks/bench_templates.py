@@ -0,0 +1,109 @@
+# 组合模板基准测试 - 比较逐个放置模板中的控件（每个控件选中一次、播放一次放置动画、
+# 刷新一次属性编辑器和画布）与经 load_records 批量创建整个模板的耗时
+#
+# 用法: python benchmarks/bench_templates.py [模板中的控件数量] [放置次数]
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PyQt5.QtWidgets import QApplication, QMainWindow
+from PyQt5.QtCore import QPoint, QRect, QPropertyAnimation, QEasingCurve
+
+from designer import DesignCanvas, PropertyEditor
+from templates import Template
+
+# 模板中的表单行：标签、输入控件
+ROW_TYPES = [("QLabel", "QLineEdit"), ("QLabel", "QComboBox"), ("QLabel", "QSpinBox"),
+             ("QCheckBox", "QPushButton")]
+
+
+def make_template(count):
+    """一个分组框及其中的 count - 1 个表单控件，两列排列"""
+    records = [{"uid": 1, "widget_type": "QGroupBox", "parent": None,
+                "properties": {"title": "表单",
+                               "geometry": {"x": 0, "y": 0, "width": 320, "height": 40 + 20 * count}}}]
+    for n in range(count - 1):
+        widget_type = ROW_TYPES[(n // 2) % len(ROW_TYPES)][n % 2]
+        properties = {"geometry": {"x": 10 + 150 * (n % 2), "y": 30 + 40 * (n // 2),
+                                   "width": 140, "height": 30}}
+        if widget_type in ("QLabel", "QCheckBox", "QPushButton"):
+            properties["text"] = f"字段{n}"
+        records.append({"uid": n + 2, "widget_type": widget_type, "parent": 1,
+                        "properties": properties})
+    return Template.from_records("表单", records)
+
+
+def make_canvas():
+    """画布和连接到其选中信号的属性编辑器（属性编辑器通过所在窗口的 canvas 属性查找画布）"""
+    window = QMainWindow()
+    window.canvas = DesignCanvas()
+    window.canvas.resize(1600, 1200)
+    window.setCentralWidget(window.canvas)
+    editor = PropertyEditor(window)
+    window.canvas.widget_selected.connect(editor.update_properties)
+    window.show()
+    return window
+
+
+def drop_one_by_one(app, canvas, template, origin):
+    """原来的做法：模板中的控件逐个经 dropEvent 的路径放到画布上"""
+    for record in template.instantiate(origin, canvas.next_uid):
+        x, y, width, height = (record["properties"]["geometry"][k] for k in ("x", "y", "width", "height"))
+        widget = canvas.create_widget(record["widget_type"], QPoint(x, y))
+        properties = canvas.materialize_properties(record["widget_type"], record["properties"])
+        for prop_name, value in properties.items():
+            if prop_name != "geometry":
+                canvas.apply_property(widget, prop_name, value)
+        animation = QPropertyAnimation(widget, b"geometry", widget)
+        animation.setDuration(200)
+        animation.setStartValue(QRect(x - 5, y - 5, width + 10, height + 10))
+        animation.setEndValue(QRect(x, y, width, height))
+        animation.setEasingCurve(QEasingCurve.OutBack)
+        animation.start()
+        canvas.update()
+        app.processEvents()
+
+
+def drop_batched(app, canvas, template, origin):
+    canvas.instantiate_template(template, QPoint(*origin))
+    app.processEvents()
+
+
+def measure(app, template, drop, repeat):
+    window = make_canvas()
+    canvas = window.canvas
+    app.processEvents()
+    start = time.perf_counter()
+    for n in range(repeat):
+        drop(app, canvas, template, (20 + 330 * (n % 4), 20 + 20 * n))
+    elapsed = (time.perf_counter() - start) / repeat
+    count = len(canvas.widgets)
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return elapsed, count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    app = QApplication(sys.argv)
+    template = make_template(count)
+
+    # 预热：控件类型的默认属性模板等按类型缓存的数据
+    measure(app, template, drop_batched, 1)
+
+    print(f"模板含 {count} 个控件，放置 {repeat} 次")
+    results = {}
+    for label, drop in (("逐个放置", drop_one_by_one), ("批量创建", drop_batched)):
+        elapsed, total = measure(app, template, drop, repeat)
+        results[label] = elapsed
+        print(f"{label}: 每次放置 {elapsed * 1000:.1f} ms（画布上共 {total} 个控件）")
+    print(f"加速 {results['逐个放置'] / results['批量创建']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
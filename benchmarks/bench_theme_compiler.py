@@ -0,0 +1,87 @@
+# 主题编译基准测试 - 比较变量展开后未精简的样式表（与原来手写的样式表相同）和编译后的样式表
+# 在 Qt 中解析、应用的耗时，以及编译主题定义（不使用缓存、读取磁盘缓存、内存缓存）的耗时
+#
+# 用法: python benchmarks/bench_theme_compiler.py [解析次数] [画布控件数量]
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+import theme_compiler
+from theme_compiler import ThemeCompiler, compile_source, parse_theme, resolve_variables, substitute
+from styles import DARK_THEME, BLOCKS_LIGHT_THEME
+from bench_theme_switch import make_window, make_records
+
+
+def expand_source(source):
+    """只展开变量、去掉变量定义，不去重也不精简"""
+    variables = resolve_variables(parse_theme(source)[0])
+    lines = [line for line in source.splitlines() if not theme_compiler.DEFINITION_RE.fullmatch(line)]
+    return substitute("\n".join(lines), variables)
+
+
+def measure(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def parse_time(app, sheet, repeat):
+    """新控件设置样式表并完成样式匹配（每次都重新解析样式表）"""
+    def parse():
+        widget = QWidget()
+        widget.setStyleSheet(sheet)
+        widget.ensurePolished()
+    return measure(parse, repeat)
+
+
+def apply_time(app, sheet, window):
+    """主窗口（含画布上的控件）设置样式表并重绘"""
+    start = time.perf_counter()
+    window.setStyleSheet(sheet)
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    window.setStyleSheet("")
+    app.processEvents()
+    return elapsed
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    window = make_window()
+    window.show()
+    window.canvas.load_records(make_records(count))
+    app.processEvents()
+
+    for name, source in (("深色", DARK_THEME), ("浅色", BLOCKS_LIGHT_THEME)):
+        raw = expand_source(source)
+        compiled = compile_source(source)
+        print(f"{name}主题：样式表 {len(raw)} -> {len(compiled)} 字节")
+        for label, sheet in (("未编译", raw), ("编译后", compiled)):
+            parse = parse_time(app, sheet, repeat)
+            apply = min(apply_time(app, sheet, window) for _ in range(3))
+            print(f"  {label}: 解析并匹配 {parse * 1000:.3f} ms  应用到主窗口（{count} 个画布控件）"
+                  f"{apply * 1000:8.1f} ms")
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold = measure(lambda: compile_source(source), 20)
+            ThemeCompiler(cache_dir).compile(source)
+            disk = measure(lambda: ThemeCompiler(cache_dir).compile(source), 20)
+            compiler = ThemeCompiler(cache_dir)
+            compiler.compile(source)
+            memory = measure(lambda: compiler.compile(source), 1000)
+        print(f"  编译：不使用缓存 {cold * 1000:.3f} ms  读取磁盘缓存 {disk * 1000:.3f} ms  "
+              f"内存缓存 {memory * 1000:.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
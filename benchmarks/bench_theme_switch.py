@@ -0,0 +1,134 @@
+# 主题切换基准测试 - 画布上有大量控件时切换界面主题的耗时（含重绘），以及在该主题方式下
+# 加载画布控件的耗时。比较三种方式：
+#   样式表      原来的做法：主窗口设置整套样式表，切换时替换整套样式表（画布控件一并重新匹配）
+#   外框样式表  应用程序级别设置一次两条不含颜色的外框规则，切换时替换调色板，并重新应用
+#               画布以外控件的样式（设置了样式表的控件不再跟随调色板）
+#   调色板      不设置样式表，切换时只替换调色板（设计器采用的方式）
+#
+# 用法: python benchmarks/bench_theme_switch.py [控件数量] [切换次数]
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, ROOT)
+
+TYPES = ["QPushButton", "QLabel", "QLineEdit", "QCheckBox", "QComboBox", "QSpinBox", "QSlider"]
+
+MODES = ("stylesheet", "chrome-stylesheet", "palette")
+LABELS = {"stylesheet": "样式表", "chrome-stylesheet": "外框样式表", "palette": "调色板"}
+
+# “外框样式表”方式使用的规则
+CHROME_STYLESHEET = """
+QMainWindow > QToolBar { spacing: 3px; }
+QDockWidget::title { text-align: left; padding-left: 5px; }
+"""
+
+
+def make_records(count):
+    return [(None, {"uid": n + 1, "widget_type": TYPES[n % len(TYPES)],
+                    "properties": {"geometry": {"x": 10 + 110 * (n % 40), "y": 10 + 40 * (n // 40),
+                                                "width": 100, "height": 30}}})
+            for n in range(count)]
+
+
+def make_window():
+    """与设计器主窗口结构相同的界面：菜单、工具栏、控件库、属性编辑器和滚动区域中的画布"""
+    from PyQt5.QtWidgets import QMainWindow, QDockWidget, QScrollArea, QToolBar
+    from PyQt5.QtCore import Qt
+    from components import WidgetBox
+    from designer import DesignCanvas, PropertyEditor
+
+    window = QMainWindow()
+    for title in ("文件", "代码", "插件", "模板", "视图"):
+        menu = window.menuBar().addMenu(title)
+        for n in range(4):
+            menu.addAction(f"{title}{n}")
+    toolbar = QToolBar()
+    for n in range(8):
+        toolbar.addAction(f"动作{n}")
+    window.addToolBar(toolbar)
+    window.canvas = DesignCanvas()
+    scroll = QScrollArea()
+    scroll.setWidget(window.canvas)
+    scroll.setWidgetResizable(True)
+    window.setCentralWidget(scroll)
+    for area, widget in ((Qt.LeftDockWidgetArea, WidgetBox()), (Qt.RightDockWidgetArea, PropertyEditor())):
+        dock = QDockWidget("停靠窗口", window)
+        dock.setWidget(widget)
+        window.addDockWidget(area, dock)
+    window.resize(1200, 800)
+    return window
+
+
+def repolish(app, skip):
+    """重新应用 skip 以外全部控件的样式"""
+    style = app.style()
+    stack = [w for w in app.topLevelWidgets() if w is not skip]
+    while stack:
+        widget = stack.pop()
+        style.unpolish(widget)
+        style.polish(widget)
+        widget.update()
+        stack.extend(child for child in widget.children() if child.isWidgetType() and child is not skip)
+
+
+def run(mode, count, repeat):
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    from styles import DARK_STYLESHEET, BLOCKS_LIGHT_STYLESHEET, apply_theme
+
+    window = make_window()
+    if mode == "stylesheet":
+        window.setStyleSheet(BLOCKS_LIGHT_STYLESHEET)
+    elif mode == "chrome-stylesheet":
+        apply_theme(app, "light")
+        app.setStyleSheet(CHROME_STYLESHEET)
+    else:
+        apply_theme(app, "light")
+    window.show()
+    app.processEvents()
+
+    start = time.perf_counter()
+    window.canvas.load_records(make_records(count))
+    app.processEvents()
+    load = time.perf_counter() - start
+
+    times = []
+    for n in range(repeat):
+        name = "dark" if n % 2 == 0 else "light"
+        start = time.perf_counter()
+        if mode == "stylesheet":
+            window.setStyleSheet(DARK_STYLESHEET if name == "dark" else BLOCKS_LIGHT_STYLESHEET)
+        elif mode == "chrome-stylesheet":
+            apply_theme(app, name)
+            repolish(app, window.canvas)
+        else:
+            apply_theme(app, name)
+        app.processEvents()
+        times.append(time.perf_counter() - start)
+    print(json.dumps([load, sum(times) / len(times), max(times)]))
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--run":
+        run(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+        return
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    print(f"画布上 {count} 个控件，切换主题 {repeat} 次（含重绘）")
+    for mode in MODES:
+        output = subprocess.run([sys.executable, __file__, "--run", mode, str(count), str(repeat)],
+                                capture_output=True, text=True, check=True).stdout
+        load, average, worst = json.loads(output.strip().splitlines()[-1])
+        print(f"{LABELS[mode]:6s}: 切换平均 {average * 1000:8.1f} ms  最慢 {worst * 1000:8.1f} ms  "
+              f"加载控件 {load * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
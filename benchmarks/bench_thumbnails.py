@@ -0,0 +1,78 @@
+# 控件缩略图基准测试 - 首次启动（空闲时分片渲染并在后台写入磁盘缓存）与再次启动
+# （在后台线程中读取磁盘缓存）时得到全部缩略图的耗时，以及界面线程单次最长的阻塞时间
+#
+# 用法: python benchmarks/bench_thumbnails.py [控件类型数量]
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PyQt5.QtWidgets import QApplication
+
+import components
+from components import WIDGET_TYPES, WidgetFactory
+from thumbnails import ThumbnailCache, THUMBNAIL_SIZE, render_thumbnail
+
+
+def make_types(count):
+    """内置控件类型，以及复用内置构造函数注册的更多控件类型，共 count 个"""
+    builtin = list(WIDGET_TYPES)
+    types = list(builtin)
+    n = 0
+    while len(types) < count:
+        base = builtin[n % len(builtin)]
+        widget_type = f"Bench{base}{n}"
+        template = WidgetFactory.get_default_properties(base)
+        del template["objectName"], template["geometry"]
+        WidgetFactory.register(widget_type, components._CONSTRUCTORS[base], template,
+                               WidgetFactory.default_size(base))
+        types.append(widget_type)
+        n += 1
+    return types
+
+
+def collect(app, cache, types):
+    """请求全部缩略图并处理事件直到全部就绪，返回 (耗时, 事件处理单次最长耗时)"""
+    ready = set()
+    cache.thumbnail_ready.connect(lambda widget_type, image: ready.add(widget_type))
+    longest = 0.0
+    start = time.perf_counter()
+    cache.request(types)
+    while len(ready) < len(types):
+        tick = time.perf_counter()
+        app.processEvents()
+        longest = max(longest, time.perf_counter() - tick)
+    elapsed = time.perf_counter() - start
+    cache.wait()
+    return elapsed, longest
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    app = QApplication(sys.argv)
+    types = make_types(count)
+
+    # 原来的做法：启动时在界面线程中一次性渲染全部缩略图
+    start = time.perf_counter()
+    for widget_type in types:
+        render_thumbnail(widget_type, THUMBNAIL_SIZE)
+    app.processEvents()
+    blocking = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold, cold_longest = collect(app, ThumbnailCache(cache_dir), types)
+        warm_cache = ThumbnailCache(cache_dir)
+        warm, warm_longest = collect(app, warm_cache, types)
+
+    print(f"{len(types)} 种控件类型")
+    print(f"启动时同步渲染:   界面线程阻塞 {blocking * 1000:.1f} ms")
+    print(f"首次启动（分片）: 全部就绪 {cold * 1000:.1f} ms，界面线程单次最长 {cold_longest * 1000:.1f} ms")
+    print(f"再次启动（磁盘）: 全部就绪 {warm * 1000:.1f} ms，界面线程单次最长 {warm_longest * 1000:.1f} ms，"
+          f"渲染 {warm_cache.rendered} 张")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# .ui 导出基准测试 - 比较流式 XML 写入器与原先字符串拼接方式的速度和内存峰值
+#
+# 用法: python benchmarks/bench_ui_export.py [控件数量]
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QPoint
+
+from components import WIDGET_TYPES
+from designer import DesignCanvas, CodeGenerator
+
+
+def string_ui_code(canvas):
+    """原先的实现：f-string 拼接整个文件（不转义，只输出 text/placeholderText/checked）"""
+    ui_code = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<ui version="4.0">',
+        ' <class>MainWindow</class>',
+        ' <widget class="QMainWindow" name="MainWindow">',
+        '  <widget class="QWidget" name="centralwidget">',
+    ]
+    for i, w in enumerate(canvas.widgets):
+        widget = w['widget']
+        widget_type = w['widget_type']
+        properties = w['properties']
+        geometry = properties.get('geometry')
+        obj_name = properties.get('objectName') or f"{widget_type.lower()}_{i+1}"
+        ui_code.extend([
+            f'   <widget class="{widget_type}" name="{obj_name}">',
+            '    <property name="geometry">',
+            '     <rect>',
+            f'      <x>{geometry.x()}</x>',
+            f'      <y>{geometry.y()}</y>',
+            f'      <width>{geometry.width()}</width>',
+            f'      <height>{geometry.height()}</height>',
+            '     </rect>',
+            '    </property>',
+        ])
+        if 'text' in properties and hasattr(widget, 'text'):
+            ui_code.extend(['    <property name="text">',
+                            f'     <string>{properties["text"]}</string>',
+                            '    </property>'])
+        if 'placeholderText' in properties and hasattr(widget, 'placeholderText'):
+            ui_code.extend(['    <property name="placeholderText">',
+                            f'     <string>{properties["placeholderText"]}</string>',
+                            '    </property>'])
+        if 'checked' in properties and hasattr(widget, 'isChecked'):
+            ui_code.extend(['    <property name="checked">',
+                            f'     <bool>{"true" if properties["checked"] else "false"}</bool>',
+                            '    </property>'])
+        ui_code.append('   </widget>')
+    ui_code.extend(['  </widget>', ' </widget>', '</ui>'])
+    return "\n".join(ui_code)
+
+
+def measure(name, func, setup=lambda: None):
+    """分别测量函数的耗时和 Python 内存分配峰值（tracemalloc 会拖慢计时，因此分两次运行）"""
+    setup()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    setup()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:24s} 耗时 {elapsed * 1000:8.1f} ms   内存峰值 {peak / 1024 / 1024:7.2f} MB")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    app = QApplication(sys.argv)
+    canvas = DesignCanvas()
+    types = [t for t in WIDGET_TYPES if t != "QTableWidget"]
+    for i in range(count):
+        canvas.create_widget(types[i % len(types)], QPoint((i % 100) * 160, (i // 100) * 60))
+    generator = CodeGenerator(canvas)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_file = os.path.join(tmp, "string.ui")
+        new_file = os.path.join(tmp, "stream.ui")
+
+        def write_string():
+            with open(old_file, "w", encoding="utf-8") as f:
+                f.write(string_ui_code(canvas))
+
+        print(f"控件数量: {count}")
+        measure("字符串拼接", write_string)
+        measure("流式写入（无缓存）", lambda: generator.write_ui_code(new_file),
+                setup=lambda: generator.fragment_cache["ui"].clear())
+        measure("流式写入（片段已缓存）", lambda: generator.write_ui_code(new_file))
+        print(f"文件大小: 字符串拼接 {os.path.getsize(old_file) / 1024:.0f} KB，"
+              f"流式写入 {os.path.getsize(new_file) / 1024:.0f} KB（包含全部属性）")
+
+
+if __name__ == "__main__":
+    main()
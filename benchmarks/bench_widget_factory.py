@@ -0,0 +1,51 @@
+# 控件工厂基准测试 - 默认属性实例化、默认尺寸查询和拖拽移动事件的耗时
+#
+# 用法: python benchmarks/bench_widget_factory.py [次数]
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, QPoint, QMimeData
+from PyQt5.QtGui import QDragMoveEvent
+
+from components import WIDGET_TYPES, WidgetFactory
+from designer import DesignCanvas
+
+
+def per_call(func, count):
+    """func 每次调用的平均耗时（微秒）"""
+    start = time.perf_counter()
+    for i in range(count):
+        func(i)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    app = QApplication(sys.argv)
+    types = list(WIDGET_TYPES)
+
+    print(f"get_default_properties: "
+          f"{per_call(lambda i: WidgetFactory.get_default_properties(types[i % len(types)]), count):.2f} us")
+    print(f"default_size:           "
+          f"{per_call(lambda i: WidgetFactory.default_size(types[i % len(types)]), count):.2f} us")
+
+    # 拖拽移动事件：画布收到同一类型控件的连续移动事件
+    canvas = DesignCanvas()
+    canvas.resize(2000, 2000)
+    mime = QMimeData()
+    mime.setText("QListWidget")
+    canvas.drag_widget_type = "QListWidget"
+    events = [QDragMoveEvent(QPoint(i % 1000, i % 700), Qt.CopyAction, mime,
+                             Qt.LeftButton, Qt.NoModifier) for i in range(1000)]
+    canvas.dragMoveEvent(events[0])
+    print(f"dragMoveEvent:          "
+          f"{per_call(lambda i: canvas.dragMoveEvent(events[i % len(events)]), count // 10):.2f} us")
+
+
+if __name__ == "__main__":
+    main()
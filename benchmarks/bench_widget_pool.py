@@ -0,0 +1,100 @@
+# 控件对象池基准测试 - 反复清空画布并重新加载同一个项目（新建项目后重新打开），
+# 比较原来逐个删除并销毁控件、批量清空但不使用对象池、批量清空并使用对象池的耗时，
+# 以及逐个放置控件的耗时。销毁控件的耗时包括执行 deleteLater 和之后的重绘
+#
+# 用法: python benchmarks/bench_widget_pool.py [控件数量] [重复次数]
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QPoint, QEvent
+
+from designer import DesignCanvas
+from widget_pool import POOL_MEMORY_BUDGET
+
+TYPES = ["QPushButton", "QLabel", "QLineEdit", "QCheckBox", "QComboBox", "QSpinBox", "QSlider"]
+
+
+def make_records(count):
+    records = []
+    for n in range(count):
+        widget_type = TYPES[n % len(TYPES)]
+        properties = {"geometry": {"x": 10 + 110 * (n % 40), "y": 10 + 40 * (n // 40),
+                                   "width": 100, "height": 30}}
+        if widget_type in ("QPushButton", "QLabel", "QCheckBox"):
+            properties["text"] = f"控件{n}"
+        records.append((None, {"uid": n + 1, "widget_type": widget_type, "properties": properties}))
+    return records
+
+
+def delete_one_by_one(canvas):
+    """原来新建项目的做法：逐个删除画布上的控件"""
+    for w in canvas.widgets[::]:
+        canvas.delete_widget(w["widget"])
+
+
+def settle(app):
+    """执行 deleteLater 和重绘"""
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    app.processEvents()
+
+
+def run(app, records, repeat, clear, budget):
+    canvas = DesignCanvas()
+    canvas.pool.budget = budget
+    canvas.resize(4500, 40 * (len(records) // 40 + 2))
+    canvas.show()
+    canvas.load_records(records)
+    app.processEvents()
+
+    clear_time = load_time = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        clear(canvas)
+        settle(app)
+        clear_time += time.perf_counter() - start
+        start = time.perf_counter()
+        canvas.load_records(records)
+        app.processEvents()
+        load_time += time.perf_counter() - start
+
+    # 清空后空闲补足，再逐个放置控件
+    clear(canvas)
+    settle(app)
+    while canvas.pool.timer.isActive():
+        app.processEvents()
+    start = time.perf_counter()
+    for n in range(200):
+        canvas.create_widget(TYPES[n % len(TYPES)], QPoint(10 + 110 * (n % 40), 10 + 40 * (n // 40)))
+    drop_time = (time.perf_counter() - start) / 200
+
+    stats = (canvas.pool.hits, canvas.pool.misses, canvas.pool.memory)
+    canvas.pool.clear()
+    canvas.deleteLater()
+    settle(app)
+    return clear_time / repeat, load_time / repeat, drop_time, stats
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    app = QApplication(sys.argv)
+    records = make_records(count)
+
+    print(f"{count} 个控件，清空并重新加载 {repeat} 次")
+    for label, clear, pool_budget in (("逐个删除", delete_one_by_one, 0),
+                                      ("批量清空", DesignCanvas.clear_widgets, 0),
+                                      ("批量清空+对象池", DesignCanvas.clear_widgets, POOL_MEMORY_BUDGET)):
+        clear_time, load_time, drop_time, (hits, misses, memory) = run(app, records, repeat, clear,
+                                                                       pool_budget)
+        print(f"{label:8s}: 清空 {clear_time * 1000:7.1f} ms  重新加载 {load_time * 1000:7.1f} ms  "
+              f"合计 {(clear_time + load_time) * 1000:7.1f} ms  放置一个控件 {drop_time * 1000:.3f} ms  "
+              f"(命中 {hits}，新建 {misses}，池中 {memory / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# 控件库搜索基准测试 - 在包含大量控件类型的控件库中逐字输入查询，
+# 比较索引搜索与逐项线性扫描每次按键的耗时（含列表模型更新和视图重新布局）
+#
+# 用法: python benchmarks/bench_widget_search.py [控件类型数量]
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PyQt5.QtWidgets import QApplication
+
+from components import WIDGET_TYPES, WidgetBox
+
+# 逐字输入的查询：类名前缀、中文显示文本、描述中的词、模糊缩写和不存在的名称
+QUERIES = ["qpushbutton", "按钮", "table", "仪表盘", "数据", "qlv", "gauge12", "nothing"]
+
+# 生成插件控件类型用的名称片段
+KINDS = [("Gauge", "仪表盘", "显示数值的仪表"), ("Chart", "图表", "绘制数据曲线"),
+         ("Map", "地图", "显示地理位置"), ("Meter", "计量条", "显示进度和容量"),
+         ("Badge", "徽标", "显示计数的小标记"), ("Timeline", "时间轴", "按时间排列的事件")]
+
+
+def make_types(count):
+    """内置控件类型加上生成的插件控件类型，共 count 个"""
+    types = dict(WIDGET_TYPES)
+    n = 0
+    while len(types) < count:
+        name, text, description = KINDS[n % len(KINDS)]
+        types[f"Acme{name}{n}"] = {"icon": "🧩", "text": f"{text}{n}", "description": description}
+        n += 1
+    return types
+
+
+def is_subsequence(query, text):
+    """query 中的字符是否按顺序出现在 text 中"""
+    chars = iter(text)
+    return all(char in chars for char in query)
+
+
+def linear_search(types, query):
+    """不用索引：逐项比较类型名、显示文本和描述"""
+    query = query.lower()
+    matches = []
+    for n, (widget_type, info) in enumerate(types.items()):
+        name, text = widget_type.lower(), info["text"].lower()
+        if name.startswith(query) or text.startswith(query):
+            matches.append((1, n))
+        elif query in name or query in text:
+            matches.append((2, n))
+        elif query in info["description"].lower():
+            matches.append((3, n))
+        elif is_subsequence(query, name) or is_subsequence(query, text):
+            matches.append((4, n))
+    matches.sort()
+    return [n for _, n in matches]
+
+
+def type_queries(app, box, search):
+    """逐字输入每个查询，返回 (每次按键的平均耗时, 最大耗时)"""
+    times = []
+    for query in QUERIES:
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            box.model().set_rows(search(query[:end]))
+            # 同步完成的布局（分批布局时为第一批）
+            box.doItemsLayout()
+            times.append(time.perf_counter() - start)
+        box.set_filter("")
+        app.processEvents()
+    return sum(times) / len(times), max(times)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    app = QApplication(sys.argv)
+    types = make_types(count)
+
+    start = time.perf_counter()
+    box = WidgetBox(types=types)
+    build = time.perf_counter() - start
+    box.resize(220, 600)
+    box.show()
+    app.processEvents()
+    print(f"{len(types)} 个控件类型，创建控件库（含建立索引）{build * 1000:.1f} ms")
+
+    for label, search in (("线性扫描", lambda q: linear_search(types, q)),
+                          ("索引搜索", box.index.search)):
+        average, worst = type_queries(app, box, search)
+        print(f"{label}: 每次按键平均 {average * 1000:.3f} ms，最慢 {worst * 1000:.3f} ms")
+
+    for query in QUERIES[:4]:
+        top = [box.index.types[n] for n in box.index.search(query)[:3]]
+        print(f"  {query!r}: {', '.join(top)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# 代码生成中间表示 - 控件构建节点、属性设置节点和可插拔的优化遍
+#
+# 每个控件对应一个 WidgetIR：一个构建节点加按顺序排列的属性设置节点。
+# 优化遍逐个控件改写节点列表，Python 和 .ui 两个后端都从优化后的节点输出，
+# 因此优化结果可以按控件缓存。本模块不依赖 Qt，可在无界面环境中使用。
+from project import encode_value, geometry_tuple
+
+# 各控件类在 Qt 中新建时的属性值（已编码形式），与之相同的设置调用可以省略
+QT_COMMON_DEFAULTS = {
+    "objectName": "",
+    "enabled": True,
+}
+
+QT_DEFAULTS = {
+    "QPushButton": {"text": ""},
+    "QLabel": {"text": "", "alignment": 0x0081, "wordWrap": False},
+    "QLineEdit": {"text": "", "placeholderText": "", "maxLength": 32767, "readOnly": False},
+    "QTextEdit": {"plainText": "", "html": "", "placeholderText": "", "readOnly": False},
+    "QCheckBox": {"text": "", "checked": False, "tristate": False},
+    "QRadioButton": {"text": "", "checked": False},
+    # 添加列表项后自动选中第一项，没有列表项时设置当前项无效
+    "QComboBox": {"items": [], "currentIndex": 0, "editable": False},
+    "QSpinBox": {"minimum": 0, "maximum": 99, "value": 0, "prefix": "", "suffix": ""},
+    "QSlider": {"minimum": 0, "maximum": 99, "value": 0, "orientation": "vertical",
+                "tickPosition": "NoTicks"},
+    "QGroupBox": {"title": "", "checkable": False, "checked": False},
+    # 页面在属性设置之后添加，添加第一页时自动成为当前页
+    "QTabWidget": {"currentIndex": 0, "tabPosition": "North", "tabsClosable": False},
+    "QTableWidget": {"rowCount": 0, "columnCount": 0,
+                     "horizontalHeaderVisible": True, "verticalHeaderVisible": True},
+    "QTableView": {"horizontalHeaderVisible": True, "verticalHeaderVisible": True},
+    "QListWidget": {"items": [], "currentRow": -1, "sortingEnabled": False},
+    "QListView": {"uniformItemSizes": False, "layoutMode": "SinglePass", "batchSize": 100},
+}
+
+# 取值被限制在范围内的属性 -> (最小值属性, 最大值属性)：新建时的默认值不在设计的范围内时，
+# Qt 会把值调整到范围内，因此只有默认值在范围内时才能省略这些属性的设置
+RANGE_CLAMPED = {
+    "value": ("minimum", "maximum"),
+}
+
+# 可以合并为一次调用的属性组：(属性, ...) -> 合并后的方法名
+FUSED_CALLS = [
+    (("minimum", "maximum"), "setRange"),
+]
+
+
+class Construct:
+    """构建节点 - 创建控件并放到父控件（或选项卡页面）中的指定位置"""
+
+    __slots__ = ("widget_type", "name", "object_name", "parent", "page", "geometry", "tab_pages")
+
+    def __init__(self, widget_type, name, object_name="", parent=None, page=None,
+                 geometry=(0, 0, 0, 0), tab_pages=0):
+        self.widget_type = widget_type
+        self.name = name                # 生成代码中的属性名
+        self.object_name = object_name  # objectName 属性，.ui 中为空时使用 name
+        self.parent = parent            # 父控件的属性名，顶层控件为 None
+        self.page = page                # 所在的选项卡页码
+        self.geometry = geometry        # 相对父控件的 (x, y, 宽, 高)
+        self.tab_pages = tab_pages      # 选项卡控件的页数
+
+
+class SetProperty:
+    """属性设置节点"""
+
+    __slots__ = ("name", "value")
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+    def __repr__(self):
+        return f"SetProperty({self.name!r}, {self.value!r})"
+
+
+class Call:
+    """合并后的方法调用节点 - 一次调用设置多个属性"""
+
+    __slots__ = ("method", "properties", "values")
+
+    def __init__(self, method, properties, values):
+        self.method = method
+        self.properties = properties  # 被合并的属性名
+        self.values = values          # 对应的属性值
+
+    def __repr__(self):
+        return f"Call({self.method!r}, {self.values!r})"
+
+
+class WidgetIR:
+    """一个控件的中间表示"""
+
+    __slots__ = ("construct", "nodes")
+
+    def __init__(self, construct, nodes):
+        self.construct = construct
+        self.nodes = nodes
+
+    def call_count(self):
+        """生成代码中的调用数（构建和几何各算一次）"""
+        return 2 + len(self.nodes)
+
+
+def build_widget_ir(widget_type, name, properties, parent=None, page=None, origin=(0, 0),
+                    tab_pages=0):
+    """由控件属性（已编码或 Qt 对象均可）构建中间表示，属性按原有顺序排列"""
+    x, y, width, height = geometry_tuple(properties.get("geometry"))
+    construct = Construct(widget_type, name, properties.get("objectName") or "", parent, page,
+                          (x - origin[0], y - origin[1], width, height), tab_pages)
+    nodes = [SetProperty(prop_name, value) for prop_name, value in properties.items()
+             if prop_name != "geometry"]
+    return WidgetIR(construct, nodes)
+
+
+def remove_dead_properties(ir):
+    """删除无效的属性设置：无法表示的空值、被后面的设置覆盖的值、不可勾选分组框的勾选状态"""
+    last = {}
+    for position, node in enumerate(ir.nodes):
+        if isinstance(node, SetProperty):
+            last[node.name] = position
+
+    values = {node.name: node.value for node in ir.nodes if isinstance(node, SetProperty)}
+    nodes = []
+    for position, node in enumerate(ir.nodes):
+        if isinstance(node, SetProperty):
+            if node.value is None or last[node.name] != position:
+                continue
+            if (node.name == "checked" and ir.construct.widget_type == "QGroupBox" and
+                    not values.get("checkable")):
+                continue
+        nodes.append(node)
+    ir.nodes = nodes
+    return ir
+
+
+def elide_qt_defaults(ir):
+    """删除与 Qt 中控件新建时的默认值相同的属性设置"""
+    defaults = QT_DEFAULTS.get(ir.construct.widget_type, {})
+    missing = object()
+    values = {node.name: node.value for node in ir.nodes if isinstance(node, SetProperty)}
+
+    def in_range(name, default):
+        minimum, maximum = (encode_value(values.get(bound, defaults.get(bound)))
+                            for bound in RANGE_CLAMPED[name])
+        try:
+            return minimum <= default <= maximum
+        except TypeError:
+            return False
+
+    def is_default(node):
+        default = defaults.get(node.name, QT_COMMON_DEFAULTS.get(node.name, missing))
+        if default is missing:
+            return False
+        if node.name in RANGE_CLAMPED and not in_range(node.name, default):
+            return False
+        value = encode_value(node.value)
+        if node.name == "orientation" and isinstance(value, str):
+            return value.lower() == default
+        return type(value) is type(default) and value == default
+
+    ir.nodes = [node for node in ir.nodes
+                if not (isinstance(node, SetProperty) and is_default(node))]
+    return ir
+
+
+def fuse_calls(ir):
+    """将可以一次设置的属性（如最小值和最大值）合并为一个调用，放在第一个属性的位置
+
+    只合并 Qt 内置控件的属性，自定义（插件）控件不一定提供合并后的方法。
+    """
+    if ir.construct.widget_type not in QT_DEFAULTS:
+        return ir
+    for group, method in FUSED_CALLS:
+        positions = [i for i, node in enumerate(ir.nodes)
+                     if isinstance(node, SetProperty) and node.name in group]
+        if len(positions) != len(group):
+            continue
+        values = {ir.nodes[i].name: ir.nodes[i].value for i in positions}
+        fused = Call(method, group, tuple(values[name] for name in group))
+        nodes = []
+        for i, node in enumerate(ir.nodes):
+            if i == positions[0]:
+                nodes.append(fused)
+            elif i not in positions:
+                nodes.append(node)
+        ir.nodes = nodes
+    return ir
+
+
+# 各后端默认使用的优化遍（按顺序执行）；.ui 文件只能表示单个属性，不做调用合并
+PYTHON_PASSES = (remove_dead_properties, elide_qt_defaults, fuse_calls)
+UI_PASSES = (remove_dead_properties, elide_qt_defaults)
+
+
+def run_passes(ir, passes):
+    """依次执行优化遍"""
+    for optimization in passes:
+        ir = optimization(ir)
+    return ir
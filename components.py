@@ -1,275 +1,877 @@
+import re
 import sys
+from array import array
+from types import MappingProxyType
 from PyQt5.QtWidgets import (QListWidget, QListWidgetItem, QWidget, QLabel, QPushButton, QVBoxLayout,
                               QLineEdit, QTextEdit, QCheckBox, QRadioButton, QComboBox, QSpinBox,
-                              QSlider, QGroupBox, QTabWidget, QTableWidget, QScrollArea, QGridLayout,
+                              QSlider, QGroupBox, QTabWidget, QTableWidget, QTableWidgetItem,
+                              QTableView, QHeaderView, QListView, QScrollArea, QGridLayout,
                               QSizePolicy, QSpacerItem, QMenu)
-from PyQt5.QtCore import Qt, QMimeData, QSize, QRect, QPoint, pyqtSignal, QEvent
-from PyQt5.QtGui import QDrag, QPixmap, QPainter, QPen, QColor, QCursor, QLinearGradient, QFont
-
-# 可用的控件类型 - 积木库
-WIDGET_TYPES = {
-    "QPushButton": {"icon": "🔘", "text": "按钮", "description": "可点击的按钮控件"},
-    "QLabel": {"icon": "🏷️", "text": "标签", "description": "显示文本或图像的标签"},
-    "QLineEdit": {"icon": "📝", "text": "单行文本框", "description": "输入单行文本的控件"},
-    "QTextEdit": {"icon": "📄", "text": "多行文本框", "description": "输入多行文本的控件"},
-    "QCheckBox": {"icon": "✅", "text": "复选框", "description": "可选中/取消选中的控件"},
-    "QRadioButton": {"icon": "⭕", "text": "单选按钮", "description": "互斥选择的单选按钮"},
-    "QComboBox": {"icon": "📋", "text": "下拉框", "description": "下拉选择控件"},
-    "QSpinBox": {"icon": "🔢", "text": "数字输入", "description": "输入数值的控件"},
-    "QSlider": {"icon": "📊", "text": "滑块", "description": "滑动选择数值的控件"},
-    "QGroupBox": {"icon": "📦", "text": "分组框", "description": "对控件进行分组的容器"},
-    "QTabWidget": {"icon": "📑", "text": "选项卡", "description": "带标签页切换的容器"},
-    "QTableWidget": {"icon": "🗓️", "text": "表格", "description": "表格数据控件"},
-    "QListWidget": {"icon": "📜", "text": "列表", "description": "列表数据控件"},
+from PyQt5.QtCore import (Qt, QMimeData, QSize, QRect, QPoint, QTimer, pyqtSignal, QEvent,
+                          QAbstractTableModel, QAbstractListModel, QModelIndex)
+from PyQt5.QtGui import (QDrag, QPixmap, QPainter, QPen, QColor, QCursor, QLinearGradient, QFont,
+                         QPalette)
+
+from project import encode_properties
+from plugins import PLUGINS, plugin_dirs
+from templates import TEMPLATES
+from widget_types import (WIDGET_TYPES, CONTAINER_TYPES, TAB_PAGE_COUNT, MODEL_TYPES, MODEL_PROPERTIES,
+                          DEFAULT_SIZE, DEFAULT_SIZES, tab_page_title)
+
+# 列表项文件每次读取的行数（读取时打开文件，读完即关闭）
+ITEM_BLOCK_SIZE = 256
+
+
+class LazyTableModel(QAbstractTableModel):
+    """按需生成单元格数据的表格模型 - 只保存行数和列数，视图请求哪个单元格才生成哪个，
+    内存占用与行数无关。重写 cell() 可以改为从文件或数据库按需读取"""
+    
+    def __init__(self, rows=0, columns=0, parent=None):
+        super().__init__(parent)
+        self.rows = rows
+        self.columns = columns
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.rows
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.columns
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self.cell(index.row(), index.column())
+        return None
+    
+    def cell(self, row, column):
+        """单元格的显示数据"""
+        return f"({row},{column})"
+    
+    def setRowCount(self, rows):
+        """修改行数（与 QTableWidget 的接口一致）"""
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+    
+    def setColumnCount(self, columns):
+        """修改列数（与 QTableWidget 的接口一致）"""
+        self.beginResetModel()
+        self.columns = columns
+        self.endResetModel()
+
+
+class ItemFile:
+    """列表项文件（每行一项）- 只保存各行的偏移，列表项在显示时按块读取
+    
+    每次读取一块（ITEM_BLOCK_SIZE 行）时打开文件，读完即关闭，不长期占用文件；
+    只保留当前块，内存占用与文件大小无关。
+    """
+    
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.offsets = array("q")
+        offset = 0
+        with open(file_name, "rb") as f:
+            for line in f:
+                self.offsets.append(offset)
+                offset += len(line)
+        self.offsets.append(offset)  # 文件末尾
+        self._block_start = -1
+        self._block = []
+    
+    def __len__(self):
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, row):
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        start = row - row % ITEM_BLOCK_SIZE
+        if start != self._block_start:
+            end = min(start + ITEM_BLOCK_SIZE, len(self))
+            with open(self.file_name, "rb") as f:
+                f.seek(self.offsets[start])
+                data = f.read(self.offsets[end] - self.offsets[start])
+            self._block = data.split(b"\n")
+            self._block_start = start
+        return self._block[row - start].decode("utf-8", "replace").rstrip("\r")
+    
+    def close(self):
+        """丢弃已读取的块（文件只在读取时打开，不需要关闭）"""
+        self._block_start = -1
+        self._block = []
+
+
+class LazyListModel(QAbstractListModel):
+    """按需提供列表项的列表模型 - 指定列表项文件时从文件按行读取，
+    否则按序号生成 itemCount 项。列表项不会复制到控件属性中"""
+    
+    def __init__(self, count=0, item_file="", parent=None):
+        super().__init__(parent)
+        self.count = count
+        self.items = None
+        self.load_items(item_file)
+    
+    def load_items(self, item_file):
+        """打开列表项文件，文件为空或无法读取时改为按序号生成"""
+        if self.items is not None:
+            self.items.close()
+        self.items = None
+        if item_file:
+            try:
+                self.items = ItemFile(item_file)
+            except OSError:
+                pass
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.items) if self.items is not None else self.count
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self.item(index.row())
+        return None
+    
+    def item(self, row):
+        """第 row 项的文本"""
+        if self.items is not None:
+            return self.items[row]
+        return f"项目{row + 1}"
+    
+    def setItemCount(self, count):
+        """修改生成的列表项数"""
+        self.beginResetModel()
+        self.count = count
+        self.endResetModel()
+    
+    def setItemFile(self, item_file):
+        """修改列表项文件"""
+        self.beginResetModel()
+        self.load_items(item_file)
+        self.endResetModel()
+
+
+# 模型类名 -> 模型类
+_MODEL_CLASSES = {
+    "LazyTableModel": LazyTableModel,
+    "LazyListModel": LazyListModel,
 }
 
+
+def create_model(widget_type, parent=None):
+    """为模型/视图控件创建空模型"""
+    return _MODEL_CLASSES[MODEL_TYPES[widget_type][0]](parent=parent)
+
+
+def model_target(widget, prop_name):
+    """属性的设置对象：模型属性设置在视图的模型上，其余属性设置在控件上"""
+    if prop_name in MODEL_PROPERTIES and hasattr(widget, "model"):
+        model = widget.model()
+        if isinstance(model, (LazyTableModel, LazyListModel)):
+            return model
+    return widget
+
+
+# 各控件类型的构造函数：创建控件并设置与默认属性一致的初始状态
+def _create_push_button(parent):
+    widget = QPushButton("按钮", parent)
+    widget.setMinimumSize(80, 30)
+    return widget
+
+
+def _create_label(parent):
+    widget = QLabel("标签", parent)
+    widget.setMinimumSize(60, 20)
+    return widget
+
+
+def _create_line_edit(parent):
+    widget = QLineEdit(parent)
+    widget.setPlaceholderText("请输入文本")
+    widget.setMinimumSize(120, 30)
+    return widget
+
+
+def _create_text_edit(parent):
+    widget = QTextEdit(parent)
+    widget.setPlaceholderText("请输入多行文本")
+    widget.setMinimumSize(200, 120)
+    return widget
+
+
+def _create_check_box(parent):
+    return QCheckBox("复选框", parent)
+
+
+def _create_radio_button(parent):
+    return QRadioButton("单选按钮", parent)
+
+
+def _create_combo_box(parent):
+    widget = QComboBox(parent)
+    widget.addItems(["选项1", "选项2", "选项3"])
+    widget.setMinimumSize(120, 30)
+    return widget
+
+
+def _create_spin_box(parent):
+    widget = QSpinBox(parent)
+    widget.setRange(0, 100)
+    widget.setValue(50)
+    widget.setMinimumSize(80, 30)
+    return widget
+
+
+def _create_slider(parent):
+    widget = QSlider(Qt.Horizontal, parent)
+    widget.setRange(0, 100)
+    widget.setValue(50)
+    widget.setMinimumSize(150, 30)
+    return widget
+
+
+def _create_group_box(parent):
+    widget = QGroupBox("分组", parent)
+    layout = QVBoxLayout(widget)
+    widget.setLayout(layout)
+    widget.setMinimumSize(200, 150)
+    return widget
+
+
+def _create_tab_widget(parent):
+    widget = QTabWidget(parent)
+    for index in range(TAB_PAGE_COUNT):
+        widget.addTab(QWidget(), tab_page_title(index))
+    widget.setMinimumSize(250, 180)
+    return widget
+
+
+def _create_table_widget(parent):
+    widget = QTableWidget(4, 4, parent)
+    for i in range(4):
+        for j in range(4):
+            widget.setItem(i, j, QTableWidgetItem(f"({i},{j})"))
+    widget.setMinimumSize(250, 200)
+    return widget
+
+
+def _create_table_view(parent):
+    widget = QTableView(parent)
+    widget.setModel(LazyTableModel(1000, 4, widget))
+    # 固定行高，视图不必逐行计算高度
+    widget.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    widget.setMinimumSize(250, 200)
+    return widget
+
+
+def _create_list_view(parent):
+    widget = QListView(parent)
+    widget.setModel(LazyListModel(1000, "", widget))
+    # 列表项等高并分批布局，视图不必逐项计算尺寸
+    widget.setUniformItemSizes(True)
+    widget.setLayoutMode(QListView.Batched)
+    widget.setMinimumSize(150, 180)
+    return widget
+
+
+def _create_list_widget(parent):
+    widget = QListWidget(parent)
+    widget.addItems(["项目1", "项目2", "项目3", "项目4"])
+    widget.setMinimumSize(150, 180)
+    return widget
+
+
+# 控件类型 -> 构造函数
+_CONSTRUCTORS = {}
+
+# 控件类型 -> (默认属性模板, 值为列表的属性名)；模板只读，几何为 (x, y, 宽, 高)，列表为元组
+_PROPERTY_TEMPLATES = {}
+
+# 未注册类型的默认属性模板（默认尺寸 DEFAULT_SIZE 和各类型的 DEFAULT_SIZES 见 widget_types）
+_FALLBACK_TEMPLATE = (MappingProxyType({"objectName": "", "geometry": (0, 0) + DEFAULT_SIZE}), ())
+
+# 各控件类型的默认属性模板缓存（已编码为 JSON 形式）
+_DEFAULT_TEMPLATES = {}
+
+
 # 控件工厂 - 用于创建各种类型的控件
 class WidgetFactory:
+    @staticmethod
+    def register(widget_type, constructor, properties, size=None):
+        """注册控件类型：构造函数 constructor(parent) 和默认属性（不含通用属性），
+        未指定尺寸时使用 DEFAULT_SIZES 中的默认尺寸"""
+        if size is None:
+            size = DEFAULT_SIZES.get(widget_type, DEFAULT_SIZE)
+        template = {"objectName": "", "geometry": (0, 0) + tuple(size)}
+        lists = []
+        for prop_name, value in properties.items():
+            if isinstance(value, list):
+                value = tuple(value)
+                lists.append(prop_name)
+            template[prop_name] = value
+        _CONSTRUCTORS[widget_type] = constructor
+        _PROPERTY_TEMPLATES[widget_type] = (MappingProxyType(template), tuple(lists))
+        DEFAULT_SIZES[widget_type] = tuple(size)
+        _DEFAULT_TEMPLATES.pop(widget_type, None)
+    
     @staticmethod
     def create_widget(widget_type, parent=None):
         """创建指定类型的控件"""
-        if widget_type == "QPushButton":
-            widget = QPushButton("按钮", parent)
-            widget.setMinimumSize(80, 30)
-            return widget
-        
-        elif widget_type == "QLabel":
-            widget = QLabel("标签", parent)
-            widget.setMinimumSize(60, 20)
-            return widget
-        
-        elif widget_type == "QLineEdit":
-            widget = QLineEdit(parent)
-            widget.setPlaceholderText("请输入文本")
-            widget.setMinimumSize(120, 30)
-            return widget
-        
-        elif widget_type == "QTextEdit":
-            widget = QTextEdit(parent)
-            widget.setPlaceholderText("请输入多行文本")
-            widget.setMinimumSize(200, 120)
-            return widget
-        
-        elif widget_type == "QCheckBox":
-            widget = QCheckBox("复选框", parent)
-            return widget
-        
-        elif widget_type == "QRadioButton":
-            widget = QRadioButton("单选按钮", parent)
-            return widget
-        
-        elif widget_type == "QComboBox":
-            widget = QComboBox(parent)
-            widget.addItems(["选项1", "选项2", "选项3"])
-            widget.setMinimumSize(120, 30)
-            return widget
-        
-        elif widget_type == "QSpinBox":
-            widget = QSpinBox(parent)
-            widget.setRange(0, 100)
-            widget.setValue(50)
-            widget.setMinimumSize(80, 30)
-            return widget
-        
-        elif widget_type == "QSlider":
-            widget = QSlider(Qt.Horizontal, parent)
-            widget.setRange(0, 100)
-            widget.setValue(50)
-            widget.setMinimumSize(150, 30)
-            return widget
-        
-        elif widget_type == "QGroupBox":
-            widget = QGroupBox("分组", parent)
-            layout = QVBoxLayout(widget)
-            widget.setLayout(layout)
-            widget.setMinimumSize(200, 150)
-            return widget
-        
-        elif widget_type == "QTabWidget":
-            widget = QTabWidget(parent)
-            tab1 = QWidget()
-            tab2 = QWidget()
-            widget.addTab(tab1, "标签页1")
-            widget.addTab(tab2, "标签页2")
-            widget.setMinimumSize(250, 180)
-            return widget
-        
-        elif widget_type == "QTableWidget":
-            widget = QTableWidget(4, 4, parent)
-            for i in range(4):
-                for j in range(4):
-                    widget.setItem(i, j, QTableWidget.QTableWidgetItem(f"({i},{j})"))
-            widget.setMinimumSize(250, 200)
-            return widget
-        
-        elif widget_type == "QListWidget":
-            widget = QListWidget(parent)
-            widget.addItems(["项目1", "项目2", "项目3", "项目4"])
-            widget.setMinimumSize(150, 180)
-            return widget
-        
-        else:
+        constructor = _CONSTRUCTORS.get(widget_type)
+        if constructor is None:
             # 默认创建一个占位控件
-            widget = QLabel(f"未知控件: {widget_type}", parent)
-            return widget
+            return QLabel(f"未知控件: {widget_type}", parent)
+        return constructor(parent)
 
     @staticmethod
     def get_default_properties(widget_type):
-        """获取指定控件类型的默认属性"""
-        common_props = {
-            "objectName": "",
-            "geometry": QRect(0, 0, 100, 30),
-        }
-        
-        if widget_type == "QPushButton":
-            specific_props = {
-                "text": "按钮",
-                "font": None,
-                "icon": None,
-                "enabled": True,
-            }
-        
-        elif widget_type == "QLabel":
-            specific_props = {
-                "text": "标签",
-                "alignment": Qt.AlignLeft | Qt.AlignVCenter,
-                "wordWrap": False,
-            }
-        
-        elif widget_type == "QLineEdit":
-            specific_props = {
-                "text": "",
-                "placeholderText": "请输入文本",
-                "maxLength": 32767,
-                "readOnly": False,
-            }
-        
-        elif widget_type == "QTextEdit":
-            specific_props = {
-                "plainText": "",
-                "html": "",
-                "placeholderText": "请输入多行文本",
-                "readOnly": False,
-            }
-            common_props["geometry"] = QRect(0, 0, 200, 120)
-        
-        elif widget_type == "QCheckBox":
-            specific_props = {
-                "text": "复选框",
-                "checked": False,
-                "tristate": False,
-            }
-        
-        elif widget_type == "QRadioButton":
-            specific_props = {
-                "text": "单选按钮",
-                "checked": False,
-            }
-        
-        elif widget_type == "QComboBox":
-            specific_props = {
-                "items": ["选项1", "选项2", "选项3"],
-                "currentIndex": 0,
-                "editable": False,
-            }
-        
-        elif widget_type == "QSpinBox":
-            specific_props = {
-                "minimum": 0,
-                "maximum": 100,
-                "value": 50,
-                "prefix": "",
-                "suffix": "",
-            }
-        
-        elif widget_type == "QSlider":
-            specific_props = {
-                "minimum": 0,
-                "maximum": 100,
-                "value": 50,
-                "orientation": "horizontal",
-                "tickPosition": "NoTicks",
-            }
-            common_props["geometry"] = QRect(0, 0, 150, 30)
-        
-        elif widget_type == "QGroupBox":
-            specific_props = {
-                "title": "分组",
-                "checkable": False,
-                "checked": False,
-            }
-            common_props["geometry"] = QRect(0, 0, 200, 150)
-        
-        elif widget_type == "QTabWidget":
-            specific_props = {
-                "currentIndex": 0,
-                "tabPosition": "North",
-                "tabsClosable": False,
-            }
-            common_props["geometry"] = QRect(0, 0, 250, 180)
-        
-        elif widget_type == "QTableWidget":
-            specific_props = {
-                "rowCount": 4,
-                "columnCount": 4,
-                "horizontalHeaderVisible": True,
-                "verticalHeaderVisible": True,
-            }
-            common_props["geometry"] = QRect(0, 0, 250, 200)
-        
-        elif widget_type == "QListWidget":
-            specific_props = {
-                "items": ["项目1", "项目2", "项目3", "项目4"],
-                "currentRow": 0,
-                "sortingEnabled": False,
-            }
-            common_props["geometry"] = QRect(0, 0, 150, 180)
-        
+        """获取指定控件类型的默认属性
+        
+        模板按类型只构建一次并且只读，这里只复制可变的值（几何和列表），其余值共享。
+        """
+        template, lists = _PROPERTY_TEMPLATES.get(widget_type, _FALLBACK_TEMPLATE)
+        properties = template.copy()
+        properties["geometry"] = QRect(*template["geometry"])
+        for prop_name in lists:
+            properties[prop_name] = list(template[prop_name])
+        return properties
+
+    @staticmethod
+    def default_size(widget_type):
+        """控件类型的默认尺寸 (宽, 高)，不分配新对象"""
+        return DEFAULT_SIZES.get(widget_type, DEFAULT_SIZE)
+
+    @staticmethod
+    def get_default_template(widget_type):
+        """获取控件类型的默认属性模板（已编码为 JSON 形式，按类型缓存，调用方不可修改）"""
+        template = _DEFAULT_TEMPLATES.get(widget_type)
+        if template is None:
+            template = MappingProxyType(
+                encode_properties(WidgetFactory.get_default_properties(widget_type)))
+            _DEFAULT_TEMPLATES[widget_type] = template
+        return template
+
+
+WidgetFactory.register("QPushButton", _create_push_button, {
+    "text": "按钮",
+    "font": None,
+    "icon": None,
+    "enabled": True,
+})
+WidgetFactory.register("QLabel", _create_label, {
+    "text": "标签",
+    "alignment": Qt.AlignLeft | Qt.AlignVCenter,
+    "wordWrap": False,
+})
+WidgetFactory.register("QLineEdit", _create_line_edit, {
+    "text": "",
+    "placeholderText": "请输入文本",
+    "maxLength": 32767,
+    "readOnly": False,
+})
+WidgetFactory.register("QTextEdit", _create_text_edit, {
+    "plainText": "",
+    "html": "",
+    "placeholderText": "请输入多行文本",
+    "readOnly": False,
+})
+WidgetFactory.register("QCheckBox", _create_check_box, {
+    "text": "复选框",
+    "checked": False,
+    "tristate": False,
+})
+WidgetFactory.register("QRadioButton", _create_radio_button, {
+    "text": "单选按钮",
+    "checked": False,
+})
+WidgetFactory.register("QComboBox", _create_combo_box, {
+    "items": ["选项1", "选项2", "选项3"],
+    "currentIndex": 0,
+    "editable": False,
+})
+WidgetFactory.register("QSpinBox", _create_spin_box, {
+    "minimum": 0,
+    "maximum": 100,
+    "value": 50,
+    "prefix": "",
+    "suffix": "",
+})
+WidgetFactory.register("QSlider", _create_slider, {
+    "minimum": 0,
+    "maximum": 100,
+    "value": 50,
+    "orientation": "horizontal",
+    "tickPosition": "NoTicks",
+})
+WidgetFactory.register("QGroupBox", _create_group_box, {
+    "title": "分组",
+    "checkable": False,
+    "checked": False,
+})
+WidgetFactory.register("QTabWidget", _create_tab_widget, {
+    "currentIndex": 0,
+    "tabPosition": "North",
+    "tabsClosable": False,
+})
+WidgetFactory.register("QTableWidget", _create_table_widget, {
+    "rowCount": 4,
+    "columnCount": 4,
+    "horizontalHeaderVisible": True,
+    "verticalHeaderVisible": True,
+})
+WidgetFactory.register("QTableView", _create_table_view, {
+    "rowCount": 1000,
+    "columnCount": 4,
+    "horizontalHeaderVisible": True,
+    "verticalHeaderVisible": True,
+})
+WidgetFactory.register("QListWidget", _create_list_widget, {
+    "items": ["项目1", "项目2", "项目3", "项目4"],
+    "currentRow": 0,
+    "sortingEnabled": False,
+})
+WidgetFactory.register("QListView", _create_list_view, {
+    "itemCount": 1000,
+    "itemFile": "",
+    "uniformItemSizes": True,
+    "layoutMode": "Batched",
+    "batchSize": 100,
+})
+
+
+def _plugin_constructor(widget_type):
+    """插件控件的构造函数：第一次创建该类型的控件时才导入插件模块"""
+    def create(parent):
+        widget_class = PLUGINS.widget_class(widget_type)
+        if widget_class is None:
+            return QLabel(f"插件加载失败: {widget_type}", parent)
+        return widget_class(parent)
+    return create
+
+
+def load_plugins(dirs=None):
+    """扫描插件清单，把其中的控件类型加入积木库和控件工厂（只读取清单，不导入插件模块）
+
+    需要在创建控件工具箱之前调用；已扫描过的目录不会重复扫描。
+    """
+    added = PLUGINS.scan(plugin_dirs() if dirs is None else dirs, reserved=WIDGET_TYPES)
+    for plugin_type in added:
+        widget_type = plugin_type.widget_type
+        WIDGET_TYPES[widget_type] = {"icon": plugin_type.icon, "text": plugin_type.text,
+                                     "description": plugin_type.description}
+        WidgetFactory.register(widget_type, _plugin_constructor(widget_type),
+                               plugin_type.properties, plugin_type.size or DEFAULT_SIZE)
+    return added
+
+
+# 控件库搜索的匹配等级：完全相同 > 前缀 > 子串 > 描述中的子串 > 模糊（按顺序包含各字符）
+MATCH_EXACT, MATCH_PREFIX, MATCH_SUBSTRING, MATCH_DESCRIPTION, MATCH_FUZZY = range(5)
+
+# 控件库列表每批布局的项数
+WIDGET_BOX_BATCH_SIZE = 50
+
+
+def _fuzzy_pattern(query):
+    """模糊匹配的正则表达式：各字符按顺序出现在同一个字段（以换行分隔）中"""
+    return re.compile("[^\n]*?".join(re.escape(char) for char in query))
+
+
+class PaletteIndex:
+    """控件库搜索索引 - 预先建立字符倒排表和名称表
+    
+    任何等级的匹配（包括模糊匹配）都要求控件包含查询中的每个字符，查询时先用字符倒排表
+    求交集得到候选控件，再只对候选控件判断匹配等级；完全相同的名称直接查表。
+    在上一次查询后追加字符时，新的匹配一定在上一次的匹配之中，直接在其中筛选。
+    """
+    
+    def __init__(self, types):
+        self.types = list(types)
+        self.exact = {}          # 小写的类型名、去掉 Q 前缀的类型名或显示文本 -> 控件序号集合
+        self.heads = []          # "\n类型名\n去掉Q前缀的类型名\n显示文本"，用于前缀匹配
+        self.fields = []         # "类型名\n显示文本"，用于子串和模糊匹配
+        self.descriptions = []   # 小写的描述
+        self.postings = {}       # 字符 -> 包含它的控件序号集合
+        for n, (widget_type, info) in enumerate(types.items()):
+            name = widget_type.lower()
+            short_name = name[1:] if name.startswith("q") and len(name) > 1 else name
+            text = info.get("text", "").lower()
+            description = info.get("description", "").lower()
+            for key in (name, short_name, text):
+                self.exact.setdefault(key, set()).add(n)
+            self.heads.append(f"\n{name}\n{short_name}\n{text}")
+            self.fields.append(f"{name}\n{text}")
+            self.descriptions.append(description)
+            for char in set(name + text + description):
+                self.postings.setdefault(char, set()).add(n)
+        self.last_query = ""
+        self.last_matches = None
+    
+    def _candidates(self, query):
+        """可能匹配 query 的控件序号集合"""
+        if self.last_matches is not None and self.last_query and query.startswith(self.last_query):
+            return self.last_matches
+        sets = [self.postings.get(char) for char in set(query)]
+        if not all(sets):
+            return set()
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+    
+    def search(self, query):
+        """返回匹配 query 的控件序号，按匹配等级和在控件库中的顺序排列；空查询返回全部"""
+        query = query.strip().lower()
+        if not query:
+            self.last_query, self.last_matches = "", None
+            return list(range(len(self.types)))
+        exact = self.exact.get(query, ())
+        head = "\n" + query
+        fuzzy = _fuzzy_pattern(query).search
+        heads, fields, descriptions = self.heads, self.fields, self.descriptions
+        # (匹配等级, 模糊匹配的跨度, 控件序号)，模糊匹配中字符越紧凑越靠前
+        ranked = []
+        for n in self._candidates(query):
+            if n in exact:
+                ranked.append((MATCH_EXACT, 0, n))
+            elif head in heads[n]:
+                ranked.append((MATCH_PREFIX, 0, n))
+            elif query in fields[n]:
+                ranked.append((MATCH_SUBSTRING, 0, n))
+            elif query in descriptions[n]:
+                ranked.append((MATCH_DESCRIPTION, 0, n))
+            else:
+                match = fuzzy(fields[n])
+                if match:
+                    ranked.append((MATCH_FUZZY, match.end() - match.start(), n))
+        ranked.sort()
+        self.last_query = query
+        self.last_matches = {n for _, _, n in ranked}
+        return [n for _, _, n in ranked]
+
+
+class WidgetBoxModel(QAbstractListModel):
+    """控件库的列表模型 - 只保存当前显示的控件序号，筛选时不创建或删除列表项"""
+    
+    def __init__(self, types, parent=None):
+        super().__init__(parent)
+        self.types = list(types)
+        self.labels = [info["icon"] + " " + info["text"] for info in types.values()]
+        self.tooltips = [info["description"] for info in types.values()]
+        self.rows = list(range(len(self.types)))
+        self.numbers = {widget_type: n for n, widget_type in enumerate(self.types)}
+        self.icons = {}   # 控件序号 -> 缩略图
+        self.size_hint = QSize(100, 40)
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        n = self.rows[index.row()]
+        if role == Qt.DisplayRole:
+            return self.labels[n]
+        if role == Qt.UserRole:
+            return self.types[n]
+        if role == Qt.DecorationRole:
+            return self.icons.get(n)
+        if role == Qt.ToolTipRole:
+            return self.tooltips[n]
+        if role == Qt.SizeHintRole:
+            return self.size_hint
+        return None
+    
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled
+    
+    def set_icon(self, widget_type, icon):
+        """设置控件类型的缩略图"""
+        n = self.numbers.get(widget_type)
+        if n is None:
+            return
+        self.icons[n] = icon
+        if self.rows:
+            self.dataChanged.emit(self.index(0), self.index(len(self.rows) - 1), [Qt.DecorationRole])
+    
+    def set_rows(self, rows):
+        """显示指定序号的控件"""
+        if rows == self.rows:
+            return
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+
+# 拖拽预览图缓存的最大数量（每张约 240x80 像素）
+DRAG_PIXMAP_CACHE_SIZE = 256
+
+# 启动后开始预热拖拽预览图的延迟（毫秒），之后每次空闲时绘制一张
+DRAG_WARMUP_DELAY = 1000
+
+# 组合模板拖拽预览图按整体尺寸绘制时的最大尺寸 (宽, 高)
+DRAG_TEMPLATE_MAX_SIZE = (240, 120)
+
+# 控件类型 -> 控件的建议尺寸 (宽, 高)
+_SIZE_HINTS = {}
+
+# (控件类型, 设备像素比, 主题) -> 拖拽预览图
+_DRAG_PIXMAPS = {}
+
+
+def widget_size_hint(widget_type):
+    """控件类型的建议尺寸，按类型只计算一次；插件控件使用清单中的默认尺寸，不导入插件模块，
+    组合模板使用整体尺寸（不超过 DRAG_TEMPLATE_MAX_SIZE）"""
+    size = _SIZE_HINTS.get(widget_type)
+    if size is None:
+        template = TEMPLATES.get(widget_type)
+        if template:
+            size = tuple(min(a, b) for a, b in zip(template.size, DRAG_TEMPLATE_MAX_SIZE))
+        elif widget_type in PLUGINS:
+            size = WidgetFactory.default_size(widget_type)
         else:
-            specific_props = {}
-        
-        # 合并通用属性和特定属性
-        return {**common_props, **specific_props}
+            widget = WidgetFactory.create_widget(widget_type, None)
+            hint = widget.sizeHint()
+            size = (hint.width(), hint.height())
+            widget.deleteLater()
+        _SIZE_HINTS[widget_type] = size
+    return size
+
+
+def forget_drag_pixmaps(widget_type):
+    """丢弃控件库条目缓存的建议尺寸和拖拽预览图（如同名组合模板被覆盖后）"""
+    _SIZE_HINTS.pop(widget_type, None)
+    for key in [key for key in _DRAG_PIXMAPS if key[0] == widget_type]:
+        del _DRAG_PIXMAPS[key]
+
+
+def render_drag_pixmap(widget_type, device_pixel_ratio=1.0):
+    """绘制控件类型的拖拽预览图，按设备像素比绘制以在高分屏上保持清晰"""
+    template = TEMPLATES.get(widget_type)
+    if template:
+        info = template.palette_entry()
+    else:
+        info = WIDGET_TYPES.get(widget_type, {"icon": "", "text": widget_type})
+    hint_width, hint_height = widget_size_hint(widget_type)
+    widget_width = max(hint_width, 100)
+    widget_height = max(hint_height, 40)
+    
+    # 创建大尺寸拖拽预览
+    # 根据控件实际尺寸调整预览大小，缩放比例1.5
+    preview_width = max(240, int(widget_width * 1.5))
+    preview_height = max(80, int(widget_height * 1.5))
+    
+    # 创建更大的透明图像，按设备像素比分配像素
+    pixmap = QPixmap(int(preview_width * device_pixel_ratio), int(preview_height * device_pixel_ratio))
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
+    pixmap.fill(Qt.transparent)
+    
+    # 初始化绘图对象
+    painter = QPainter()
+    painter.begin(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing, True)  # 启用抗锯齿
+    
+    # 选择控件类型特定的颜色方案
+    # 为每个控件类型定义特定的颜色方案
+    gradient = QLinearGradient(0, 0, 0, preview_height)
+    
+    primary_color = QColor(30, 30, 30, 200)  # 文本颜色
+    border_color = QColor(0, 0, 0, 0)        # 边框颜色
+    
+    # 根据控件类型设置颜色方案
+    if "Button" in widget_type:
+        # 按钮使用蓝色方案
+        gradient.setColorAt(0, QColor(100, 170, 255, 230))
+        gradient.setColorAt(1, QColor(50, 120, 220, 230))
+        border_color = QColor(40, 90, 180)
+    elif "Label" in widget_type:
+        # 标签使用绿色方案
+        gradient.setColorAt(0, QColor(100, 220, 100, 230))
+        gradient.setColorAt(1, QColor(60, 180, 60, 230))
+        border_color = QColor(40, 150, 40)
+    elif "Edit" in widget_type:
+        # 文本编辑框使用白色/浅灰方案
+        gradient.setColorAt(0, QColor(250, 250, 250, 230))
+        gradient.setColorAt(1, QColor(220, 220, 220, 230))
+        border_color = QColor(180, 180, 180)
+        primary_color = QColor(60, 60, 60)  # 深色文本
+    elif "CheckBox" in widget_type or "Radio" in widget_type:
+        # 复选和单选使用紫色方案
+        gradient.setColorAt(0, QColor(180, 120, 250, 230))
+        gradient.setColorAt(1, QColor(150, 80, 220, 230))
+        border_color = QColor(120, 60, 180)
+    elif "Combo" in widget_type:
+        # 下拉框使用蓝绿色方案
+        gradient.setColorAt(0, QColor(100, 200, 220, 230))
+        gradient.setColorAt(1, QColor(70, 170, 190, 230))
+        border_color = QColor(50, 140, 160)
+    elif "Box" in widget_type or "Group" in widget_type:
+        # 容器类控件使用紫色方案
+        gradient.setColorAt(0, QColor(220, 180, 250, 230))
+        gradient.setColorAt(1, QColor(190, 150, 220, 230))
+        border_color = QColor(150, 110, 180)
+    else:
+        # 其他控件使用橙色方案
+        gradient.setColorAt(0, QColor(255, 180, 100, 230))
+        gradient.setColorAt(1, QColor(240, 140, 60, 230))
+        border_color = QColor(200, 100, 40)
+    
+    # 添加滑动效果和光晕效果
+    # 顶部反光
+    highlight = QLinearGradient(0, 0, 0, preview_height * 0.4)
+    highlight.setColorAt(0, QColor(255, 255, 255, 80))
+    highlight.setColorAt(1, QColor(255, 255, 255, 0))
+    
+    # 绘制主背景和边框
+    painter.setPen(QPen(border_color, 2))
+    painter.setBrush(gradient)
+    main_rect = QRect(4, 4, preview_width-8, preview_height-8)
+    painter.drawRoundedRect(main_rect, 14, 14)  # 使用较大的圆角半径
+    
+    # 绘制顶部反光效果
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(highlight)
+    painter.setOpacity(0.4)  # 降低不透明度
+    painter.drawRoundedRect(main_rect, 14, 14)
+    painter.setOpacity(1.0)  # 恢复不透明度
+    
+    # 绘制左右两侧推动箭头
+    arrow_pen = QPen(QColor(255, 255, 255, 180), 2)
+    painter.setPen(arrow_pen)
+    
+    # 定义箭头大小
+    arrow_size = min(preview_width, preview_height) * 0.2
+    
+    # 左侧箭头
+    left_arrow_x = int(preview_width * 0.15)
+    arrow_y = int(preview_height * 0.5)
+    arrow_half = int(arrow_size/2)
+    
+    # 使用整数参数绘制箭头线条
+    painter.drawLine(
+        int(left_arrow_x + arrow_half), int(arrow_y - arrow_half), 
+        int(left_arrow_x - arrow_half), arrow_y
+    )
+    painter.drawLine(
+        int(left_arrow_x - arrow_half), arrow_y, 
+        int(left_arrow_x + arrow_half), int(arrow_y + arrow_half)
+    )
+    
+    # 右侧箭头
+    right_arrow_x = int(preview_width * 0.85)
+    painter.drawLine(
+        int(right_arrow_x - arrow_half), int(arrow_y - arrow_half), 
+        int(right_arrow_x + arrow_half), arrow_y
+    )
+    painter.drawLine(
+        int(right_arrow_x + arrow_half), arrow_y, 
+        int(right_arrow_x - arrow_half), int(arrow_y + arrow_half)
+    )
+    
+    # 准备绘制文本
+    text_rect = QRect(int(preview_width * 0.25), 0, int(preview_width * 0.5), preview_height)
+    
+    # 绘制控件文本
+    font = painter.font()
+    font.setBold(True)
+    font.setPointSize(14)  # 大字体
+    painter.setFont(font)
+    painter.setPen(QColor(255, 255, 255))  # 白色文本
+    
+    # 将控件名称和图标居中显示
+    text = info["icon"] + " " + info["text"]
+    painter.drawText(text_rect, Qt.AlignCenter, text)
+    
+    # 绘制底部的“拖拽提示”文本
+    font.setPointSize(9)
+    painter.setFont(font)
+    painter.setPen(QColor(255, 255, 255, 160))
+    painter.drawText(main_rect, Qt.AlignBottom | Qt.AlignHCenter, "拖动到画布")
+    
+    # 绘制完成
+    painter.end()
+    return pixmap
+
 
 # 控件工具箱 - 显示可用的积木（控件）
-class WidgetBox(QListWidget):
-    """控件工具箱 - 显示可拖拽的控件列表（积木库）"""
+class WidgetBox(QListView):
+    """控件工具箱 - 显示可拖拽的控件列表（积木库），可按名称、显示文本和描述搜索"""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, types=None):
         super().__init__(parent)
         self.setDragEnabled(True)
         self.setIconSize(QSize(32, 32))
         self.setSpacing(5)
-        self.setViewMode(QListWidget.ListMode)
+        self.setViewMode(QListView.ListMode)
+        self.setUniformItemSizes(True)
+        # 分批布局：筛选后只同步布局第一批列表项，其余在空闲时完成
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(WIDGET_BOX_BATCH_SIZE)
         self.setAcceptDrops(False)
         
         # 添加所有可用控件
-        for widget_type, info in WIDGET_TYPES.items():
-            item = QListWidgetItem(info["icon"] + " " + info["text"])
-            item.setToolTip(info["description"])
-            item.setSizeHint(QSize(100, 40))
-            item.setData(Qt.UserRole, widget_type)
-            self.addItem(item)
+        types = WIDGET_TYPES if types is None else types
+        self.index = PaletteIndex(types)
+        self.setModel(WidgetBoxModel(types, self))
+        self.filter_text = ""
+        
+        # 启动后在空闲时预先绘制拖拽预览图，开始拖拽时只需查表
+        self.warmup_types = []
+        self.warmup_timer = QTimer(self)
+        self.warmup_timer.timeout.connect(self._warm_up_next)
+        self.start_warmup(DRAG_WARMUP_DELAY)
+    
+    def set_filter(self, text):
+        """按搜索文本筛选并排序控件列表"""
+        self.filter_text = text
+        self.model().set_rows(self.index.search(text))
+    
+    def set_types(self, types):
+        """更换控件库的条目（如新保存了组合模板），保留已有的缩略图并重新应用当前筛选"""
+        old_model = self.model()
+        model = WidgetBoxModel(types, self)
+        for n, icon in old_model.icons.items():
+            model.set_icon(old_model.types[n], icon)
+        self.index = PaletteIndex(types)
+        self.setModel(model)
+        old_model.deleteLater()
+        self.set_filter(self.filter_text)
+        # 新的条目也预先绘制拖拽预览图（尚未开始预热时保持原来的延迟）
+        self.start_warmup(max(self.warmup_timer.remainingTime(), 0))
+    
+    def set_thumbnail(self, widget_type, image):
+        """显示控件类型的缩略图（QImage）"""
+        self.model().set_icon(widget_type, QPixmap.fromImage(image))
+    
+    def theme_key(self):
+        """当前主题的标识（调色板的窗口颜色），主题切换后使用新的拖拽预览图"""
+        return self.palette().color(QPalette.Window).rgba()
+    
+    def drag_pixmap(self, widget_type):
+        """控件类型在当前设备像素比和主题下的拖拽预览图，按需绘制并缓存"""
+        key = (widget_type, self.devicePixelRatioF(), self.theme_key())
+        pixmap = _DRAG_PIXMAPS.get(key)
+        if pixmap is None:
+            pixmap = render_drag_pixmap(widget_type, key[1])
+            if len(_DRAG_PIXMAPS) >= DRAG_PIXMAP_CACHE_SIZE:
+                del _DRAG_PIXMAPS[next(iter(_DRAG_PIXMAPS))]
+            _DRAG_PIXMAPS[key] = pixmap
+        return pixmap
+    
+    def start_warmup(self, delay=0):
+        """在空闲时逐个绘制控件库中各类型的拖拽预览图，每次一张，不阻塞界面"""
+        self.warmup_types = list(self.model().types[:DRAG_PIXMAP_CACHE_SIZE])
+        self.warmup_timer.start(delay)
+    
+    def _warm_up_next(self):
+        self.warmup_timer.setInterval(0)
+        if self.warmup_types:
+            self.drag_pixmap(self.warmup_types.pop(0))
+        if not self.warmup_types:
+            self.warmup_timer.stop()
     
     def startDrag(self, supportedActions):
         """开始拖拽操作"""
-        item = self.currentItem()
-        if not item:
+        index = self.currentIndex()
+        if not index.isValid():
             return
             
-        # 获取控件类型及信息
-        widget_type = item.data(Qt.UserRole)
-        info = WIDGET_TYPES.get(widget_type, {"icon": "", "text": widget_type})
-        
-        # 预先创建控件实例以获取其尺寸信息
-        tmp_widget = WidgetFactory.create_widget(widget_type, None)
-        if tmp_widget:
-            widget_size = tmp_widget.sizeHint()
-            widget_width = max(widget_size.width(), 100)
-            widget_height = max(widget_size.height(), 40)
-            tmp_widget.deleteLater()  # 清理临时控件
-        else:
-            widget_width, widget_height = 120, 50  # 默认尺寸
+        # 获取控件类型
+        widget_type = index.data(Qt.UserRole)
         
         # 创建拖拽数据
         mime_data = QMimeData()
@@ -279,139 +881,11 @@ class WidgetBox(QListWidget):
         drag = QDrag(self)
         drag.setMimeData(mime_data)
         
-        # 创建大尺寸拖拽预览
-        # 根据控件实际尺寸调整预览大小，缩放比例1.5
-        preview_width = max(240, int(widget_width * 1.5))
-        preview_height = max(80, int(widget_height * 1.5))
-        
-        # 创建更大的透明图像
-        pixmap = QPixmap(preview_width, preview_height)
-        pixmap.fill(Qt.transparent)
-        
-        # 初始化绘图对象
-        painter = QPainter()
-        painter.begin(pixmap)
-        painter.setRenderHint(QPainter.Antialiasing, True)  # 启用抗锯齿
-        
-        # 选择控件类型特定的颜色方案
-        # 为每个控件类型定义特定的颜色方案
-        gradient = QLinearGradient(0, 0, 0, preview_height)
-        
-        primary_color = QColor(30, 30, 30, 200)  # 文本颜色
-        border_color = QColor(0, 0, 0, 0)        # 边框颜色
-        
-        # 根据控件类型设置颜色方案
-        if "Button" in widget_type:
-            # 按钮使用蓝色方案
-            gradient.setColorAt(0, QColor(100, 170, 255, 230))
-            gradient.setColorAt(1, QColor(50, 120, 220, 230))
-            border_color = QColor(40, 90, 180)
-        elif "Label" in widget_type:
-            # 标签使用绿色方案
-            gradient.setColorAt(0, QColor(100, 220, 100, 230))
-            gradient.setColorAt(1, QColor(60, 180, 60, 230))
-            border_color = QColor(40, 150, 40)
-        elif "Edit" in widget_type:
-            # 文本编辑框使用白色/浅灰方案
-            gradient.setColorAt(0, QColor(250, 250, 250, 230))
-            gradient.setColorAt(1, QColor(220, 220, 220, 230))
-            border_color = QColor(180, 180, 180)
-            primary_color = QColor(60, 60, 60)  # 深色文本
-        elif "CheckBox" in widget_type or "Radio" in widget_type:
-            # 复选和单选使用紫色方案
-            gradient.setColorAt(0, QColor(180, 120, 250, 230))
-            gradient.setColorAt(1, QColor(150, 80, 220, 230))
-            border_color = QColor(120, 60, 180)
-        elif "Combo" in widget_type:
-            # 下拉框使用蓝绿色方案
-            gradient.setColorAt(0, QColor(100, 200, 220, 230))
-            gradient.setColorAt(1, QColor(70, 170, 190, 230))
-            border_color = QColor(50, 140, 160)
-        elif "Box" in widget_type or "Group" in widget_type:
-            # 容器类控件使用紫色方案
-            gradient.setColorAt(0, QColor(220, 180, 250, 230))
-            gradient.setColorAt(1, QColor(190, 150, 220, 230))
-            border_color = QColor(150, 110, 180)
-        else:
-            # 其他控件使用橙色方案
-            gradient.setColorAt(0, QColor(255, 180, 100, 230))
-            gradient.setColorAt(1, QColor(240, 140, 60, 230))
-            border_color = QColor(200, 100, 40)
-        
-        # 添加滑动效果和光晕效果
-        # 顶部反光
-        highlight = QLinearGradient(0, 0, 0, preview_height * 0.4)
-        highlight.setColorAt(0, QColor(255, 255, 255, 80))
-        highlight.setColorAt(1, QColor(255, 255, 255, 0))
-        
-        # 绘制主背景和边框
-        painter.setPen(QPen(border_color, 2))
-        painter.setBrush(gradient)
-        main_rect = QRect(4, 4, preview_width-8, preview_height-8)
-        painter.drawRoundedRect(main_rect, 14, 14)  # 使用较大的圆角半径
-        
-        # 绘制顶部反光效果
-        painter.setPen(Qt.NoPen)
-        painter.setBrush(highlight)
-        painter.setOpacity(0.4)  # 降低不透明度
-        painter.drawRoundedRect(main_rect, 14, 14)
-        painter.setOpacity(1.0)  # 恢复不透明度
-        
-        # 绘制左右两侧推动箭头
-        arrow_pen = QPen(QColor(255, 255, 255, 180), 2)
-        painter.setPen(arrow_pen)
-        
-        # 定义箭头大小
-        arrow_size = min(preview_width, preview_height) * 0.2
-        
-        # 左侧箭头
-        left_arrow_x = int(preview_width * 0.15)
-        arrow_y = int(preview_height * 0.5)
-        arrow_half = int(arrow_size/2)
-        
-        # 使用整数参数绘制箭头线条
-        painter.drawLine(
-            int(left_arrow_x + arrow_half), int(arrow_y - arrow_half), 
-            int(left_arrow_x - arrow_half), arrow_y
-        )
-        painter.drawLine(
-            int(left_arrow_x - arrow_half), arrow_y, 
-            int(left_arrow_x + arrow_half), int(arrow_y + arrow_half)
-        )
-        
-        # 右侧箭头
-        right_arrow_x = int(preview_width * 0.85)
-        painter.drawLine(
-            int(right_arrow_x - arrow_half), int(arrow_y - arrow_half), 
-            int(right_arrow_x + arrow_half), arrow_y
-        )
-        painter.drawLine(
-            int(right_arrow_x + arrow_half), arrow_y, 
-            int(right_arrow_x - arrow_half), int(arrow_y + arrow_half)
-        )
-        
-        # 准备绘制文本
-        text_rect = QRect(int(preview_width * 0.25), 0, int(preview_width * 0.5), preview_height)
-        
-        # 绘制控件文本
-        font = painter.font()
-        font.setBold(True)
-        font.setPointSize(14)  # 大字体
-        painter.setFont(font)
-        painter.setPen(QColor(255, 255, 255))  # 白色文本
-        
-        # 将控件名称和图标居中显示
-        text = info["icon"] + " " + info["text"]
-        painter.drawText(text_rect, Qt.AlignCenter, text)
-        
-        # 绘制底部的“拖拽提示”文本
-        font.setPointSize(9)
-        painter.setFont(font)
-        painter.setPen(QColor(255, 255, 255, 160))
-        painter.drawText(main_rect, Qt.AlignBottom | Qt.AlignHCenter, "拖动到画布")
-        
-        # 绘制完成
-        painter.end()
+        # 拖拽预览图按类型缓存，通常已在启动后的空闲时间绘制好
+        pixmap = self.drag_pixmap(widget_type)
+        ratio = pixmap.devicePixelRatio()
+        preview_width = int(pixmap.width() / ratio)
+        preview_height = int(pixmap.height() / ratio)
         
         # 设置拖拽图标和热点
         drag.setPixmap(pixmap)
@@ -1,6 +1,8 @@
 import sys
 import json
 import os
+import itertools
+import io
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QPushButton, QToolBar, QAction,
                             QDockWidget, QListWidget, QListWidgetItem, QMenu, 
@@ -8,27 +10,41 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QScrollArea, QGridLayout, QSpacerItem, QComboBox, 
                             QSpinBox, QLineEdit, QTextEdit, QCheckBox, QRadioButton,
                             QGroupBox, QTabWidget, QFileDialog, QMessageBox, QSlider,
-                            QStyle, QStyleFactory, QSplitter, QTableWidget, QTableWidgetItem)
+                            QStyle, QStyleFactory, QSplitter, QTableWidget, QTableWidgetItem,
+                            QListView)
 from PyQt5.QtCore import (Qt, QMimeData, QPoint, QSize, QRect, QByteArray,
                           QPropertyAnimation, QEasingCurve, QTimer, pyqtSignal, QEvent)
 from PyQt5.QtGui import (QDrag, QPixmap, QPainter, QPen, QColor, QFont,
                          QCursor, QIcon, QFontMetrics, QBrush, QLinearGradient, QPalette)
 
-from components import WidgetFactory, WIDGET_TYPES
+from components import (WidgetFactory, WIDGET_TYPES, CONTAINER_TYPES, TAB_PAGE_COUNT,
+                        tab_page_title, MODEL_TYPES, model_target)
+from project import (encode_properties, elide_defaults, dump_record, geometry_tuple,
+                     IndexedProject, is_indexed_project, load_legacy_project)
+from uifile import UiWriter, UI_DYNAMIC_PROPERTIES
+from plugins import PLUGINS
+from templates import TEMPLATES
+from widget_pool import WidgetPool
+from codegen_ir import build_widget_ir, run_passes, Call, PYTHON_PASSES, UI_PASSES
 
-# 暗黑主题样式表 - 可根据需要使用
-from styles import DARK_STYLESHEET
+# 画布的设计调色板
+from styles import design_palette
 
 # 设计画布类 - 接收拖放的控件并支持积木式交互
 class DesignCanvas(QWidget):
     """设计画布 - 用于设计GUI界面的工作区，支持拖放、选择、移动等操作"""
     
     widget_selected = pyqtSignal(QWidget)
+    widget_changed = pyqtSignal(QWidget)  # 控件属性或几何发生变化
+    widget_added = pyqtSignal(QWidget)    # 新建或加载了控件
+    widget_removed = pyqtSignal(QWidget)  # 控件即将被删除
+    template_requested = pyqtSignal(QWidget)  # 请求将控件（及其中的控件）保存为组合模板
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
         self.widgets = []
+        self.uids = {}  # 控件 -> 唯一编号，按控件直接查找编号
         self.selected_widget = None
         self.grid_size = 10
         self.show_grid = True
@@ -43,15 +59,22 @@ class DesignCanvas(QWidget):
         self.drag_indicator = None   # 拖拽时的指示器
         self.drop_indicator_rect = None  # 放置指示器矩形
         self.drag_widget_type = None  # 当前拖拽的控件类型
+        self.moved_widget = None      # 本次拖动中移动过的控件，松开时重新确定所属容器
+        
+        # 项目相关属性
+        self.next_uid = 1            # 下一个控件的唯一编号
+        self.project = None          # 当前打开的索引项目（局部加载）
+        self.loaded_uids = set()     # 已从索引项目加载的控件编号
+        
+        # 控件对象池：新建和加载时取出，删除时恢复默认属性后放回
+        self.pool = WidgetPool(self, self.reset_widget)
         
         # 设置最小尺寸
         self.setMinimumSize(800, 600)
         
-        # 设置背景色和边框
+        # 设置背景色：画布使用独立的完整调色板，画布上的控件不随界面主题变化
         self.setAutoFillBackground(True)
-        palette = self.palette()
-        palette.setColor(QPalette.Window, QColor(240, 240, 240))
-        self.setPalette(palette)
+        self.setPalette(design_palette())
         
         # 安装事件过滤器以捕获鼠标事件
         self.installEventFilter(self)
@@ -71,22 +94,22 @@ class DesignCanvas(QWidget):
     def dragMoveEvent(self, event):
         """处理拖拽移动事件"""
         if event.mimeData().hasText() and self.drag_widget_type:
-            # 获取控件默认属性
-            properties = WidgetFactory.get_default_properties(self.drag_widget_type)
-            geometry = properties["geometry"]
+            # 从预先计算的尺寸表获取控件默认尺寸，组合模板使用整体尺寸
+            template = TEMPLATES.get(self.drag_widget_type)
+            if template:
+                rect_width, rect_height = template.size
+            else:
+                rect_width, rect_height = WidgetFactory.default_size(self.drag_widget_type)
             
             # 计算放置位置（考虑网格对齐）
             drop_pos = event.pos()
             if self.snap_to_grid_enabled:
                 drop_pos = self.snap_to_grid(drop_pos)
             
-            # 更新放置预览矩形
-            rect_width = geometry.width()
-            rect_height = geometry.height()
-            self.drop_indicator_rect = QRect(
-                drop_pos.x(), drop_pos.y(),
-                rect_width, rect_height
-            )
+            # 更新放置预览矩形（复用已有的矩形对象）
+            if self.drop_indicator_rect is None:
+                self.drop_indicator_rect = QRect()
+            self.drop_indicator_rect.setRect(drop_pos.x(), drop_pos.y(), rect_width, rect_height)
             
             # 触发重绘以显示预览
             self.update()
@@ -98,8 +121,14 @@ class DesignCanvas(QWidget):
             widget_type = event.mimeData().text()
             position = event.pos()
             
-            # 创建新控件并添加到画布
-            widget = self.create_widget(widget_type, position)
+            # 组合模板整体批量创建，不逐个选中、不播放动画
+            template = TEMPLATES.get(widget_type)
+            if template:
+                self.instantiate_template(template, position)
+                widget = None
+            else:
+                # 创建新控件并添加到画布
+                widget = self.create_widget(widget_type, position)
             
             # 添加动画效果 - 使控件稍微放大然后恢复，提供视觉反馈
             if widget:
@@ -129,8 +158,8 @@ class DesignCanvas(QWidget):
     
     def create_widget(self, widget_type, position):
         """创建新控件并添加到画布"""
-        # 使用工厂创建控件
-        widget = WidgetFactory.create_widget(widget_type, self)
+        # 从对象池取出控件，池中没有时由工厂创建
+        widget = self.pool.acquire(widget_type)
         
         # 获取默认属性
         properties = WidgetFactory.get_default_properties(widget_type)
@@ -139,32 +168,416 @@ class DesignCanvas(QWidget):
         if self.snap_to_grid_enabled:
             position = self.snap_to_grid(position)
         
+        # 放置在容器内时记录所属容器（选项卡控件还记录当前页）
+        parent_uid, page = self.container_at(position)
+        
         # 更新几何位置
         geometry = properties["geometry"]
-        widget.setGeometry(QRect(position.x(), position.y(), 
-                                geometry.width(), geometry.height()))
+        properties["geometry"] = QRect(position.x(), position.y(),
+                                       geometry.width(), geometry.height())
+        widget.setGeometry(properties["geometry"])
         
         # 确保控件可见
         widget.show()
         
         # 安装事件过滤器以处理控件的交互
         widget.installEventFilter(self)
+        self._watch_tab_pages(widget, widget_type)
         
         # 存储控件信息
         widget_info = {
             "widget": widget,
             "widget_type": widget_type,
-            "properties": properties
+            "properties": properties,
+            "uid": self.next_uid,
+            "parent": parent_uid,
+            "page": page,
         }
+        self.next_uid += 1
         
         # 添加到控件列表
         self.widgets.append(widget_info)
+        self.uids[widget] = widget_info["uid"]
+        self.widget_added.emit(widget)
         
         # 选中新添加的控件
         self.select_widget(widget)
         
         return widget
     
+    def apply_property(self, widget, prop_name, value):
+        """将属性值应用到控件上"""
+        # 插件控件按清单中声明的设置方法设置属性
+        setters = PLUGINS.setters(type(widget).__name__)
+        if setters is not None and prop_name in setters:
+            setter = getattr(widget, setters[prop_name], None)
+            if setter:
+                setter(value)
+        
+        elif prop_name == "objectName":
+            widget.setObjectName(value)
+        
+        elif prop_name == "geometry":
+            widget.setGeometry(value)
+        
+        elif prop_name == "text" and hasattr(widget, "setText"):
+            widget.setText(value)
+        
+        elif prop_name == "placeholderText" and hasattr(widget, "setPlaceholderText"):
+            widget.setPlaceholderText(value)
+        
+        elif prop_name == "checked" and hasattr(widget, "setChecked"):
+            widget.setChecked(value)
+        
+        elif prop_name == "items":
+            if hasattr(widget, "clear") and hasattr(widget, "addItems"):
+                widget.clear()
+                widget.addItems(value)
+        
+        elif prop_name == "minimum" and hasattr(widget, "setMinimum"):
+            widget.setMinimum(value)
+        
+        elif prop_name == "maximum" and hasattr(widget, "setMaximum"):
+            widget.setMaximum(value)
+        
+        elif prop_name == "value" and hasattr(widget, "setValue"):
+            widget.setValue(value)
+        
+        elif prop_name == "orientation" and hasattr(widget, "setOrientation"):
+            if value.lower() == "horizontal":
+                widget.setOrientation(Qt.Horizontal)
+            else:
+                widget.setOrientation(Qt.Vertical)
+        
+        elif prop_name == "title" and hasattr(widget, "setTitle"):
+            widget.setTitle(value)
+        
+        elif prop_name in ("rowCount", "columnCount", "itemCount", "itemFile"):
+            # 模型/视图控件的这些属性设置在模型上
+            target = model_target(widget, prop_name)
+            setter = getattr(target, PYTHON_SETTERS[prop_name], None)
+            if setter:
+                setter(value)
+        
+        elif prop_name == "uniformItemSizes" and hasattr(widget, "setUniformItemSizes"):
+            widget.setUniformItemSizes(value)
+        
+        elif prop_name == "layoutMode" and hasattr(widget, "setLayoutMode"):
+            widget.setLayoutMode(getattr(QListView, value, QListView.SinglePass))
+        
+        elif prop_name == "batchSize" and hasattr(widget, "setBatchSize"):
+            widget.setBatchSize(value)
+        
+        elif prop_name == "horizontalHeaderVisible" and hasattr(widget, "horizontalHeader"):
+            widget.horizontalHeader().setVisible(value)
+        
+        elif prop_name == "verticalHeaderVisible" and hasattr(widget, "verticalHeader"):
+            widget.verticalHeader().setVisible(value)
+    
+    def reset_widget(self, widget, widget_type):
+        """把控件恢复为新建时的状态（放回对象池之前）"""
+        widget.removeEventFilter(self)
+        self.update_widget_style(widget, False)
+        if widget.testAttribute(Qt.WA_SetFont):
+            widget.setFont(QFont())
+        for prop_name, value in WidgetFactory.get_default_properties(widget_type).items():
+            self.apply_property(widget, prop_name, value)
+        
+        # 画布上的单选按钮互斥，选中的按钮要先取消互斥才能取消选中
+        if isinstance(widget, QRadioButton) and widget.isChecked():
+            widget.setAutoExclusive(False)
+            widget.setChecked(False)
+            widget.setAutoExclusive(True)
+    
+    @staticmethod
+    def materialize_properties(widget_type, data):
+        """将项目文件中的属性数据还原为控件属性（几何、字体、颜色等），省略的属性取默认值"""
+        properties = WidgetFactory.get_default_properties(widget_type)
+        for prop_name, value in data.items():
+            if prop_name == "geometry":
+                # 只有位置没有尺寸时（如导入的布局控件）使用默认尺寸
+                if isinstance(value, dict):
+                    default = properties["geometry"]
+                    value = {"width": default.width(), "height": default.height(), **value}
+                value = QRect(*geometry_tuple(value))
+            elif isinstance(value, dict) and "__font__" in value:
+                font = QFont()
+                font.fromString(value["__font__"])
+                value = font
+            elif isinstance(value, dict) and "__color__" in value:
+                value = QColor(value["__color__"])
+            properties[prop_name] = value
+        return properties
+    
+    def load_records(self, records):
+        """批量加载控件记录 - 不逐个选中、不播放动画，最后一次性登记并统一重绘一次
+        
+        records 为 (记录文本, 记录) 列表，记录文本用于保存时判断是否修改过。
+        """
+        infos = []
+        children = []
+        for text, record in records:
+            widget_type = record["widget_type"]
+            
+            # 只有与默认值不同的属性需要调用设置方法，其余由默认模板补全
+            template = WidgetFactory.get_default_template(widget_type)
+            changed = elide_defaults(record["properties"], template)
+            properties = self.materialize_properties(widget_type, changed)
+            
+            widget = self.pool.acquire(widget_type)
+            for prop_name in changed:
+                self.apply_property(widget, prop_name, properties[prop_name])
+            widget.installEventFilter(self)
+            self._watch_tab_pages(widget, widget_type)
+            widget.show()
+            
+            uid = record.get("uid") or self.next_uid
+            self.next_uid = max(self.next_uid, uid + 1)
+            widget_info = {
+                "widget": widget,
+                "widget_type": widget_type,
+                "properties": properties,
+                "uid": uid,
+                "parent": record.get("parent"),
+                "page": record.get("page"),
+                "record_text": text,
+            }
+            infos.append(widget_info)
+            if widget_info["parent"] is not None:
+                children.append(widget_info)
+        
+        self.widgets.extend(infos)
+        for w in infos:
+            self.uids[w["widget"]] = w["uid"]
+        widgets = [w["widget"] for w in infos]
+        for widget in widgets:
+            self.widget_added.emit(widget)
+        
+        # 容器内的控件置于容器之上，选项卡只显示当前页的控件
+        if children:
+            by_uid = {w["uid"]: w for w in self.widgets}
+            for child in children:
+                parent = by_uid.get(child["parent"])
+                if parent and parent["widget_type"] == "QTabWidget":
+                    tab = parent["widget"]
+                    while tab.count() <= (child["page"] or 0):
+                        tab.addTab(QWidget(), tab_page_title(tab.count()))
+                child["widget"].raise_()
+            self.update_page_visibility()
+        
+        self.update()
+        return widgets
+    
+    def instantiate_template(self, template, position):
+        """将组合模板整体放到画布上 - 经 load_records 批量创建，最后只选中第一个顶层控件"""
+        if self.snap_to_grid_enabled:
+            position = self.snap_to_grid(position)
+        parent_uid, page = self.container_at(position)
+        records = template.instantiate((position.x(), position.y()), self.next_uid,
+                                       parent_uid, page)
+        widgets = self.load_records([(None, record) for record in records])
+        if widgets:
+            self.select_widget(widgets[0])
+        return widgets
+    
+    def group_records(self, widget=None):
+        """控件及其中所有控件的记录（按画布中的顺序），widget 为 None 时为整个画布"""
+        if widget is None:
+            group = self.widgets
+        else:
+            widget_info = self.find_widget_info(widget)
+            if not widget_info:
+                return []
+            members = {widget_info["uid"]}
+            members.update(w["uid"] for w in self.descendants(widget_info["uid"]))
+            group = [w for w in self.widgets if w["uid"] in members]
+        return [self.widget_record(w) for w in group]
+    
+    def widget_record(self, widget_info):
+        """将控件信息转换为项目文件记录（只保存与默认值不同的属性）"""
+        widget_type = widget_info["widget_type"]
+        record = {
+            "uid": widget_info["uid"],
+            "widget_type": widget_type,
+            "properties": encode_properties(widget_info["properties"],
+                                            WidgetFactory.get_default_template(widget_type)),
+            "parent": widget_info.get("parent"),
+        }
+        if widget_info.get("page") is not None:
+            record["page"] = widget_info["page"]
+        return record
+    
+    def collect_records(self, changed_only=False):
+        """收集已加载控件的记录 {uid: (记录文本, 记录)}
+        
+        changed_only 为真时只返回加载后修改过或新建的控件。
+        """
+        records = {}
+        for w in self.widgets:
+            record = self.widget_record(w)
+            text = dump_record(record)
+            if changed_only and text == w.get("record_text"):
+                continue
+            records[w["uid"]] = (text, record)
+        return records
+    
+    def record_order(self):
+        """项目中所有控件记录的最终顺序（含尚未加载的控件）"""
+        live_uids = [w["uid"] for w in self.widgets]
+        if not self.project:
+            return live_uids
+        
+        live = set(live_uids)
+        order = [e.uid for e in self.project.entries
+                 if e.uid not in self.loaded_uids or e.uid in live]
+        known = set(order)
+        order.extend(uid for uid in live_uids if uid not in known)
+        return order
+    
+    def mark_saved(self, records):
+        """保存后更新控件的记录文本，使其重新视为未修改"""
+        for w in self.widgets:
+            if w["uid"] in records:
+                w["record_text"] = records[w["uid"]][0]
+    
+    def attach_project(self, project, loaded_uids=()):
+        """关联索引项目，控件在进入可见区域时才加载"""
+        self.project = project
+        self.loaded_uids = set(loaded_uids)
+        self.next_uid = max([e.uid for e in project.entries] + [0]) + 1
+        
+        # 画布扩展到整个设计的范围，使滚动区域可以滚动到未加载的控件
+        width, height = project.bounds()
+        self.setMinimumSize(max(width, 800), max(height, 600))
+    
+    def detach_project(self):
+        """取消关联索引项目"""
+        self.project = None
+        self.loaded_uids = set()
+        self.setMinimumSize(800, 600)
+    
+    def _load_entries(self, entries):
+        """加载尚未加载的索引项"""
+        entries = [e for e in entries if e.uid not in self.loaded_uids]
+        if not entries:
+            return []
+        
+        # 同时加载尚未加载的外层容器
+        wanted = {e.uid for e in entries}
+        for entry in list(entries):
+            parent = self.project.by_uid.get(entry.parent)
+            while parent and parent.uid not in wanted and parent.uid not in self.loaded_uids:
+                wanted.add(parent.uid)
+                entries.append(parent)
+                parent = self.project.by_uid.get(parent.parent)
+        self.loaded_uids.update(e.uid for e in entries)
+        return self.load_records(self.project.read_records(entries))
+    
+    def load_region(self, rect):
+        """加载与区域相交的控件，rect 为画布坐标下的 QRect"""
+        if not self.project:
+            return []
+        return self._load_entries(self.project.query_region(geometry_tuple(rect)))
+    
+    def load_container(self, uid):
+        """加载容器控件及其包含的所有控件"""
+        if not self.project:
+            return []
+        return self._load_entries(self.project.query_container(uid))
+    
+    def load_all(self):
+        """加载索引项目中尚未加载的全部控件（生成代码、预览、保存模板等需要整个设计时）"""
+        if not self.project:
+            return []
+        return self._load_entries(self.project.entries)
+    
+    def find_widget_info(self, widget):
+        """返回控件对应的控件信息，找不到时返回 None"""
+        for w in self.widgets:
+            if w['widget'] == widget:
+                return w
+        return None
+    
+    def container_at(self, pos, exclude=()):
+        """返回位置所在的最上层可见容器 (uid, 页码)，不在容器内时返回 (None, None)"""
+        for w in reversed(self.widgets):
+            widget = w['widget']
+            if (w['widget_type'] in CONTAINER_TYPES and w['uid'] not in exclude and
+                    not widget.isHidden() and widget.geometry().contains(pos)):
+                if w['widget_type'] == "QTabWidget":
+                    return w['uid'], widget.currentIndex()
+                return w['uid'], None
+        return None, None
+    
+    def descendants(self, uid):
+        """返回容器内的所有控件信息（含嵌套容器中的控件）"""
+        children = {}
+        for w in self.widgets:
+            if w.get('parent') is not None:
+                children.setdefault(w['parent'], []).append(w)
+        
+        result = []
+        seen = {uid}
+        stack = list(children.get(uid, ()))
+        while stack:
+            w = stack.pop()
+            if w['uid'] not in seen:
+                seen.add(w['uid'])
+                result.append(w)
+                stack.extend(children.get(w['uid'], ()))
+        return result
+    
+    def _watch_tab_pages(self, widget, widget_type):
+        """选项卡控件切换页面时更新其中控件的显示"""
+        if widget_type == "QTabWidget":
+            widget.currentChanged.connect(lambda index: self.update_page_visibility())
+    
+    def update_page_visibility(self):
+        """只显示各选项卡当前页中的控件，嵌套容器中的控件随外层容器一起显示或隐藏"""
+        by_uid = {w['uid']: w for w in self.widgets}
+        visible = {}
+        
+        def is_visible(w):
+            uid = w['uid']
+            if uid not in visible:
+                visible[uid] = True  # 防止循环引用
+                parent = by_uid.get(w.get('parent'))
+                if parent is not None:
+                    on_page = (parent['widget_type'] != "QTabWidget" or
+                               (w.get('page') or 0) == parent['widget'].currentIndex())
+                    visible[uid] = on_page and is_visible(parent)
+            return visible[uid]
+        
+        for w in self.widgets:
+            shown = is_visible(w)
+            if w['widget'].isHidden() == shown:
+                w['widget'].setVisible(shown)
+    
+    def update_container(self, widget):
+        """控件移动后重新确定其所属容器（拖入或拖出容器）"""
+        info = self.find_widget_info(widget)
+        if info is None:
+            return
+        
+        moved = [info] + self.descendants(info['uid'])
+        parent_uid, page = self.container_at(widget.geometry().topLeft(),
+                                             {w['uid'] for w in moved})
+        if (parent_uid, page) != (info.get('parent'), info.get('page')):
+            info['parent'] = parent_uid
+            info['page'] = page
+            # 置于新容器之上
+            for w in moved:
+                w['widget'].raise_()
+            self.widget_changed.emit(widget)
+    
+    def move_descendants(self, uid, delta):
+        """容器移动时，容器内的控件随之移动"""
+        for w in self.descendants(uid):
+            child = w['widget']
+            child.move(child.pos() + delta)
+            w['properties']['geometry'] = child.geometry()
+            self.widget_changed.emit(child)
+    
     def select_widget(self, widget):
         """选择一个控件"""
         # 取消之前选择的控件
@@ -178,13 +591,10 @@ class DesignCanvas(QWidget):
             self.widget_selected.emit(widget)
     
     def update_widget_style(self, widget, selected):
-        """更新控件样式来显示选中状态"""
-        if selected:
-            widget.setStyleSheet("border: 2px solid #3399ff;")
-            widget.setProperty("selected", True)  # 设置自定义属性以在绘制时识别
-        else:
-            widget.setStyleSheet("")
-            widget.setProperty("selected", False)
+        """更新控件的选中状态 - 选中边框和手柄由画布绘制，不给控件设置样式表，
+        控件保持画布的调色板，选中时也不必重新匹配样式"""
+        widget.setProperty("selected", selected)  # 设置自定义属性以在绘制时识别
+        self.update()
     
     def snap_to_grid(self, pos):
         """将位置对齐到网格"""
@@ -247,7 +657,7 @@ class DesignCanvas(QWidget):
             pen.setStyle(Qt.DashLine)  # 虚线边框
             painter.setPen(pen)
             painter.setBrush(QColor(0, 120, 215, 15))  # 非常淡的填充
-            painter.drawRect(self.selected_widget.geometry())
+            painter.drawRect(self.selected_widget.geometry().adjusted(-2, -2, 2, 2))
             
             # 获取控件的几何信息
             geo = self.selected_widget.geometry()
@@ -386,6 +796,11 @@ class DesignCanvas(QWidget):
                 self.resize_edge = None
                 self.setCursor(Qt.ArrowCursor)
                 return True
+            
+            # 拖动结束后检查控件是否被拖入或拖出容器
+            if self.moved_widget is not None:
+                self.update_container(self.moved_widget)
+                self.moved_widget = None
         
         # 处理画布上的鼠标移动事件 - 实现调整大小
         elif event.type() == QEvent.MouseMove and obj == self and self.resize_mode and self.selected_widget:
@@ -442,6 +857,7 @@ class DesignCanvas(QWidget):
                 if w['widget'] == self.selected_widget:
                     w['properties']['geometry'] = new_geo
                     break
+            self.widget_changed.emit(self.selected_widget)
             
             # 强制重绘以显示调整手柄
             self.update()
@@ -463,13 +879,20 @@ class DesignCanvas(QWidget):
                         parent_pos = self.snap_to_grid(parent_pos)
                     
                     # 移动控件
+                    old_pos = obj.pos()
                     obj.move(parent_pos)
+                    self.moved_widget = obj
                     
                     # 更新存储的属性
-                    for w in self.widgets:
-                        if w['widget'] == obj:
-                            w['properties']['geometry'] = obj.geometry()
-                            break
+                    info = self.find_widget_info(obj)
+                    if info:
+                        info['properties']['geometry'] = obj.geometry()
+                    self.widget_changed.emit(obj)
+                    
+                    # 容器内的控件随容器一起移动
+                    delta = obj.pos() - old_pos
+                    if info and info['widget_type'] in CONTAINER_TYPES and not delta.isNull():
+                        self.move_descendants(info['uid'], delta)
                     
                     return True
         
@@ -510,6 +933,10 @@ class DesignCanvas(QWidget):
         copy_action = menu.addAction("复制")
         copy_action.triggered.connect(lambda: self.copy_widget(widget))
         
+        # 保存为组合模板（含容器中的控件）
+        template_action = menu.addAction("保存为模板")
+        template_action.triggered.connect(lambda: self.template_requested.emit(widget))
+        
         # 删除控件
         delete_action = menu.addAction("删除")
         delete_action.triggered.connect(lambda: self.delete_widget(widget))
@@ -523,19 +950,42 @@ class DesignCanvas(QWidget):
         self.widget_selected.emit(widget)
     
     def delete_widget(self, widget):
-        """删除控件"""
+        """删除控件（控件放回对象池，不能放回时销毁）"""
         # 从列表中移除
+        widget_type = None
         for i, w in enumerate(self.widgets):
             if w['widget'] == widget:
                 self.widgets.pop(i)
+                widget_type = w['widget_type']
+                self.widget_removed.emit(widget)
+                self.uids.pop(widget, None)
+                
+                # 容器内的控件一并删除
+                if w['widget_type'] in CONTAINER_TYPES:
+                    for child in [c for c in self.widgets if c.get('parent') == w['uid']]:
+                        self.delete_widget(child['widget'])
                 break
         
         # 取消选择
         if self.selected_widget == widget:
             self.selected_widget = None
         
-        # 删除控件
-        widget.deleteLater()
+        # 放回对象池或删除控件
+        if widget_type is None:
+            widget.deleteLater()
+        else:
+            self.pool.release(widget_type, widget)
+    
+    def clear_widgets(self):
+        """删除画布上的全部控件（新建、打开项目时）- 控件放回对象池，暂停重绘，最后统一重绘一次"""
+        self.setUpdatesEnabled(False)
+        widgets, self.widgets = self.widgets, []
+        self.selected_widget = None
+        for w in widgets:
+            self.widget_removed.emit(w['widget'])
+            self.pool.release(w['widget_type'], w['widget'])
+        self.uids = {}
+        self.setUpdatesEnabled(True)
     
     def copy_widget(self, widget):
         """复制一个控件"""
@@ -594,7 +1044,10 @@ class PropertyEditor(QScrollArea):
         
         # 标题标签
         self.title_label = QLabel("属性编辑器")
-        self.title_label.setStyleSheet("font-weight: bold; font-size: 14px;")
+        title_font = self.title_label.font()
+        title_font.setBold(True)
+        title_font.setPixelSize(14)
+        self.title_label.setFont(title_font)
         self.layout.addWidget(self.title_label)
         
         # 属性容器
@@ -688,15 +1141,33 @@ class PropertyEditor(QScrollArea):
             specific_props = ["rowCount", "columnCount", "horizontalHeaderVisible", "verticalHeaderVisible"]
             self.add_property_group("表格属性", specific_props)
         
+        elif widget_type == "QTableView":
+            specific_props = ["rowCount", "columnCount", "horizontalHeaderVisible", "verticalHeaderVisible"]
+            self.add_property_group("数据表格属性", specific_props)
+        
         elif widget_type == "QListWidget":
             specific_props = ["items", "currentRow", "sortingEnabled"]
             self.add_property_group("列表属性", specific_props)
+        
+        elif widget_type == "QListView":
+            specific_props = ["itemCount", "itemFile", "uniformItemSizes", "layoutMode", "batchSize"]
+            self.add_property_group("数据列表属性", specific_props)
+        
+        elif widget_type in PLUGINS:
+            # 插件控件：清单中声明的属性
+            specific_props = list(PLUGINS.types[widget_type].properties)
+            self.add_property_group(f"{WIDGET_TYPES[widget_type]['text']}属性", specific_props)
     
     def add_property_group(self, group_name, properties):
         """添加一组属性到编辑器中"""
         # 创建分组标签
         group_label = QLabel(group_name)
-        group_label.setStyleSheet("font-weight: bold; color: #555; background-color: #f0f0f0; padding: 3px;")
+        group_font = group_label.font()
+        group_font.setBold(True)
+        group_label.setFont(group_font)
+        group_label.setMargin(3)
+        group_label.setAutoFillBackground(True)
+        group_label.setBackgroundRole(QPalette.AlternateBase)
         self.prop_layout.addWidget(group_label)
         
         # 添加属性
@@ -707,7 +1178,9 @@ class PropertyEditor(QScrollArea):
         
         # 添加分隔符
         separator = QLabel()
-        separator.setStyleSheet("min-height: 1px; max-height: 1px; background-color: #e0e0e0;")
+        separator.setFixedHeight(1)
+        separator.setAutoFillBackground(True)
+        separator.setBackgroundRole(QPalette.Mid)
         self.prop_layout.addWidget(separator)
     
     def create_property_editor(self, prop):
@@ -772,6 +1245,15 @@ class PropertyEditor(QScrollArea):
             geo_widget.setLayout(geo_layout)
             prop_layout.addWidget(geo_widget)
         
+        # 列表项文件：可以直接输入路径或浏览选择
+        elif prop == "itemFile":
+            editor = QLineEdit(value)
+            editor.textChanged.connect(lambda text: self.property_changed.emit(prop, text))
+            browse_button = QPushButton("浏览...")
+            browse_button.clicked.connect(lambda: self.select_item_file(editor))
+            prop_layout.addWidget(editor, 1)
+            prop_layout.addWidget(browse_button)
+        
         # 字符串
         elif isinstance(value, str):
             editor = QLineEdit(value)
@@ -915,6 +1397,14 @@ class PropertyEditor(QScrollArea):
                 # 发出属性改变信号
                 self.property_changed.emit(prop_name, color)
     
+    def select_item_file(self, editor):
+        """选择列表项文件（每行一项）"""
+        file_name, _ = QFileDialog.getOpenFileName(
+            self, "选择列表项文件", editor.text(), "文本文件 (*.txt);;所有文件 (*)"
+        )
+        if file_name:
+            editor.setText(file_name)
+    
     def edit_string_list(self, prop_name):
         """编辑字符串列表"""
         if self.current_widget:
@@ -949,18 +1439,342 @@ class PropertyEditor(QScrollArea):
             if item.widget():
                 item.widget().deleteLater()
 
+# 无界面设计文档 - 只保存控件信息，不创建控件
+class DesignDocument:
+    """无界面的设计文档 - 与画布的控件信息格式相同但不创建控件，
+    可以在没有窗口的环境中（如命令行批量转换）交给 CodeGenerator 生成代码"""
+    
+    def __init__(self, records=()):
+        self.widgets = []
+        for record in records:
+            self.add_record(record)
+    
+    def add_record(self, record):
+        """添加一条项目记录"""
+        widget_type = record["widget_type"]
+        self.widgets.append({
+            "widget": None,
+            "widget_type": widget_type,
+            "properties": DesignCanvas.materialize_properties(widget_type, record["properties"]),
+            "uid": record.get("uid") or len(self.widgets) + 1,
+            "parent": record.get("parent"),
+            "page": record.get("page"),
+        })
+    
+    @classmethod
+    def from_file(cls, file_name):
+        """从项目文件（带索引的格式或旧版格式）加载全部控件"""
+        if is_indexed_project(file_name):
+            project = IndexedProject(file_name)
+            return cls(record for _, record in project.read_records(project.entries))
+        return cls(load_legacy_project(file_name))
+
+
+# Python 代码的输出模式：每个控件一段语句，或数据表加构建循环
+PYTHON_MODE_STANZA = "stanza"
+PYTHON_MODE_TABLE = "table"
+
+# Python 后端支持的属性 -> 设置方法
+PYTHON_SETTERS = {
+    "objectName": "setObjectName",
+    "text": "setText",
+    "placeholderText": "setPlaceholderText",
+    "checkable": "setCheckable",
+    "checked": "setChecked",
+    "items": "addItems",
+    "minimum": "setMinimum",
+    "maximum": "setMaximum",
+    "value": "setValue",
+    "orientation": "setOrientation",
+    "title": "setTitle",
+    "rowCount": "setRowCount",
+    "columnCount": "setColumnCount",
+    "itemCount": "setItemCount",
+    "itemFile": "setItemFile",
+    "uniformItemSizes": "setUniformItemSizes",
+    "layoutMode": "setLayoutMode",
+    "batchSize": "setBatchSize",
+}
+
+
+def python_setters(widget_type):
+    """控件类型的属性 -> 设置方法，插件控件使用清单中声明的设置方法"""
+    setters = PLUGINS.setters(widget_type)
+    return PYTHON_SETTERS if setters is None else setters
+
+# 生成代码中按需生成单元格数据的表格模型（模型/视图控件使用）
+LAZY_TABLE_MODEL_CODE = [
+    "from PyQt5.QtCore import QAbstractTableModel, QModelIndex",
+    "",
+    "class LazyTableModel(QAbstractTableModel):",
+    "    \"\"\"按需生成单元格数据的表格模型，内存占用与行数无关\"\"\"",
+    "",
+    "    def __init__(self, rows, columns, parent=None):",
+    "        super().__init__(parent)",
+    "        self.rows = rows",
+    "        self.columns = columns",
+    "",
+    "    def rowCount(self, parent=QModelIndex()):",
+    "        return 0 if parent.isValid() else self.rows",
+    "",
+    "    def columnCount(self, parent=QModelIndex()):",
+    "        return 0 if parent.isValid() else self.columns",
+    "",
+    "    def data(self, index, role=Qt.DisplayRole):",
+    "        if role == Qt.DisplayRole and index.isValid():",
+    "            return self.cell(index.row(), index.column())",
+    "        return None",
+    "",
+    "    def cell(self, row, column):",
+    "        # 在这里按需生成或读取（文件、数据库等）单元格数据",
+    "        return f'({row},{column})'",
+    "",
+]
+
+# 生成代码中按需读取或生成列表项的列表模型
+LAZY_LIST_MODEL_CODE = [
+    "from array import array",
+    "from PyQt5.QtCore import QAbstractListModel, QModelIndex",
+    "",
+    "class ItemFile:",
+    "    \"\"\"列表项文件（每行一项），只保存各行的偏移，显示时才按块读取",
+    "",
+    "    每次读取一块（BLOCK 行）时打开文件，读完即关闭，不长期占用文件。",
+    "    \"\"\"",
+    "",
+    "    BLOCK = 256",
+    "",
+    "    def __init__(self, file_name):",
+    "        self.file_name = file_name",
+    "        self.offsets = array('q')",
+    "        offset = 0",
+    "        with open(file_name, 'rb') as f:",
+    "            for line in f:",
+    "                self.offsets.append(offset)",
+    "                offset += len(line)",
+    "        self.offsets.append(offset)  # 文件末尾",
+    "        self.block_start = -1",
+    "        self.block = []",
+    "",
+    "    def __len__(self):",
+    "        return len(self.offsets) - 1",
+    "",
+    "    def __getitem__(self, row):",
+    "        if not 0 <= row < len(self):",
+    "            raise IndexError(row)",
+    "        start = row - row % self.BLOCK",
+    "        if start != self.block_start:",
+    "            end = min(start + self.BLOCK, len(self))",
+    "            with open(self.file_name, 'rb') as f:",
+    "                f.seek(self.offsets[start])",
+    "                data = f.read(self.offsets[end] - self.offsets[start])",
+    "            self.block = data.split(b'\\n')",
+    "            self.block_start = start",
+    "        return self.block[row - start].decode('utf-8', 'replace').rstrip('\\r')",
+    "",
+    "class LazyListModel(QAbstractListModel):",
+    "    \"\"\"按需提供列表项的列表模型：有列表项文件时按行读取，否则按序号生成\"\"\"",
+    "",
+    "    def __init__(self, count, item_file='', parent=None):",
+    "        super().__init__(parent)",
+    "        self.count = count",
+    "        self.items = None",
+    "        if item_file:",
+    "            try:",
+    "                self.items = ItemFile(item_file)",
+    "            except OSError:",
+    "                pass",
+    "",
+    "    def rowCount(self, parent=QModelIndex()):",
+    "        if parent.isValid():",
+    "            return 0",
+    "        return len(self.items) if self.items is not None else self.count",
+    "",
+    "    def data(self, index, role=Qt.DisplayRole):",
+    "        if role == Qt.DisplayRole and index.isValid():",
+    "            return self.item(index.row())",
+    "        return None",
+    "",
+    "    def item(self, row):",
+    "        if self.items is not None:",
+    "            return self.items[row]",
+    "        return f'项目{row + 1}'",
+    "",
+]
+
+# 模型类名 -> 生成代码中的模型类定义
+MODEL_CODE = {
+    "LazyTableModel": LAZY_TABLE_MODEL_CODE,
+    "LazyListModel": LAZY_LIST_MODEL_CODE,
+}
+
+# .ui 文件中中央控件的直接子控件所在的缩进层级
+UI_WIDGET_DEPTH = 3
+
+# 代码写入文件时使用的缓冲区大小
+WRITE_BUFFER_SIZE = 1 << 16
+
 # 代码生成器类 - 生成 PyQt5 代码
 class CodeGenerator:
-    """代码生成器 - 生成 PyQt5 代码和 UI 文件"""
+    """代码生成器 - 生成 PyQt5 代码和 UI 文件
+    
+    两个后端都先把控件转换为中间表示（codegen_ir），经过优化遍后再输出。
+    每个控件的代码片段按 (类型, 变量序号, 容器上下文, 属性) 的哈希缓存，画布发出
+    widget_changed 或 widget_added 信号时将对应控件标记为脏，重新生成时只重建
+    脏控件的片段；控件被删除时丢弃其片段，编号被重新使用时不会取到旧的片段。
+    """
     
     def __init__(self, canvas):
         self.canvas = canvas
+        self.fragment_cache = {"python": {}, "python_lazy": {}, "python_table": {}, "ui": {}}  # 格式 -> {uid: (位置, 哈希, 片段)}
+        self.dirty = {kind: set() for kind in self.fragment_cache}  # 格式 -> 需要重新检查的 uid
+        self.contexts = {}  # uid -> 控件在容器层次中的上下文，见 _layout
+        
+        # 两个后端各自的优化遍，可以替换或增减
+        self.python_passes = PYTHON_PASSES
+        self.ui_passes = UI_PASSES
+        
+        # 新建、加载和属性变更时使对应控件的缓存片段失效，删除时丢弃
+        if hasattr(canvas, "widget_changed"):
+            canvas.widget_changed.connect(self.invalidate)
+            canvas.widget_added.connect(self.invalidate)
+            canvas.widget_removed.connect(self.forget)
     
-    def generate_python_code(self):
-        """生成 Python 代码"""
+    def invalidate(self, widget):
+        """将控件标记为脏，下次生成时重新检查其代码片段"""
+        uid = self.canvas.uids.get(widget)
+        if uid is not None:
+            for dirty in self.dirty.values():
+                dirty.add(uid)
+    
+    def forget(self, widget):
+        """丢弃被删除控件的缓存片段；画布已清空（新建、打开项目）时丢弃全部缓存"""
+        if not self.canvas.widgets:
+            for kind in self.fragment_cache:
+                self.fragment_cache[kind].clear()
+                self.dirty[kind].clear()
+            return
+        uid = self.canvas.uids.get(widget)
+        if uid is not None:
+            for kind in self.fragment_cache:
+                self.fragment_cache[kind].pop(uid, None)
+                self.dirty[kind].discard(uid)
+    
+    def _fragment_key(self, index, widget_info):
+        """代码片段的缓存键：类型、变量序号、容器上下文、优化遍和属性的哈希"""
+        properties = dump_record(encode_properties(widget_info['properties']))
+        return hash((widget_info['widget_type'], index, self.contexts.get(widget_info['uid']),
+                     tuple(self.python_passes), tuple(self.ui_passes), properties))
+    
+    def _fragment(self, kind, build_fragment, i, w):
+        """返回控件的代码片段，只重建脏的或缓存键变化的片段"""
+        cache = self.fragment_cache[kind]
+        dirty = self.dirty[kind]
+        uid = w['uid']
+        place = (i, self.contexts.get(uid), self.python_passes, self.ui_passes)
+        entry = cache.get(uid)
+        if entry is None or uid in dirty or entry[0] != place:
+            key = self._fragment_key(i, w)
+            if entry is None or entry[1] != key:
+                entry = (place, key, build_fragment(i, w))
+            else:
+                entry = (place, key, entry[2])
+            cache[uid] = entry
+            dirty.discard(uid)
+        return entry[2]
+    
+    def _fragments(self, kind, build_fragment, items):
+        """逐个产出 [(序号, 控件信息)] 中各控件的代码片段"""
+        for i, w in items:
+            yield self._fragment(kind, build_fragment, i, w)
+    
+    def _prune(self):
+        """丢弃已删除控件的缓存片段（在完整生成一遍之后调用）"""
+        live = {w['uid'] for w in self.canvas.widgets}
+        for cache in self.fragment_cache.values():
+            for uid in set(cache) - live:
+                del cache[uid]
+    
+    @staticmethod
+    def _var_name(i, w):
+        """控件在生成代码中的属性名（不含 self.）"""
+        return f"{w['widget_type'].lower()}_{i+1}"
+    
+    def _layout(self, lazy_tabs=False):
+        """按容器层次整理控件，父控件总在子控件之前
+        
+        返回 (树序排列的 [(序号, 控件信息, 所属页面)], {序号: [子控件序号]})，并更新
+        self.contexts：{uid: (父控件属性名, 页码, 原点 x, 原点 y, .ui 缩进, 选项卡页数)}。
+        所属页面为延迟构建时控件所在的 (选项卡序号, 页码)，否则为 None。
+        """
         widgets = self.canvas.widgets
-        if not widgets:
-            return "# 没有控件可以生成代码"
+        index = {w['uid']: i for i, w in enumerate(widgets)}
+        children = {}
+        pages = {}
+        for i, w in enumerate(widgets):
+            parent = index.get(w.get('parent'))
+            if parent is not None:
+                children.setdefault(parent, []).append(i)
+                # 选项卡的页数：默认页数与子控件所在最大页码中的较大者
+                if widgets[parent]['widget_type'] == "QTabWidget":
+                    pages[parent] = max(pages.get(parent, TAB_PAGE_COUNT), (w.get('page') or 0) + 1)
+        
+        order = []
+        tree = {}
+        contexts = {}
+        visited = set()
+        
+        def visit(i, parent, page, origin, depth, owner):
+            visited.add(i)
+            w = widgets[i]
+            tab_pages = pages.get(i, TAB_PAGE_COUNT) if w['widget_type'] == "QTabWidget" else 0
+            contexts[w['uid']] = (parent, page) + origin + (depth, tab_pages)
+            order.append((i, w, owner))
+            
+            name = self._var_name(i, w)
+            origin = geometry_tuple(w['properties'].get('geometry'))[:2]
+            for k in children.get(i, ()):
+                if k in visited:
+                    continue
+                tree.setdefault(i, []).append(k)
+                if tab_pages:
+                    child_page = widgets[k].get('page') or 0
+                    visit(k, name, child_page, origin, depth + 2,
+                          (i, child_page) if lazy_tabs else owner)
+                else:
+                    visit(k, name, None, origin, depth + 1, owner)
+        
+        for i, w in enumerate(widgets):
+            if w.get('parent') not in index:
+                visit(i, None, None, (0, 0), UI_WIDGET_DEPTH, None)
+        
+        # 循环引用的控件按顶层控件处理
+        for i in range(len(widgets)):
+            if i not in visited:
+                visit(i, None, None, (0, 0), UI_WIDGET_DEPTH, None)
+        
+        self.contexts = contexts
+        return order, tree
+    
+    @staticmethod
+    def _join_lines(lines):
+        """逐行产出文本块，行间以换行分隔（与 "\n".join 的结果一致）"""
+        first = True
+        for line in lines:
+            yield line if first else "\n" + line
+            first = False
+    
+    def iter_python_code(self, mode=PYTHON_MODE_STANZA, lazy_tabs=False):
+        """以文本块流的形式逐段生成 Python 代码
+        
+        mode 为 PYTHON_MODE_TABLE 时输出紧凑的数据表和构建循环，
+        生成的模块更小，编译、导入和构建窗口更快。
+        lazy_tabs 为真时（逐控件语句模式）选项卡各页中的控件放在单独的构建方法中，
+        首次切换到该页时才创建，窗口可以更快地显示出来。
+        """
+        if not self.canvas.widgets:
+            yield "# 没有控件可以生成代码"
+            return
         
         # 生成导入语句
         imports = [
@@ -969,14 +1783,20 @@ class CodeGenerator:
             "                           QHBoxLayout, QLabel, QPushButton, QGroupBox,",
             "                           QLineEdit, QTextEdit, QCheckBox, QRadioButton,",
             "                           QComboBox, QSpinBox, QSlider, QTableWidget,",
-            "                           QTabWidget, QListWidget)",
+            "                           QTableView, QTabWidget, QListWidget, QListView)",
             "from PyQt5.QtCore import Qt, QRect",
             "from PyQt5.QtGui import QFont, QIcon",
             ""
         ]
-        
-        # 导入所需的特定控件
-        widget_types = set(w['widget_type'] for w in widgets)
+        # 用到的模型类
+        used_types = {w['widget_type'] for w in self.canvas.widgets}
+        for widget_type, (model_class, _) in MODEL_TYPES.items():
+            if widget_type in used_types:
+                imports.extend(MODEL_CODE[model_class])
+        # 用到的插件控件类（只输出导入语句，不导入插件模块）
+        plugin_imports = PLUGINS.import_lines(used_types)
+        if plugin_imports:
+            imports.extend(plugin_imports + [""])
         
         # 主窗口类定义
         class_code = [
@@ -1000,74 +1820,6 @@ class CodeGenerator:
             ""
         ]
         
-        # 控件创建代码
-        setup_code = []
-        for i, w in enumerate(widgets):
-            widget = w['widget']
-            widget_type = w['widget_type']
-            properties = w['properties']
-            var_name = f"self.{widget_type.lower()}_{i+1}"
-            
-            # 创建控件
-            setup_code.append(f"        # 创建 {widget_type}")
-            setup_code.append(f"        {var_name} = {widget_type}(self.central_widget)")
-            
-            # 设置几何属性
-            geometry = properties.get('geometry')
-            if geometry:
-                x, y, width, height = geometry.x(), geometry.y(), geometry.width(), geometry.height()
-                setup_code.append(f"        {var_name}.setGeometry(QRect({x}, {y}, {width}, {height}))")
-            
-            # 设置对象名称
-            obj_name = properties.get('objectName')
-            if obj_name:
-                setup_code.append(f"        {var_name}.setObjectName('{obj_name}')")
-            
-            # 设置特定属性
-            if 'text' in properties and hasattr(widget, 'setText'):
-                text = properties['text']
-                setup_code.append(f"        {var_name}.setText('{text}')")
-            
-            if 'placeholderText' in properties and hasattr(widget, 'setPlaceholderText'):
-                placeholder = properties['placeholderText']
-                setup_code.append(f"        {var_name}.setPlaceholderText('{placeholder}')")
-            
-            if 'checked' in properties and hasattr(widget, 'setChecked'):
-                checked = properties['checked']
-                setup_code.append(f"        {var_name}.setChecked({checked})")
-            
-            if 'items' in properties and hasattr(widget, 'addItems'):
-                items = properties['items']
-                items_str = "[" + ", ".join([f"'{item}'" for item in items]) + "]"
-                setup_code.append(f"        {var_name}.addItems({items_str})")
-            
-            if 'minimum' in properties and hasattr(widget, 'setMinimum'):
-                minimum = properties['minimum']
-                setup_code.append(f"        {var_name}.setMinimum({minimum})")
-            
-            if 'maximum' in properties and hasattr(widget, 'setMaximum'):
-                maximum = properties['maximum']
-                setup_code.append(f"        {var_name}.setMaximum({maximum})")
-            
-            if 'value' in properties and hasattr(widget, 'setValue'):
-                value = properties['value']
-                setup_code.append(f"        {var_name}.setValue({value})")
-            
-            if 'orientation' in properties and hasattr(widget, 'setOrientation'):
-                orientation = properties['orientation']
-                if orientation.lower() == 'horizontal':
-                    setup_code.append(f"        {var_name}.setOrientation(Qt.Horizontal)")
-                else:
-                    setup_code.append(f"        {var_name}.setOrientation(Qt.Vertical)")
-            
-            if 'title' in properties and hasattr(widget, 'setTitle'):
-                title = properties['title']
-                setup_code.append(f"        {var_name}.setTitle('{title}')")
-            
-            # 添加到布局
-            setup_code.append(f"        self.layout.addWidget({var_name})")
-            setup_code.append("")
-        
         # 主函数代码
         main_code = [
             "# 主函数",
@@ -1081,90 +1833,379 @@ class CodeGenerator:
             "    main()"
         ]
         
-        # 组合所有代码
-        all_code = imports + [""] + class_code + setup_code + [""] + main_code
-        return "\n".join(all_code)
+        if mode == PYTHON_MODE_TABLE:
+            order, _ = self._layout()
+            
+            # 数据表、类型查找表和统一的构建循环
+            widget_types = sorted({w['widget_type'] for w in self.canvas.widgets})
+            tab_pages = [(self._var_name(i, w), self.contexts[w['uid']][5])
+                         for i, w, _ in order if self.contexts[w['uid']][5]]
+            table_head = [
+                "# 控件数据表：(属性名, 类型, (x, y, 宽, 高), 父控件属性名, 选项卡页码, ((设置方法, 参数), ...))",
+                "WIDGETS = (",
+            ]
+            table_tail = [
+                ")",
+                "",
+                "# 控件类型 -> 类",
+                "WIDGET_CLASSES = {",
+            ] + [f"    {t!r}: {t}," for t in widget_types] + [
+                "}",
+                "",
+                "# 选项卡控件属性名 -> 页面标题",
+                "TAB_PAGES = {",
+            ] + [f"    {name!r}: {tuple(tab_page_title(p) for p in range(count))!r},"
+                 for name, count in tab_pages] + [
+                "}",
+                "",
+                "# 模型/视图控件属性名 -> (模型类, 构造参数)",
+                "MODELS = {",
+            ] + [f"    {self._var_name(i, w)!r}: ({MODEL_TYPES[w['widget_type']][0]}, "
+                 f"{self._model_args(w)!r}),"
+                 for i, w, _ in order if w['widget_type'] in MODEL_TYPES] + [
+                "}",
+                "",
+            ]
+            build_code = [
+                "        # 按数据表依次创建控件（父控件总在子控件之前）",
+                "        for name, widget_type, geometry, parent, page, calls in WIDGETS:",
+                "            if parent is None:",
+                "                container = self.central_widget",
+                "            elif page is None:",
+                "                container = getattr(self, parent)",
+                "            else:",
+                "                container = getattr(self, parent).widget(page)",
+                "            widget = WIDGET_CLASSES[widget_type](container)",
+                "            widget.setGeometry(QRect(*geometry))",
+                "            for method, args in calls:",
+                "                getattr(widget, method)(*args)",
+                "            for title in TAB_PAGES.get(name, ()):",
+                "                widget.addTab(QWidget(), title)",
+                "            if name in MODELS:",
+                "                model_class, args = MODELS[name]",
+                "                widget.setModel(model_class(*args, widget))",
+                "            if parent is None:",
+                "                self.layout.addWidget(widget)",
+                "            setattr(self, name, widget)",
+            ]
+            yield from self._join_lines(itertools.chain(
+                imports, table_head,
+                self._fragments("python_table", self._python_table_row,
+                                ((i, w) for i, w, _ in order)),
+                table_tail, [""], class_code, build_code,
+                [""], main_code))
+            self._prune()
+            return
+        
+        order, _ = self._layout(lazy_tabs)
+        
+        # 按所属页面分组：None 为 init_ui 中直接创建的控件
+        blocks = {}
+        for i, w, owner in order:
+            blocks.setdefault(owner, []).append((i, w))
+        lazy_pages = {}  # 选项卡序号 -> 延迟构建的页码
+        for owner in blocks:
+            if owner is not None:
+                lazy_pages.setdefault(owner[0], []).append(owner[1])
+        if lazy_pages:
+            class_code.extend([
+                "        # 延迟构建的选项卡页面：选项卡 -> {页码: 构建方法}",
+                "        self.page_builders = {}",
+                "",
+            ])
+        
+        # 依次产出导入、类定义、各控件片段（按控件缓存）、页面构建方法和主函数
+        yield from self._join_lines(itertools.chain(
+            imports, [""], class_code,
+            self._python_block(blocks.get(None, ()), lazy_pages),
+            self._python_page_builders(blocks, lazy_pages),
+            [""], main_code))
+        self._prune()
     
-    def generate_ui_code(self):
-        """生成 Qt Designer UI 文件格式的 XML 代码"""
+    def _python_block(self, items, lazy_pages, kind="python"):
+        """产出一组控件的代码片段，延迟构建的选项卡之后附加页面注册代码"""
+        build = self._python_lazy_fragment if kind == "python_lazy" else self._python_fragment
+        for i, w in items:
+            yield self._fragment(kind, build, i, w)
+            if i in lazy_pages:
+                var_name = "self." + self._var_name(i, w)
+                builders = ", ".join(f"{page}: self.build_{self._var_name(i, w)}_page_{page}"
+                                     for page in lazy_pages[i])
+                yield "        # 页面中的控件在首次切换到该页时才创建"
+                yield f"        self.page_builders[{var_name}] = {{{builders}}}"
+                yield (f"        {var_name}.currentChanged.connect("
+                       f"lambda index, tab={var_name}: self.build_tab_page(tab, index))")
+                yield f"        self.build_tab_page({var_name}, {var_name}.currentIndex())"
+                yield ""
+    
+    def _python_page_builders(self, blocks, lazy_pages):
+        """产出各选项卡页面的构建方法和统一的分派方法"""
+        if not lazy_pages:
+            return
         widgets = self.canvas.widgets
-        if not widgets:
-            return "<!-- 没有控件可以生成 UI 文件 -->"
+        for owner, items in blocks.items():
+            if owner is None:
+                continue
+            tab_index, page = owner
+            name = self._var_name(tab_index, widgets[tab_index])
+            yield f"    def build_{name}_page_{page}(self):"
+            yield f'        """构建 {name} 第 {page + 1} 页中的控件"""'
+            yield from self._python_block(items, lazy_pages, "python_lazy")
+        
+        yield "    def build_tab_page(self, tab, index):"
+        yield '        """首次切换到选项卡页面时构建其中的控件"""'
+        yield "        builder = self.page_builders.get(tab, {}).pop(index, None)"
+        yield "        if builder:"
+        yield "            builder()"
+        yield ""
+    
+    def generate_python_code(self, mode=PYTHON_MODE_STANZA, lazy_tabs=False):
+        """生成 Python 代码"""
+        return "".join(self.iter_python_code(mode, lazy_tabs))
+    
+    def write_python_code(self, file_name, mode=PYTHON_MODE_STANZA, lazy_tabs=False,
+                          manifest=None):
+        """将 Python 代码流式写入文件，返回是否写入（见 _write_chunks）"""
+        return self._write_chunks(file_name, self.iter_python_code(mode, lazy_tabs), manifest)
+    
+    def preview_python_code(self, max_lines, mode=PYTHON_MODE_STANZA, lazy_tabs=False):
+        """只生成预览所需的前 max_lines 行 Python 代码，返回 (文本, 是否截断)"""
+        return self._head_lines(self.iter_python_code(mode, lazy_tabs), max_lines)
+    
+    @staticmethod
+    def _write_chunks(file_name, chunks, manifest=None):
+        """通过带缓冲的文件写入器逐块写出文本
+        
+        指定导出清单（manifest.OutputManifest）时，内容与现有文件相同则不改动文件。
+        返回是否写入了文件。
+        """
+        if manifest is not None:
+            return manifest.write(file_name, chunks, WRITE_BUFFER_SIZE)
+        with open(file_name, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        return True
+    
+    @staticmethod
+    def _head_lines(chunks, max_lines):
+        """从文本块流中读取前 max_lines 行，读够后不再继续生成"""
+        parts = []
+        count = 0
+        for chunk in chunks:
+            count += chunk.count("\n")
+            parts.append(chunk)
+            if count >= max_lines:
+                lines = "".join(parts).split("\n")
+                return "\n".join(lines[:max_lines]), True
+        return "".join(parts), False
+    
+    def widget_ir(self, i, w, passes):
+        """构建控件的中间表示并执行优化遍（需先调用 _layout 确定容器上下文）"""
+        parent, page, x0, y0, _, tab_pages = self.contexts[w['uid']]
+        ir = build_widget_ir(w['widget_type'], self._var_name(i, w), w['properties'],
+                             parent, page, (x0, y0), tab_pages)
+        return run_passes(ir, passes)
+    
+    @staticmethod
+    def _python_value(name, value):
+        """属性值在 Python 代码中的源码"""
+        if name == 'orientation':
+            return 'Qt.Horizontal' if value.lower() == 'horizontal' else 'Qt.Vertical'
+        if name == 'items':
+            return repr(list(value))
+        if name == 'layoutMode':
+            return f'QListView.{value}'
+        return repr(value)
+    
+    def _python_calls(self, ir):
+        """将中间表示的属性节点转换为设置方法列表 [(方法名, 参数源码)]
+        
+        模型/视图控件的模型属性在创建模型时传入，不生成设置方法。
+        """
+        skipped = MODEL_TYPES.get(ir.construct.widget_type, (None, ()))[1]
+        setters = python_setters(ir.construct.widget_type)
+        calls = []
+        for node in ir.nodes:
+            if isinstance(node, Call):
+                args = ", ".join(self._python_value(name, value)
+                                 for name, value in zip(node.properties, node.values))
+                calls.append((node.method, args))
+            elif node.name in setters and node.name not in skipped:
+                calls.append((setters[node.name], self._python_value(node.name, node.value)))
+        return calls
+    
+    def _python_fragment(self, i, w, lazy=False):
+        """生成单个控件的 Python 代码片段
+        
+        容器内的控件以容器（选项卡为对应页面）为父控件，几何相对容器左上角。
+        lazy 为真时片段位于页面构建方法中，页面已经显示，新建的控件需要显式显示。
+        """
+        ir = self.widget_ir(i, w, self.python_passes)
+        construct = ir.construct
+        widget_type = construct.widget_type
+        var_name = "self." + construct.name
+        parent, page = construct.parent, construct.page
+        if parent is None:
+            parent_expr = "self.central_widget"
+        elif page is None:
+            parent_expr = f"self.{parent}"
+        else:
+            parent_expr = f"self.{parent}.widget({page})"
+        setup_code = []
         
-        # 开始 XML
-        ui_code = [
-            '<?xml version="1.0" encoding="UTF-8"?>',
-            '<ui version="4.0">',
-            ' <class>MainWindow</class>',
-            ' <widget class="QMainWindow" name="MainWindow">',
-            '  <property name="geometry">',
-            '   <rect>',
-            '    <x>0</x>',
-            '    <y>0</y>',
-            '    <width>800</width>',
-            '    <height>600</height>',
-            '   </rect>',
-            '  </property>',
-            '  <property name="windowTitle">',
-            '   <string>PyQt5 GUI 应用</string>',
-            '  </property>',
-            '  <widget class="QWidget" name="centralwidget">',
-        ]
+        # 创建控件
+        setup_code.append(f"        # 创建 {widget_type}")
+        setup_code.append(f"        {var_name} = {widget_type}({parent_expr})")
         
-        # 生成各个控件的 XML
-        for i, w in enumerate(widgets):
-            widget = w['widget']
-            widget_type = w['widget_type']
-            properties = w['properties']
-            geometry = properties.get('geometry')
-            obj_name = properties.get('objectName') or f"{widget_type.lower()}_{i+1}"
-            
-            ui_code.extend([
-                f'   <widget class="{widget_type}" name="{obj_name}">',
-                '    <property name="geometry">',
-                '     <rect>',
-                f'      <x>{geometry.x()}</x>',
-                f'      <y>{geometry.y()}</y>',
-                f'      <width>{geometry.width()}</width>',
-                f'      <height>{geometry.height()}</height>',
-                '     </rect>',
-                '    </property>',
-            ])
-            
-            # 添加其他属性
-            if 'text' in properties and hasattr(widget, 'text'):
-                ui_code.extend([
-                    '    <property name="text">',
-                    f'     <string>{properties["text"]}</string>',
-                    '    </property>',
-                ])
-            
-            if 'placeholderText' in properties and hasattr(widget, 'placeholderText'):
-                ui_code.extend([
-                    '    <property name="placeholderText">',
-                    f'     <string>{properties["placeholderText"]}</string>',
-                    '    </property>',
-                ])
-            
-            if 'checked' in properties and hasattr(widget, 'isChecked'):
-                ui_code.extend([
-                    '    <property name="checked">',
-                    f'     <bool>{"true" if properties["checked"] else "false"}</bool>',
-                    '    </property>',
-                ])
-            
-            # 关闭控件标签
-            ui_code.append('   </widget>')
+        # 设置几何属性
+        x, y, width, height = construct.geometry
+        setup_code.append(f"        {var_name}.setGeometry(QRect({x}, {y}, {width}, {height}))")
+        
+        # 设置属性
+        for method, args in self._python_calls(ir):
+            setup_code.append(f"        {var_name}.{method}({args})")
+        
+        # 模型/视图控件的模型
+        if widget_type in MODEL_TYPES:
+            args = "".join(f"{arg!r}, " for arg in self._model_args(w))
+            setup_code.append(f"        {var_name}.setModel({MODEL_TYPES[widget_type][0]}({args}{var_name}))")
+        
+        # 选项卡页面
+        for index in range(construct.tab_pages):
+            setup_code.append(f"        {var_name}.addTab(QWidget(), {tab_page_title(index)!r})")
+        
+        # 顶层控件添加到布局
+        if parent is None:
+            setup_code.append(f"        self.layout.addWidget({var_name})")
+        elif lazy:
+            setup_code.append(f"        {var_name}.show()")
+        setup_code.append("")
+        return "\n".join(setup_code)
+    
+    @staticmethod
+    def _model_args(w):
+        """模型/视图控件的模型构造参数（如表格的行数和列数）"""
+        properties = w['properties']
+        return tuple(properties.get(name) for name in MODEL_TYPES[w['widget_type']][1])
+    
+    def _python_lazy_fragment(self, i, w):
+        """生成选项卡页面构建方法中单个控件的 Python 代码片段"""
+        return self._python_fragment(i, w, lazy=True)
+    
+    def _python_table_row(self, i, w):
+        """生成紧凑模式下单个控件的数据表行"""
+        ir = self.widget_ir(i, w, self.python_passes)
+        c = ir.construct
+        calls = "".join(f"('{method}', ({args},)), " for method, args in self._python_calls(ir))
+        return (f"    ({c.name!r}, {c.widget_type!r}, {c.geometry!r}, {c.parent!r}, {c.page!r}, "
+                f"({calls.rstrip()})),")
+    
+    def iter_ui_code(self):
+        """以文本块流的形式逐段生成 Qt Designer UI 文件格式的 XML 代码"""
+        if not self.canvas.widgets:
+            yield "<!-- 没有控件可以生成 UI 文件 -->"
+            return
+        
+        widgets = self.canvas.widgets
+        order, tree = self._layout()
+        buffer = io.StringIO()
+        writer = UiWriter(buffer)
+        
+        def drain():
+            text = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return text
+        
+        def write_widget(i, w):
+            """写出控件及其包含的控件，选项卡中的控件放在各自的页面元素中"""
+            writer.raw_start(self._fragment("ui", self._ui_fragment, i, w))
+            children = tree.get(i, ())
+            tab_pages = self.contexts[w['uid']][5]
+            if tab_pages:
+                name = self._ui_name(i, w)
+                for page in range(tab_pages):
+                    writer.start("widget", {"class": "QWidget", "name": f"{name}_page{page + 1}"})
+                    writer.string_property("title", tab_page_title(page), tag="attribute")
+                    for k in children:
+                        if (widgets[k].get('page') or 0) == page:
+                            yield from write_widget(k, widgets[k])
+                    writer.end("widget")
+            else:
+                for k in children:
+                    yield from write_widget(k, widgets[k])
+            writer.end("widget")
+            yield drain()
+        
+        # 开始 XML
+        writer.start_document()
+        writer.start("ui", {"version": "4.0"})
+        writer.element("class", "MainWindow")
+        writer.start("widget", {"class": "QMainWindow", "name": "MainWindow"})
+        writer.rect("geometry", 0, 0, 800, 600)
+        writer.string_property("windowTitle", "PyQt5 GUI 应用")
+        writer.start("widget", {"class": "QWidget", "name": "centralwidget"})
+        
+        # 各个控件的 XML 按控件缓存，逐个写出
+        for i, w, _ in order:
+            if self.contexts[w['uid']][0] is None:
+                yield from write_widget(i, w)
         
         # 完成 UI 文件
-        ui_code.extend([
-            '  </widget>',
-            '  <menubar name="menubar"/>',
-            '  <statusbar name="statusbar"/>',
-            ' </widget>',
-            ' <resources/>',
-            ' <connections/>',
-            '</ui>'
-        ])
-        
-        return "\n".join(ui_code)
+        writer.end("widget")
+        writer.element("widget", attrs={"class": "QMenuBar", "name": "menubar"})
+        writer.element("widget", attrs={"class": "QStatusBar", "name": "statusbar"})
+        writer.end("widget")
+        
+        # 插件控件声明为自定义控件，头文件路径由模块名得到（pyuic 按它导入模块）
+        plugin_types = sorted({w['widget_type'] for w in widgets} & PLUGINS.types.keys())
+        if plugin_types:
+            writer.start("customwidgets")
+            for widget_type in plugin_types:
+                plugin_type = PLUGINS.types[widget_type]
+                writer.start("customwidget")
+                writer.element("class", widget_type)
+                writer.element("extends", plugin_type.extends)
+                writer.element("header", plugin_type.plugin.module_name.replace(".", "/") + ".h")
+                writer.end("customwidget")
+            writer.end("customwidgets")
+        writer.element("resources")
+        writer.element("connections")
+        writer.end("ui")
+        yield drain()
+        self._prune()
+    
+    def generate_ui_code(self):
+        """生成 Qt Designer UI 文件格式的 XML 代码"""
+        return "".join(self.iter_ui_code())
+    
+    def write_ui_code(self, file_name, manifest=None):
+        """将 UI 文件 XML 流式写入文件，返回是否写入（见 _write_chunks）"""
+        return self._write_chunks(file_name, self.iter_ui_code(), manifest)
+    
+    @staticmethod
+    def _ui_name(i, w):
+        """控件在 UI 文件中的对象名"""
+        return w['properties'].get('objectName') or f"{w['widget_type'].lower()}_{i+1}"
+    
+    def _ui_fragment(self, i, w):
+        """生成单个控件的 UI 文件 XML 片段，写出优化后仍需设置的属性
+        
+        片段不含结束标签，由 iter_ui_code 在写完其中的控件后闭合。
+        """
+        ir = self.widget_ir(i, w, self.ui_passes)
+        construct = ir.construct
+        depth = self.contexts[w['uid']][4]
+        
+        buffer = io.StringIO()
+        writer = UiWriter(buffer, depth=depth)
+        writer.start("widget", {"class": construct.widget_type,
+                                "name": construct.object_name or construct.name})
+        writer.rect("geometry", *construct.geometry)
+        
+        dynamic = (UI_DYNAMIC_PROPERTIES.get(construct.widget_type) or
+                   PLUGINS.dynamic_properties(construct.widget_type))
+        for node in ir.nodes:
+            if node.name != "objectName":
+                writer.widget_property(node.name, node.value, node.name in dynamic)
+        return buffer.getvalue()
@@ -1,17 +1,50 @@
 import sys
+import time
+
+# 启动分析需要在导入其他模块之前安装（--profile-startup）
+from startup import STARTUP
+STARTUP.install_if_requested(sys.argv)
+
 import json
 import os
+import itertools
+import argparse
+from collections import deque
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QPushButton, QToolBar, QAction,
                             QDockWidget, QMenu, QInputDialog, QFileDialog, QMessageBox,
-                            QSplitter, QComboBox)
-from PyQt5.QtCore import Qt, QSize, pyqtSignal
+                            QSplitter, QComboBox, QScrollArea, QLineEdit, QActionGroup)
+from PyQt5.QtCore import Qt, QSize, QPoint, QRect, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon
 
 # 导入自定义模块
-from components import WidgetBox, WIDGET_TYPES
-from designer import DesignCanvas, PropertyEditor, CodeGenerator
-from styles import DARK_STYLESHEET, BLOCKS_LIGHT_STYLESHEET
+from components import WidgetBox, WIDGET_TYPES, load_plugins, forget_drag_pixmaps
+from designer import (DesignCanvas, DesignDocument, PropertyEditor, CodeGenerator,
+                      PYTHON_MODE_STANZA, PYTHON_MODE_TABLE)
+from styles import THEMES, DEFAULT_THEME, apply_theme
+from project import (IndexedProject, is_indexed_project, load_legacy_project,
+                     write_project, splice_project)
+from uifile import iter_ui_records
+from preview import PreviewWindow
+from manifest import file_hash, load_manifest, save_manifest, is_up_to_date, OutputManifest
+from plugins import PLUGINS
+from thumbnails import ThumbnailCache, THUMBNAIL_SIZE
+from templates import TEMPLATES, Template
+
+STARTUP.mark("导入模块")
+
+# 代码预览对话框显示的最大行数
+PREVIEW_LINES = 500
+
+# 导入 UI 文件时每批加载的控件数
+UI_IMPORT_BATCH_SIZE = 500
+
+# 批量转换支持的输出格式和保存在输出目录中的清单文件名
+CONVERT_FORMATS = ("py", "ui")
+CONVERT_MANIFEST = ".pqd-convert.json"
+
+# 导出代码时保存在输出目录中的清单文件名
+EXPORT_MANIFEST = ".pqd-export.json"
 
 # 主应用程序类
 class PyQtDesigner(QMainWindow):
@@ -19,7 +52,20 @@ class PyQtDesigner(QMainWindow):
     
     def __init__(self):
         super().__init__()
+        self.project_file = None  # 当前项目文件路径
+        self.live_preview = None  # 实时预览窗口，首次打开时创建
+        self.property_editor = None  # 属性编辑器和代码生成器在首帧之后创建
+        self.code_generator = None
+        self.first_frame_shown = False
         self.init_ui()
+        
+        # 首帧之后逐步执行的初始化：(阶段名称, 方法)，每次空闲执行一步
+        self.startup_steps = deque([
+            ("控件库", self.init_widget_box),
+            ("属性编辑器", self.init_property_editor),
+            ("代码生成器", self.init_code_generator),
+            ("缩略图", self.load_thumbnails),
+        ])
     
     def init_ui(self):
         """初始化用户界面"""
@@ -47,6 +93,12 @@ class PyQtDesigner(QMainWindow):
         
         file_menu.addSeparator()
         
+        import_ui_action = QAction("导入 UI 文件", self)
+        import_ui_action.triggered.connect(self.import_ui_file)
+        file_menu.addAction(import_ui_action)
+        
+        file_menu.addSeparator()
+        
         exit_action = QAction("退出", self)
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
@@ -62,6 +114,36 @@ class PyQtDesigner(QMainWindow):
         export_action.triggered.connect(self.export_code)
         code_menu.addAction(export_action)
         
+        preview_action = QAction("实时预览", self)
+        preview_action.triggered.connect(self.show_live_preview)
+        code_menu.addAction(preview_action)
+        
+        # 插件菜单
+        plugin_menu = menubar.addMenu("插件")
+        
+        plugin_report_action = QAction("插件报告", self)
+        plugin_report_action.triggered.connect(self.show_plugin_report)
+        plugin_menu.addAction(plugin_report_action)
+        
+        # 模板菜单
+        template_menu = menubar.addMenu("模板")
+        
+        save_template_action = QAction("保存为模板", self)
+        save_template_action.setToolTip("将选中的控件（含其中的控件）保存为组合模板，未选中时保存整个画布")
+        save_template_action.triggered.connect(lambda: self.save_template(self.canvas.selected_widget))
+        template_menu.addAction(save_template_action)
+        
+        # 视图菜单：界面主题
+        view_menu = menubar.addMenu("视图")
+        theme_menu = view_menu.addMenu("主题")
+        theme_group = QActionGroup(self)
+        for name, theme in THEMES.items():
+            theme_action = QAction(theme["text"], self, checkable=True)
+            theme_action.setChecked(name == DEFAULT_THEME)
+            theme_action.triggered.connect(lambda checked, name=name: self.set_theme(name))
+            theme_group.addAction(theme_action)
+            theme_menu.addAction(theme_action)
+        
         # u521bu5efau5de5u5177u680f
         self.create_toolbar()
         
@@ -74,10 +156,24 @@ class PyQtDesigner(QMainWindow):
         widget_dock.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable)
         widget_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
         
-        # 创建控件库
-        self.widget_box = WidgetBox()
+        # 创建控件库：搜索框在上，输入时即时筛选控件列表
+        self.widget_search = QLineEdit()
+        self.widget_search.setObjectName("widget_search")
+        self.widget_search.setPlaceholderText("搜索控件（名称、类名或描述）")
+        self.widget_search.setClearButtonEnabled(True)
+        # 控件库的条目（含组合模板）在首帧之后填入
+        self.widget_box = WidgetBox(types={})
         self.widget_box.setObjectName("widget_box")
-        widget_dock.setWidget(self.widget_box)
+        self.widget_box.setIconSize(THUMBNAIL_SIZE)
+        self.widget_search.textChanged.connect(self.widget_box.set_filter)
+        
+        widget_panel = QWidget()
+        widget_panel_layout = QVBoxLayout(widget_panel)
+        widget_panel_layout.setContentsMargins(0, 0, 0, 0)
+        widget_panel_layout.setSpacing(4)
+        widget_panel_layout.addWidget(self.widget_search)
+        widget_panel_layout.addWidget(self.widget_box)
+        widget_dock.setWidget(widget_panel)
         
         # 添加 Dock 窗口到主窗口
         self.addDockWidget(Qt.LeftDockWidgetArea, widget_dock)
@@ -86,36 +182,36 @@ class PyQtDesigner(QMainWindow):
         self.canvas = DesignCanvas()
         self.canvas.setObjectName("design_canvas")
         
-        # 创建代码生成器
-        self.code_generator = CodeGenerator(self.canvas)
-        
-        # 创建属性编辑器
-        self.property_editor = PropertyEditor()
-        
-        # 将画布选中信号连接到属性编辑器
-        self.canvas.widget_selected.connect(self.property_editor.update_properties)
+        # 画布放入滚动区域，滚动时按需加载可见区域内的控件
+        self.canvas_scroll = QScrollArea()
+        self.canvas_scroll.setWidget(self.canvas)
+        self.canvas_scroll.setWidgetResizable(True)
+        self.canvas_scroll.horizontalScrollBar().valueChanged.connect(self.load_visible_region)
+        self.canvas_scroll.verticalScrollBar().valueChanged.connect(self.load_visible_region)
         
-        # 将属性变更信号连接到处理函数
-        self.property_editor.property_changed.connect(self.on_property_changed)
+        # 画布右键菜单中的“保存为模板”
+        self.canvas.template_requested.connect(self.save_template)
         
         # 将组件添加到主拖分器
-        self.main_splitter.addWidget(self.canvas)
+        self.main_splitter.addWidget(self.canvas_scroll)
         
-        # 创建属性编辑器 Dock 窗口
-        prop_dock = QDockWidget("属性编辑器", self)
-        prop_dock.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable)
-        prop_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
-        prop_dock.setWidget(self.property_editor)
+        # 创建属性编辑器 Dock 窗口，属性编辑器在首帧之后放入，之前用同样宽度的空白占位
+        self.property_dock = QDockWidget("属性编辑器", self)
+        self.property_dock.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable)
+        self.property_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
+        placeholder = QWidget()
+        placeholder.setMinimumWidth(250)  # 与属性编辑器的最小宽度相同
+        self.property_dock.setWidget(placeholder)
         
         # 添加属性编辑器 Dock 窗口
-        self.addDockWidget(Qt.RightDockWidgetArea, prop_dock)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.property_dock)
+        
+        # 应用界面主题（调色板），画布上的控件不受影响
+        self.set_theme(DEFAULT_THEME)
         
         # 设置状态栏
         self.statusBar().showMessage("就绪完毕 - 请从左侧选择控件并拖拽到画布")
         
-        # 应用样式表
-        self.setStyleSheet(BLOCKS_LIGHT_STYLESHEET)
-        
         # 默认拖放网格和网格大小
         self.canvas.show_grid = True
         self.canvas.grid_size = 10
@@ -189,6 +285,8 @@ class PyQtDesigner(QMainWindow):
     
     def new_project(self):
         """创建新项目"""
+        self.finish_startup()
+        
         # 询问用户是否保存当前项目
         if self.canvas.widgets:
             reply = QMessageBox.question(
@@ -203,18 +301,21 @@ class PyQtDesigner(QMainWindow):
                 return
         
         # 清空当前画布
-        for w in self.canvas.widgets[::]:
-            self.canvas.delete_widget(w['widget'])
+        self.canvas.clear_widgets()
         
         # 清空属性编辑器
         self.property_editor.clear_properties()
         self.canvas.selected_widget = None
+        self.canvas.detach_project()
+        self.project_file = None
         
         # 更新状态栏
         self.statusBar().showMessage("已创建新项目")
     
     def open_project(self):
         """打开项目"""
+        self.finish_startup()
+        
         # 选择项目文件
         file_name, _ = QFileDialog.getOpenFileName(
             self, "打开项目", "", "PyQt设计器文件 (*.pqd);;所有文件 (*)"
@@ -224,36 +325,24 @@ class PyQtDesigner(QMainWindow):
             return
         
         try:
-            # 读取项目文件
-            with open(file_name, 'r', encoding='utf-8') as f:
-                project_data = json.load(f)
-            
             # 清空当前画布
-            for w in self.canvas.widgets[::]:
-                self.canvas.delete_widget(w['widget'])
+            self.canvas.clear_widgets()
             
             # 清空属性编辑器
             self.property_editor.clear_properties()
             self.canvas.selected_widget = None
+            self.canvas.detach_project()
             
-            # 加载控件
-            for widget_data in project_data['widgets']:
-                widget_type = widget_data['widget_type']
-                properties = widget_data['properties']
-                
-                # 从几何属性中恢复位置
-                geometry = properties.get('geometry', {})
-                if isinstance(geometry, dict):
-                    position = QPoint(geometry.get('x', 0), geometry.get('y', 0))
-                else:
-                    position = QPoint(geometry.x(), geometry.y())
-                
-                # 创建控件
-                widget = self.canvas.create_widget(widget_type, position)
-                
-                # 应用属性
-                for prop_name, value in properties.items():
-                    self.on_property_changed(prop_name, value)
+            if is_indexed_project(file_name):
+                # 索引项目：只加载可见区域内的控件，其余滚动到附近时再加载
+                self.canvas.attach_project(IndexedProject(file_name))
+                self.load_visible_region()
+            else:
+                # 旧版项目：一次性批量加载全部控件
+                records = load_legacy_project(file_name)
+                self.canvas.load_records([(None, record) for record in records])
+            
+            self.project_file = file_name
             
             # 更新状态栏
             self.statusBar().showMessage(f"已打开项目: {file_name}")
@@ -261,11 +350,60 @@ class PyQtDesigner(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "错误", f"打开项目失败: {str(e)}")
     
+    def import_ui_file(self):
+        """导入 Qt Designer UI 文件"""
+        self.finish_startup()
+        
+        file_name, _ = QFileDialog.getOpenFileName(
+            self, "导入 UI 文件", "", "UI 文件 (*.ui);;所有文件 (*)"
+        )
+        
+        if not file_name:
+            return
+        
+        try:
+            # 清空当前画布
+            self.canvas.clear_widgets()
+            
+            self.property_editor.clear_properties()
+            self.canvas.selected_widget = None
+            self.canvas.detach_project()
+            self.project_file = None
+            
+            # 边解析边分批加载，不需要一次性读入整个文件
+            records = iter_ui_records(file_name, first_uid=self.canvas.next_uid)
+            count = 0
+            while True:
+                batch = list(itertools.islice(records, UI_IMPORT_BATCH_SIZE))
+                if not batch:
+                    break
+                self.canvas.load_records([(None, record) for record in batch])
+                count += len(batch)
+            
+            self.statusBar().showMessage(f"已导入 UI 文件: {file_name}（{count} 个控件）")
+            
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"导入 UI 文件失败: {str(e)}")
+    
+    def load_visible_region(self, *args):
+        """加载画布可见区域（及周围一屏预取范围）内的控件"""
+        if not self.canvas.project:
+            return
+        
+        viewport = self.canvas_scroll.viewport()
+        visible = QRect(-self.canvas.x(), -self.canvas.y(),
+                        viewport.width(), viewport.height())
+        
+        # 向四周各扩展一屏，滚动时控件已提前就绪
+        region = visible.adjusted(-visible.width(), -visible.height(),
+                                  visible.width(), visible.height())
+        self.canvas.load_region(region)
+    
     def save_project(self):
         """保存项目"""
         # 选择保存文件路径
         file_name, _ = QFileDialog.getSaveFileName(
-            self, "保存项目", "", "PyQt设计器文件 (*.pqd);;所有文件 (*)"
+            self, "保存项目", self.project_file or "", "PyQt设计器文件 (*.pqd);;所有文件 (*)"
         )
         
         if not file_name:
@@ -276,26 +414,26 @@ class PyQtDesigner(QMainWindow):
             file_name += '.pqd'
         
         try:
-            # 构建项目数据
-            project_data = {
-                'version': '1.0',
-                'widgets': []
-            }
-            
-            # 保存所有控件数据
-            for w in self.canvas.widgets:
-                widget_data = {
-                    'widget_type': w['widget_type'],
-                    'properties': w['properties']
-                }
-                project_data['widgets'].append(widget_data)
+            project = self.canvas.project
+            if project and os.path.abspath(file_name) == os.path.abspath(project.file_name):
+                # 保存回原索引项目：只追加修改过的记录
+                records = self.canvas.collect_records(changed_only=True)
+                written = splice_project(project, records, self.canvas.record_order())
+            else:
+                # 保存到新文件：未加载的记录从原项目按原始字节复制
+                records = self.canvas.collect_records()
+                write_project(file_name, records, source=project,
+                              order=self.canvas.record_order())
+                written = len(records)
+                # 之后的保存都可以在新文件上增量进行
+                self.canvas.attach_project(IndexedProject(file_name),
+                                           loaded_uids=records.keys())
             
-            # 写入文件
-            with open(file_name, 'w', encoding='utf-8') as f:
-                json.dump(project_data, f, indent=4, ensure_ascii=False)
+            self.canvas.mark_saved(records)
+            self.project_file = file_name
             
             # 更新状态栏
-            self.statusBar().showMessage(f"已保存项目到: {file_name}")
+            self.statusBar().showMessage(f"已保存项目到: {file_name}（写入 {written} 条控件记录）")
             
         except Exception as e:
             QMessageBox.critical(self, "错误", f"保存项目失败: {str(e)}")
@@ -318,14 +456,135 @@ class PyQtDesigner(QMainWindow):
         if self.canvas.selected_widget:
             self.canvas.delete_widget(self.canvas.selected_widget)
     
+    def paintEvent(self, event):
+        """主窗口第一次绘制（首帧）之后开始逐步完成其余的初始化"""
+        super().paintEvent(event)
+        if not self.first_frame_shown:
+            self.first_frame_shown = True
+            STARTUP.mark("首帧")
+            QTimer.singleShot(0, self.run_startup_step)
+    
+    def run_startup_step(self):
+        """执行一步首帧之后的初始化，其余的留到下一次空闲"""
+        if self._startup_step():
+            QTimer.singleShot(0, self.run_startup_step)
+    
+    def finish_startup(self):
+        """立即执行其余的首帧之后的初始化 - 在逐步初始化完成之前触发了需要属性编辑器、
+        代码生成器等的菜单或工具栏操作时调用"""
+        while self._startup_step():
+            pass
+    
+    def _startup_step(self):
+        """执行一步初始化，全部完成后结束启动分析；返回是否还有未执行的步骤"""
+        if not self.startup_steps:
+            return False
+        name, step = self.startup_steps.popleft()
+        step()
+        STARTUP.mark(name)
+        if not self.startup_steps:
+            STARTUP.finish()
+        return bool(self.startup_steps)
+    
+    def init_widget_box(self):
+        """读取组合模板，填入控件库的条目"""
+        TEMPLATES.load()
+        self.widget_box.set_types(self.palette_types())
+    
+    def init_property_editor(self):
+        """创建属性编辑器，连接画布的选中信号和属性变更信号"""
+        self.property_editor = PropertyEditor()
+        self.canvas.widget_selected.connect(self.property_editor.update_properties)
+        self.property_editor.property_changed.connect(self.on_property_changed)
+        old_widget = self.property_dock.widget()
+        self.property_dock.setWidget(self.property_editor)
+        old_widget.deleteLater()
+    
+    def init_code_generator(self):
+        """创建代码生成器"""
+        self.code_generator = CodeGenerator(self.canvas)
+    
+    def load_thumbnails(self):
+        """请求控件库中全部控件类型的缩略图：磁盘缓存在后台线程中读取，缺失的在空闲时分片渲染"""
+        self.thumbnails = ThumbnailCache(parent=self)
+        self.thumbnails.thumbnail_ready.connect(self.widget_box.set_thumbnail)
+        self.thumbnails.request(list(WIDGET_TYPES), self.devicePixelRatioF())
+    
+    def set_theme(self, name):
+        """切换界面主题：只替换调色板，画布上的控件保持画布自己的调色板"""
+        start = time.perf_counter()
+        apply_theme(QApplication.instance(), name)
+        self.theme = name
+        self.statusBar().showMessage(
+            f"已切换到{THEMES[name]['text']}主题（{(time.perf_counter() - start) * 1000:.1f} ms）")
+    
+    def palette_types(self):
+        """控件库的条目：全部控件类型，之后是组合模板"""
+        return {**WIDGET_TYPES, **TEMPLATES.palette_entries()}
+    
+    def save_template(self, widget=None):
+        """将控件（含其中的控件）保存为组合模板并加入控件库，widget 为 None 时保存整个画布"""
+        self.finish_startup()
+        
+        # 索引项目中尚未加载的控件也属于模板
+        if widget is None:
+            self.canvas.load_all()
+        else:
+            info = self.canvas.find_widget_info(widget)
+            if info is not None:
+                self.canvas.load_container(info['uid'])
+        records = self.canvas.group_records(widget)
+        if not records:
+            QMessageBox.information(self, "保存为模板", "画布上没有控件")
+            return
+        
+        name, ok = QInputDialog.getText(self, "保存为模板", "模板名称：")
+        name = name.strip()
+        if not ok or not name:
+            return
+        
+        template = Template.from_records(name, records)
+        try:
+            TEMPLATES.save(template)
+        except OSError as e:
+            QMessageBox.warning(self, "保存为模板", f"无法保存模板：{e}")
+            return
+        forget_drag_pixmaps(template.key)
+        self.widget_box.set_types(self.palette_types())
+        self.statusBar().showMessage(f"已保存模板“{name}”（{len(records)} 个控件）")
+    
+    def show_live_preview(self):
+        """打开实时预览窗口，之后随画布编辑增量更新"""
+        self.canvas.load_all()
+        if self.live_preview is None:
+            self.live_preview = PreviewWindow(self.canvas, self)
+        self.live_preview.show()
+        self.live_preview.raise_()
+        self.live_preview.activateWindow()
+    
+    def show_plugin_report(self):
+        """显示各插件的清单读取和模块导入耗时"""
+        dialog = QMessageBox(self)
+        dialog.setWindowTitle("插件报告")
+        dialog.setText(f"已加载 {len(PLUGINS.plugins)} 个插件，{len(PLUGINS.types)} 个插件控件类型。\n"
+                       "插件模块在首次使用该类型的控件时才导入。")
+        dialog.setDetailedText(PLUGINS.report())
+        dialog.exec_()
+    
     def generate_code(self):
         """生成代码并显示"""
+        self.finish_startup()
+        
+        # 代码总是包含整个设计，先加载索引项目中尚未加载的控件
+        self.canvas.load_all()
         if not self.canvas.widgets:
             QMessageBox.information(self, "提示", "没有控件可以生成代码")
             return
         
-        # 生成Python代码
-        python_code = self.code_generator.generate_python_code()
+        # 只生成预览需要的前若干行Python代码
+        python_code, truncated = self.code_generator.preview_python_code(PREVIEW_LINES)
+        if truncated:
+            python_code += f"\n\n# ……仅预览前 {PREVIEW_LINES} 行，完整代码请导出"
         
         # 显示代码预览对话框
         dialog = QMessageBox(self)
@@ -342,13 +601,15 @@ class PyQtDesigner(QMainWindow):
             self.export_code()
     
     def export_code(self):
-        """导出代码到文件"""
-        # 生成代码
-        python_code = self.code_generator.generate_python_code()
-        ui_code = self.code_generator.generate_ui_code()
+        """导出代码到文件（内容没有变化的文件不重写）"""
+        self.finish_startup()
+        
+        # 代码总是包含整个设计，先加载索引项目中尚未加载的控件
+        self.canvas.load_all()
         
-        # 选择导出格式
-        formats = ["Python 脚本 (*.py)", "Qt UI 文件 (*.ui)"]
+        # 选择导出格式（只生成所选格式的代码）
+        formats = ["Python 脚本 (*.py)", "Qt UI 文件 (*.ui)", "Python 脚本 - 紧凑数据表 (*.py)",
+                   "Python 脚本 - 选项卡页面延迟构建 (*.py)", "Python 脚本和 Qt UI 文件 (*.py, *.ui)"]
         format_choice, ok = QInputDialog.getItem(
             self, "选择导出格式", "选择导出格式:", formats, 0, False
         )
@@ -356,42 +617,48 @@ class PyQtDesigner(QMainWindow):
         if not ok:
             return
         
-        # 保存文件
-        if format_choice == formats[0]:  # Python 脚本
+        # 选择文件，确定要写出的 [(文件路径, 写入方法)]
+        generator = self.code_generator
+        if format_choice == formats[1]:  # Qt UI 文件
             file_name, _ = QFileDialog.getSaveFileName(
-                self, "导出 Python 代码", "", "Python 文件 (*.py);;所有文件 (*)"
+                self, "导出 UI 文件", "", "UI 文件 (*.ui);;所有文件 (*)"
             )
-            
-            if file_name:
-                if not file_name.endswith('.py'):
-                    file_name += '.py'
-                
-                try:
-                    with open(file_name, 'w', encoding='utf-8') as f:
-                        f.write(python_code)
-                    
-                    self.statusBar().showMessage(f"已导出 Python 代码: {file_name}")
-                
-                except Exception as e:
-                    QMessageBox.critical(self, "错误", f"导出代码失败: {str(e)}")
-        
-        elif format_choice == formats[1]:  # Qt UI 文件
+            if not file_name:
+                return
+            if not file_name.endswith('.ui'):
+                file_name += '.ui'
+            outputs = [(file_name, generator.write_ui_code)]
+        
+        else:  # Python 脚本
             file_name, _ = QFileDialog.getSaveFileName(
-                self, "导出 UI 文件", "", "UI 文件 (*.ui);;所有文件 (*)"
+                self, "导出 Python 代码", "", "Python 文件 (*.py);;所有文件 (*)"
             )
+            if not file_name:
+                return
+            if not file_name.endswith('.py'):
+                file_name += '.py'
+            mode = PYTHON_MODE_TABLE if format_choice == formats[2] else PYTHON_MODE_STANZA
+            lazy_tabs = format_choice == formats[3]
+            outputs = [(file_name, lambda path, manifest:
+                        generator.write_python_code(path, mode, lazy_tabs, manifest))]
+            if format_choice == formats[4]:
+                outputs.append((os.path.splitext(file_name)[0] + '.ui', generator.write_ui_code))
+        
+        try:
+            # 导出清单保存在输出目录中，记录各输出文件的内容哈希
+            manifest = OutputManifest(os.path.join(os.path.dirname(os.path.abspath(file_name)),
+                                                   EXPORT_MANIFEST))
+            for path, write in outputs:
+                write(path, manifest=manifest)
+            manifest.save()
             
-            if file_name:
-                if not file_name.endswith('.ui'):
-                    file_name += '.ui'
-                
-                try:
-                    with open(file_name, 'w', encoding='utf-8') as f:
-                        f.write(ui_code)
-                    
-                    self.statusBar().showMessage(f"已导出 UI 文件: {file_name}")
-                
-                except Exception as e:
-                    QMessageBox.critical(self, "错误", f"导出代码失败: {str(e)}")
+            names = "、".join(os.path.basename(path) for path, _ in outputs)
+            self.statusBar().showMessage(
+                f"已导出: {names}（写入 {manifest.written} 个文件，"
+                f"跳过 {manifest.skipped} 个内容未变化的文件）")
+        
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"导出代码失败: {str(e)}")
     
     def on_property_changed(self, prop_name, value):
         """处理属性变更"""
@@ -400,44 +667,7 @@ class PyQtDesigner(QMainWindow):
         
         # 更新控件属性
         widget = self.canvas.selected_widget
-        
-        if prop_name == "objectName":
-            widget.setObjectName(value)
-        
-        elif prop_name == "geometry":
-            widget.setGeometry(value)
-        
-        elif prop_name == "text" and hasattr(widget, "setText"):
-            widget.setText(value)
-        
-        elif prop_name == "placeholderText" and hasattr(widget, "setPlaceholderText"):
-            widget.setPlaceholderText(value)
-        
-        elif prop_name == "checked" and hasattr(widget, "setChecked"):
-            widget.setChecked(value)
-        
-        elif prop_name == "items":
-            if hasattr(widget, "clear") and hasattr(widget, "addItems"):
-                widget.clear()
-                widget.addItems(value)
-        
-        elif prop_name == "minimum" and hasattr(widget, "setMinimum"):
-            widget.setMinimum(value)
-        
-        elif prop_name == "maximum" and hasattr(widget, "setMaximum"):
-            widget.setMaximum(value)
-        
-        elif prop_name == "value" and hasattr(widget, "setValue"):
-            widget.setValue(value)
-        
-        elif prop_name == "orientation" and hasattr(widget, "setOrientation"):
-            if value.lower() == "horizontal":
-                widget.setOrientation(Qt.Horizontal)
-            else:
-                widget.setOrientation(Qt.Vertical)
-        
-        elif prop_name == "title" and hasattr(widget, "setTitle"):
-            widget.setTitle(value)
+        self.canvas.apply_property(widget, prop_name, value)
         
         # 更新存储的属性
         for w in self.canvas.widgets:
@@ -445,11 +675,169 @@ class PyQtDesigner(QMainWindow):
                 if prop_name in w['properties']:
                     w['properties'][prop_name] = value
                 break
+        
+        # 通知代码生成器等监听者该控件已变更
+        self.canvas.widget_changed.emit(widget)
+
+# 命令行批量转换 - 不创建窗口，在进程池中将项目文件转换为 Python 代码和 .ui 文件
+def convert_project(task):
+    """转换一个项目文件（在工作进程中执行），返回结果字典"""
+    source, rel_path, out_dir, formats, options, entry, force = task
+    start = time.perf_counter()
+    # 以 spawn 方式启动的工作进程需要重新读取插件清单
+    load_plugins()
+    result = {"path": rel_path, "status": "skipped", "widgets": 0, "outputs": {},
+              "source": None, "error": None}
+    try:
+        result["source"] = file_hash(source)
+        if not force and is_up_to_date(entry, result["source"], options, out_dir):
+            # 源文件和选项都没有变化，输出仍然有效
+            result["outputs"] = entry["outputs"]
+            result["widgets"] = entry.get("widgets", 0)
+        else:
+            document = DesignDocument.from_file(source)
+            generator = CodeGenerator(document)
+            mode = PYTHON_MODE_TABLE if options["table"] else PYTHON_MODE_STANZA
+            base = os.path.splitext(rel_path)[0]
+            for fmt in formats:
+                out_name = base + "." + fmt
+                out_path = os.path.join(out_dir, out_name)
+                os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                if fmt == "py":
+                    generator.write_python_code(out_path, mode, options["lazy_tabs"])
+                else:
+                    generator.write_ui_code(out_path)
+                result["outputs"][out_name] = file_hash(out_path)
+            result["status"] = "converted"
+            result["widgets"] = len(document.widgets)
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+
+def find_projects(source):
+    """返回 (基准目录, [项目文件相对路径])，目录按名称顺序递归查找 *.pqd"""
+    if os.path.isfile(source):
+        return os.path.dirname(os.path.abspath(source)), [os.path.basename(source)]
+    paths = []
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".pqd"):
+                paths.append(os.path.relpath(os.path.join(root, name), source))
+    return source, paths
+
+
+def convert_main(argv):
+    """命令行批量转换入口：python main.py convert <目录或项目文件> [选项]"""
+    parser = argparse.ArgumentParser(
+        prog="main.py convert",
+        description="将 .pqd 项目批量转换为 Python 代码和/或 .ui 文件（不创建窗口）")
+    parser.add_argument("source", help="项目文件或包含项目文件的目录（递归查找 *.pqd）")
+    parser.add_argument("-o", "--output", help="输出目录，默认与项目文件放在一起")
+    parser.add_argument("-f", "--formats", default="py,ui", help="输出格式，逗号分隔：py、ui（默认 py,ui）")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="并行进程数")
+    parser.add_argument("--table", action="store_true", help="Python 代码使用紧凑数据表模式")
+    parser.add_argument("--lazy-tabs", action="store_true", help="选项卡页面中的控件延迟构建")
+    parser.add_argument("--force", action="store_true", help="忽略清单，全部重新转换")
+    args = parser.parse_args(argv)
+    
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in CONVERT_FORMATS]
+    if unknown or not formats:
+        parser.error(f"不支持的输出格式: {', '.join(unknown) or args.formats}")
+    
+    # 不连接显示服务器，子进程继承该环境变量
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    
+    base_dir, paths = find_projects(args.source)
+    out_dir = args.output or base_dir
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, CONVERT_MANIFEST)
+    manifest = load_manifest(manifest_path)
+    options = {"formats": formats, "table": args.table, "lazy_tabs": args.lazy_tabs}
+    tasks = [(os.path.join(base_dir, path), path, out_dir, formats, options,
+              manifest.get(path), args.force) for path in paths]
+    
+    labels = {"converted": "转换", "skipped": "跳过", "failed": "失败"}
+    counts = dict.fromkeys(labels, 0)
+    widgets = 0
+    start = time.perf_counter()
+    
+    def report(result):
+        nonlocal widgets
+        counts[result["status"]] += 1
+        if result["status"] == "converted":
+            widgets += result["widgets"]
+            manifest[result["path"]] = {"source": result["source"], "options": options,
+                                        "outputs": result["outputs"], "widgets": result["widgets"]}
+        elif result["status"] == "failed":
+            manifest.pop(result["path"], None)
+        line = (f"[{labels[result['status']]}] {result['path']}  "
+                f"{result['widgets']} 个控件  {result['elapsed'] * 1000:.1f} ms")
+        if result["error"]:
+            line += f"  {result['error']}"
+        print(line, flush=True)
+    
+    jobs = max(1, min(args.jobs, len(tasks)))
+    if jobs == 1:
+        for task in tasks:
+            report(convert_project(task))
+    else:
+        # 进程池（multiprocessing）只在命令行转换时导入，不增加设计器的启动时间
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for future in as_completed([pool.submit(convert_project, task) for task in tasks]):
+                report(future.result())
+    
+    elapsed = time.perf_counter() - start
+    save_manifest(manifest_path, manifest)
+    
+    rate = elapsed or 1e-9
+    print(f"共 {len(tasks)} 个项目（{jobs} 个进程）：转换 {counts['converted']}，"
+          f"跳过 {counts['skipped']}，失败 {counts['failed']}")
+    print(f"用时 {elapsed:.2f} s，转换 {widgets} 个控件，"
+          f"吞吐 {counts['converted'] / rate:.1f} 个项目/s、{widgets / rate:.0f} 个控件/s")
+    return 1 if counts["failed"] else 0
+
+
+def plugins_main(argv):
+    """命令行插件报告入口：python main.py plugins [--import-all]"""
+    parser = argparse.ArgumentParser(
+        prog="main.py plugins",
+        description="列出插件目录中的插件及其清单读取和模块导入耗时")
+    parser.add_argument("--import-all", action="store_true",
+                        help="导入全部插件模块，测量每个插件的导入耗时")
+    args = parser.parse_args(argv)
+    
+    if args.import_all:
+        PLUGINS.import_all()
+    print(PLUGINS.report())
+    return 1 if any(plugin.error for plugin in PLUGINS.plugins) else 0
+
 
 # 主函数
 def main():
+    # 读取插件清单（只读取元数据，插件模块在首次使用时导入）
+    load_plugins()
+    
+    # 命令行批量转换和插件报告不创建窗口
+    if len(sys.argv) > 1 and sys.argv[1] == "convert":
+        sys.exit(convert_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "plugins":
+        sys.exit(plugins_main(sys.argv[2:]))
+    
+    STARTUP.mark("读取插件清单")
+    
     app = QApplication(sys.argv)
+    # Fusion 风格完全按调色板绘制，各平台上的主题效果一致
+    app.setStyle("Fusion")
+    STARTUP.mark("创建应用程序")
+    # 首帧之前只创建主窗口的框架，组合模板、控件库条目、属性编辑器等在首帧之后创建
     designer = PyQtDesigner()
+    STARTUP.mark("创建主窗口")
     designer.show()
     sys.exit(app.exec_())
 
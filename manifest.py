@@ -0,0 +1,116 @@
+# 转换清单模块 - 记录输入和输出文件的内容哈希，跳过未变化的转换和写入
+#
+# 批量转换清单是一个 JSON 文件：{源文件相对路径: {"source": 源文件哈希, "options": 转换选项,
+# "outputs": {输出文件相对路径: 输出文件哈希}}}。源文件内容和选项都没有变化、
+# 输出文件也没有被改动过时，说明输出已经是最新的，可以跳过。
+#
+# 导出清单（OutputManifest）只记录输出文件的哈希：生成的内容与现有文件相同时不重写，
+# 文件的修改时间保持不变，下游的构建缓存不会失效。
+import hashlib
+import json
+import os
+
+
+def content_hash(data):
+    """返回字节串的内容哈希"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(file_name):
+    """返回文件的内容哈希，文件不存在时返回 None"""
+    try:
+        with open(file_name, "rb") as f:
+            return content_hash(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def load_manifest(file_name):
+    """读取清单，文件不存在或已损坏时返回空清单"""
+    try:
+        with open(file_name, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def save_manifest(file_name, manifest):
+    """原子地写出清单"""
+    tmp_name = file_name + ".tmp"
+    with open(tmp_name, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_name, file_name)
+
+
+def is_up_to_date(entry, source_hash, options, base_dir):
+    """判断清单项记录的输出是否仍然有效：源文件和选项未变，输出文件都未被改动"""
+    if not entry or entry.get("source") != source_hash or entry.get("options") != options:
+        return False
+    outputs = entry.get("outputs") or {}
+    return bool(outputs) and all(
+        file_hash(os.path.join(base_dir, name)) == digest for name, digest in outputs.items())
+
+
+class OutputManifest:
+    """导出清单 - 记录输出文件的内容哈希，内容没有变化时不重写文件
+
+    清单项为 {输出文件相对路径: {"hash": 内容哈希, "size": 大小, "mtime": 修改时间}}。
+    文件的大小和修改时间与清单一致时直接使用记录的哈希，不必重新读取文件。
+    """
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.base_dir = os.path.dirname(os.path.abspath(file_name))
+        self.entries = load_manifest(file_name)
+        self.written = 0
+        self.skipped = 0
+
+    def _key(self, path):
+        return os.path.relpath(os.path.abspath(path), self.base_dir)
+
+    def current_hash(self, path):
+        """输出文件当前的内容哈希，文件不存在时返回 None"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        entry = self.entries.get(self._key(path))
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime_ns:
+            return entry.get("hash")
+        return file_hash(path)
+
+    def _record(self, path, digest):
+        stat = os.stat(path)
+        self.entries[self._key(path)] = {"hash": digest, "size": stat.st_size,
+                                         "mtime": stat.st_mtime_ns}
+
+    def write(self, path, chunks, buffer_size=-1):
+        """把文本块流写入临时文件并计算哈希，与现有文件相同时丢弃临时文件，
+        否则替换现有文件。返回是否写入了文件"""
+        digest = hashlib.sha256()
+        tmp_name = path + ".tmp"
+        try:
+            with open(tmp_name, "wb", buffering=buffer_size) as f:
+                for chunk in chunks:
+                    data = chunk.encode("utf-8")
+                    digest.update(data)
+                    f.write(data)
+        except BaseException:
+            os.remove(tmp_name)
+            raise
+        digest = digest.hexdigest()
+
+        if digest == self.current_hash(path):
+            os.remove(tmp_name)
+            self._record(path, digest)
+            self.skipped += 1
+            return False
+        os.replace(tmp_name, path)
+        self._record(path, digest)
+        self.written += 1
+        return True
+
+    def save(self):
+        """写出清单"""
+        save_manifest(self.file_name, self.entries)
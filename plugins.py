@@ -0,0 +1,213 @@
+# 插件模块 - 从轻量的清单注册自定义控件类型，第一次用到时才导入插件模块
+#
+# 插件清单是插件目录中的 *.plugin.json 文件，一个清单对应一个 Python 模块：
+#   {"module": "acme.gauge",            插件模块（首次使用时导入）
+#    "path": ".",                       导入模块时加入 sys.path 的目录（相对清单所在目录）
+#    "widgets": [{"class": "Gauge",     控件类名，同时作为控件类型名
+#                 "icon": "⏱", "text": "仪表", "description": "显示数值的仪表",
+#                 "extends": "QWidget", 基类（写入 UI 文件的自定义控件声明）
+#                 "size": [120, 120],   默认尺寸
+#                 "properties": {"value": 0, "title": "仪表"},   属性及默认值
+#                 "setters": {"title": "setCaption"}}]}        设置方法，缺省为 set + 属性名
+#
+# 启动时只读取清单：控件库、默认属性和属性编辑器只需要清单中的元数据。插件模块在
+# 该类型的控件第一次放到画布上（包括加载项目）或在预览中创建时才导入；生成代码只输出
+# 导入语句，不需要导入模块。每个插件的清单读取和模块导入耗时记录在报告中。
+#
+# 本模块不依赖 Qt，命令行批量转换同样可以使用。
+import importlib
+import json
+import os
+import sys
+import time
+
+# 插件目录：程序目录下的 plugins 目录，以及环境变量中以路径分隔符分隔的目录
+DEFAULT_PLUGIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plugins")
+PLUGIN_PATH_ENV = "PQD_PLUGIN_PATH"
+
+MANIFEST_SUFFIX = ".plugin.json"
+
+
+def plugin_dirs():
+    """默认的插件目录列表"""
+    dirs = [DEFAULT_PLUGIN_DIR]
+    dirs.extend(d for d in os.environ.get(PLUGIN_PATH_ENV, "").split(os.pathsep) if d)
+    return dirs
+
+
+def setter_name(prop_name):
+    """属性的默认设置方法名，如 value -> setValue"""
+    return "set" + prop_name[:1].upper() + prop_name[1:]
+
+
+class PluginType:
+    """插件清单中声明的一个控件类型"""
+
+    __slots__ = ("widget_type", "plugin", "icon", "text", "description", "extends",
+                 "size", "properties", "setters", "dynamic")
+
+    def __init__(self, plugin, spec):
+        self.widget_type = spec["class"]
+        self.plugin = plugin
+        self.icon = spec.get("icon", "🧩")
+        self.text = spec.get("text", self.widget_type)
+        self.description = spec.get("description", "")
+        self.extends = spec.get("extends", "QWidget")
+        self.size = tuple(spec["size"]) if "size" in spec else None
+        self.properties = dict(spec.get("properties", {}))
+        # 属性 -> 设置方法（生成代码、预览和画布共用）
+        self.setters = {"objectName": "setObjectName"}
+        self.setters.update((name, setter_name(name)) for name in self.properties)
+        self.setters.update(spec.get("setters", {}))
+        # 设置方法不是 set + 属性名的属性，在 UI 文件中写为动态属性
+        self.dynamic = {name for name, method in self.setters.items() if method != setter_name(name)}
+
+
+class Plugin:
+    """一个插件清单及其模块的导入状态"""
+
+    def __init__(self, manifest_file):
+        self.manifest_file = manifest_file
+        self.name = os.path.basename(manifest_file)[:-len(MANIFEST_SUFFIX)]
+        self.module_name = None
+        self.path = None
+        self.types = []
+        self.module = None
+        self.read_time = 0.0      # 读取清单的耗时（秒）
+        self.import_time = None   # 导入模块的耗时（秒），尚未导入时为 None
+        self.error = None
+        self.ignored = []         # 因重名被忽略的控件类型
+
+    def read(self):
+        """读取清单，清单无效时记录错误"""
+        start = time.perf_counter()
+        try:
+            with open(self.manifest_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.module_name = data["module"]
+            base_dir = os.path.dirname(os.path.abspath(self.manifest_file))
+            self.path = os.path.normpath(os.path.join(base_dir, data.get("path", ".")))
+            self.types = [PluginType(self, spec) for spec in data.get("widgets", ())]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.types = []
+            self.error = f"清单无效: {type(e).__name__}: {e}"
+        self.read_time = time.perf_counter() - start
+
+    @property
+    def status(self):
+        if self.error:
+            return "失败"
+        return "未导入" if self.module is None else "已导入"
+
+    def load(self):
+        """导入插件模块（只导入一次）并记录耗时，失败时返回 None"""
+        if self.module is None and self.error is None:
+            if self.path not in sys.path:
+                sys.path.append(self.path)
+            start = time.perf_counter()
+            try:
+                self.module = importlib.import_module(self.module_name)
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+            self.import_time = time.perf_counter() - start
+        return self.module
+
+
+class PluginRegistry:
+    """插件注册表 - 控件类型 -> 清单中的元数据，按需导入控件类"""
+
+    def __init__(self):
+        self.plugins = []
+        self.types = {}           # 控件类型 -> PluginType
+        self.scanned = set()      # 已扫描的目录
+        self.scan_time = 0.0
+
+    def scan(self, dirs, reserved=()):
+        """扫描目录中的插件清单（每个目录只扫描一次），返回新注册的控件类型列表
+
+        与 reserved 中的类型（内置控件）或已注册的插件类型重名的类型被忽略并记录在报告中。
+        """
+        start = time.perf_counter()
+        added = []
+        for directory in dirs:
+            directory = os.path.abspath(directory)
+            if directory in self.scanned or not os.path.isdir(directory):
+                continue
+            self.scanned.add(directory)
+            for file_name in sorted(os.listdir(directory)):
+                if not file_name.endswith(MANIFEST_SUFFIX):
+                    continue
+                plugin = Plugin(os.path.join(directory, file_name))
+                plugin.read()
+                self.plugins.append(plugin)
+                for plugin_type in list(plugin.types):
+                    name = plugin_type.widget_type
+                    if name in reserved or name in self.types:
+                        plugin.types.remove(plugin_type)
+                        plugin.ignored.append(name)
+                        continue
+                    self.types[name] = plugin_type
+                    added.append(plugin_type)
+        self.scan_time += time.perf_counter() - start
+        return added
+
+    def __contains__(self, widget_type):
+        return widget_type in self.types
+
+    def setters(self, widget_type):
+        """插件控件类型的属性 -> 设置方法，非插件类型返回 None"""
+        plugin_type = self.types.get(widget_type)
+        return plugin_type.setters if plugin_type is not None else None
+
+    def dynamic_properties(self, widget_type):
+        """插件控件类型在 UI 文件中写为动态属性的属性名"""
+        plugin_type = self.types.get(widget_type)
+        return plugin_type.dynamic if plugin_type is not None else ()
+
+    def widget_class(self, widget_type):
+        """插件控件类型对应的类，第一次调用时导入插件模块；导入失败时返回 None"""
+        plugin_type = self.types[widget_type]
+        module = plugin_type.plugin.load()
+        return getattr(module, widget_type, None) if module is not None else None
+
+    def import_lines(self, widget_types):
+        """生成代码中导入这些控件类型中插件类的语句（按模块合并）"""
+        modules = {}
+        for widget_type in sorted(widget_types):
+            plugin_type = self.types.get(widget_type)
+            if plugin_type is not None:
+                modules.setdefault(plugin_type.plugin.module_name, []).append(widget_type)
+        return [f"from {module} import {', '.join(names)}"
+                for module, names in sorted(modules.items())]
+
+    def import_all(self):
+        """导入全部插件模块（用于测量各插件的导入耗时）"""
+        for plugin in self.plugins:
+            plugin.load()
+
+    def report(self):
+        """插件报告文本：每个插件的清单读取耗时、导入状态和导入耗时，按导入耗时从大到小排列"""
+        lines = [f"插件目录: {', '.join(sorted(self.scanned)) or '无'}",
+                 f"插件 {len(self.plugins)} 个，控件类型 {len(self.types)} 个，"
+                 f"扫描清单共 {self.scan_time * 1000:.1f} ms",
+                 ""]
+        if not self.plugins:
+            return "\n".join(lines)
+        lines.append(f"{'插件':<24s} {'控件':>4s} {'清单':>9s} {'导入':>10s}  状态")
+        plugins = sorted(self.plugins, key=lambda p: -(p.import_time or 0.0))
+        for plugin in plugins:
+            import_time = "-" if plugin.import_time is None else f"{plugin.import_time * 1000:.1f} ms"
+            lines.append(f"{plugin.name:<24s} {len(plugin.types):4d} "
+                         f"{plugin.read_time * 1000:6.2f} ms {import_time:>10s}  {plugin.status}")
+            if plugin.error:
+                lines.append(f"    {plugin.error}")
+            if plugin.ignored:
+                lines.append(f"    重名的控件类型已忽略: {', '.join(plugin.ignored)}")
+        imported = [p.import_time for p in self.plugins if p.import_time is not None]
+        lines.append("")
+        lines.append(f"已导入 {len(imported)} 个插件模块，共 {sum(imported) * 1000:.1f} ms")
+        return "\n".join(lines)
+
+
+# 全局插件注册表
+PLUGINS = PluginRegistry()
@@ -0,0 +1,254 @@
+# 实时预览模块 - 在进程内按生成代码的窗口结构构建界面，并随画布编辑增量更新
+#
+# 预览窗口打开时按画布中的控件完整构建一次，之后只记录画布上新建、修改和删除的控件，
+# 每帧最多刷新一次。刷新时只对这些控件比较几何和属性，调用有变化的设置方法，
+# 耗时与变化的控件数成正比，与设计的规模无关。
+from PyQt5 import QtWidgets
+from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout
+from PyQt5.QtCore import Qt, QRect, QTimer
+
+from components import TAB_PAGE_COUNT, tab_page_title, MODEL_TYPES, create_model, model_target
+from designer import python_setters
+from plugins import PLUGINS
+from project import encode_value, geometry_tuple
+from styles import design_palette
+
+# 刷新间隔（毫秒），约每秒 60 帧
+FRAME_INTERVAL = 16
+
+# 属性 -> 受其影响、需要在其后重新设置的属性（如最大值变化后当前值可能被截断）
+DEPENDENT_PROPERTIES = {
+    "checkable": ("checked",),
+    "minimum": ("value",),
+    "maximum": ("value",),
+}
+_DEPENDENTS = {name for names in DEPENDENT_PROPERTIES.values() for name in names}
+
+_UNSET = object()
+
+
+def setter_argument(prop_name, value):
+    """属性值对应的设置方法参数（与生成代码中的参数一致）"""
+    if prop_name == "orientation":
+        return Qt.Horizontal if value.lower() == "horizontal" else Qt.Vertical
+    if prop_name == "items":
+        return list(value)
+    if prop_name == "layoutMode":
+        return getattr(QtWidgets.QListView, value, QtWidgets.QListView.SinglePass)
+    return value
+
+
+class PreviewItem:
+    """预览中的一个控件及最近一次应用到它上面的状态"""
+
+    __slots__ = ("widget", "parent", "page", "geometry", "applied")
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.parent = _UNSET   # 所在容器的 uid，顶层控件为 None
+        self.page = None       # 所在的选项卡页码
+        self.geometry = None   # 相对容器的 (x, y, 宽, 高)
+        self.applied = {}      # 属性名 -> 已设置的值（编码后）
+
+
+class PreviewWindow(QMainWindow):
+    """实时预览窗口 - 与生成的 Python 代码结构相同：中央控件的垂直布局中放置顶层控件，
+    容器内的控件以容器（选项卡为对应页面）为父控件，只应用生成代码会设置的属性"""
+
+    def __init__(self, canvas, parent=None):
+        super().__init__(parent)
+        if parent is not None:
+            self.setWindowFlags(self.windowFlags() | Qt.Window)
+        self.canvas = canvas
+        self.items = {}          # uid -> PreviewItem
+        self.infos = {}          # 画布控件 -> 控件信息
+        self.by_uid = {}         # uid -> 控件信息
+        self.dirty = {}          # 待刷新的画布控件（按顺序去重）
+        self.removed = {}        # 待删除的 uid
+        self.last_refresh = 0    # 最近一次刷新处理的控件数
+
+        self.setWindowTitle("实时预览 - PyQt5 GUI 应用")
+        self.setGeometry(100, 100, 800, 600)
+        self.central_widget = QWidget()
+        # 预览的界面与画布一致，不随设计器的界面主题变化
+        self.central_widget.setAutoFillBackground(True)
+        self.central_widget.setPalette(design_palette())
+        self.setCentralWidget(self.central_widget)
+        self.central_layout = QVBoxLayout(self.central_widget)
+        self.central_layout.setContentsMargins(10, 10, 10, 10)
+
+        # 同一帧内的多次变更合并为一次刷新
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(FRAME_INTERVAL)
+        self.timer.timeout.connect(self.refresh)
+
+        canvas.widget_added.connect(self.mark_dirty)
+        canvas.widget_changed.connect(self.mark_dirty)
+        canvas.widget_removed.connect(self.mark_removed)
+        self.rebuild()
+
+    def mark_dirty(self, widget):
+        """记录变更的画布控件，在下一帧刷新"""
+        self.dirty[widget] = None
+        self._schedule()
+
+    def mark_removed(self, widget):
+        """记录被删除的画布控件"""
+        self.dirty.pop(widget, None)
+        info = self.infos.pop(widget, None)
+        if info is not None:
+            self.removed[info['uid']] = None
+            self._schedule()
+
+    def _schedule(self):
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # 隐藏期间积累的变更在显示时刷新
+        if self.dirty or self.removed:
+            self._schedule()
+
+    def _index(self):
+        """重建画布控件到控件信息的索引"""
+        self.infos = {w['widget']: w for w in self.canvas.widgets}
+        self.by_uid = {w['uid']: w for w in self.canvas.widgets}
+
+    def rebuild(self):
+        """按画布中的全部控件重新构建预览"""
+        for item in self.items.values():
+            if item.parent is None:
+                self.central_layout.removeWidget(item.widget)
+                item.widget.deleteLater()
+        self.items = {}
+        self.dirty = {}
+        self.removed = {}
+        self._index()
+
+        # 顶层控件按画布中的顺序加入布局，与生成代码一致
+        widgets = self.canvas.widgets
+        for w in widgets:
+            if w.get('parent') not in self.by_uid:
+                self.sync(w)
+        for w in widgets:
+            if w['uid'] not in self.items:
+                self.sync(w)
+        self.last_refresh = len(widgets)
+
+    def refresh(self):
+        """应用积累的变更：删除、新建和修改，只处理变更过的控件"""
+        if not self.isVisible():
+            return
+
+        removed, self.removed = self.removed, {}
+        for uid in removed:
+            item = self.items.pop(uid, None)
+            if item is not None:
+                if item.parent is None:
+                    self.central_layout.removeWidget(item.widget)
+                item.widget.deleteLater()
+            self.by_uid.pop(uid, None)
+
+        dirty, self.dirty = self.dirty, {}
+        # 只有新建的控件不在索引中
+        if any(widget not in self.infos for widget in dirty):
+            self._index()
+        for widget in dirty:
+            info = self.infos.get(widget)
+            if info is not None:
+                self.sync(info)
+        self.last_refresh = len(removed) + len(dirty)
+
+    @staticmethod
+    def _create(widget_type):
+        """创建与生成代码中相同类型的控件（插件控件此时才导入插件模块），未知类型用 QWidget 代替"""
+        if widget_type in PLUGINS:
+            widget_class = PLUGINS.widget_class(widget_type)
+        else:
+            widget_class = getattr(QtWidgets, widget_type, None)
+        if not (isinstance(widget_class, type) and issubclass(widget_class, QWidget)):
+            widget_class = QWidget
+        widget = widget_class()
+        if widget_type == "QTabWidget":
+            for index in range(TAB_PAGE_COUNT):
+                widget.addTab(QWidget(), tab_page_title(index))
+        elif widget_type in MODEL_TYPES:
+            widget.setModel(create_model(widget_type, widget))
+        return widget
+
+    def sync(self, info, visiting=frozenset()):
+        """使预览控件与控件信息一致，只调用值有变化的设置方法"""
+        uid = info['uid']
+        item = self.items.get(uid)
+        if item is None:
+            item = self.items[uid] = PreviewItem(self._create(info['widget_type']))
+
+        # 所在容器：容器尚未构建时先构建容器，循环引用的控件按顶层控件处理
+        parent_uid = info.get('parent')
+        parent_info = self.by_uid.get(parent_uid)
+        if parent_info is None or parent_uid == uid or parent_uid in visiting:
+            parent_uid = parent_info = None
+        elif parent_uid not in self.items:
+            self.sync(parent_info, visiting | {uid})
+        page = None
+        if parent_info is not None and parent_info['widget_type'] == "QTabWidget":
+            page = info.get('page') or 0
+        if (parent_uid, page) != (item.parent, item.page):
+            self._place(item, parent_uid, page)
+
+        # 几何相对容器左上角
+        properties = info['properties']
+        x, y, width, height = geometry_tuple(properties.get('geometry'))
+        if parent_info is not None:
+            x0, y0 = geometry_tuple(parent_info['properties'].get('geometry'))[:2]
+            x, y = x - x0, y - y0
+        geometry = (x, y, width, height)
+        if geometry != item.geometry:
+            item.widget.setGeometry(QRect(*geometry))
+            item.geometry = geometry
+
+        # 属性：比较编码后的值，受影响的属性排在其后重新设置
+        setters = python_setters(info['widget_type'])
+        changed = []
+        for prop_name, value in properties.items():
+            if prop_name in setters:
+                encoded = encode_value(value)
+                if item.applied.get(prop_name, _UNSET) != encoded:
+                    changed.append((prop_name, encoded))
+        if not changed:
+            return
+        for prop_name, _ in list(changed):
+            for dependent in DEPENDENT_PROPERTIES.get(prop_name, ()):
+                if dependent in properties and all(dependent != name for name, _ in changed):
+                    changed.append((dependent, encode_value(properties[dependent])))
+        changed.sort(key=lambda change: change[0] in _DEPENDENTS)
+
+        widget = item.widget
+        for prop_name, encoded in changed:
+            method = getattr(model_target(widget, prop_name), setters[prop_name], None)
+            if method is not None:
+                if prop_name == "items":
+                    widget.clear()
+                method(setter_argument(prop_name, properties[prop_name]))
+            item.applied[prop_name] = encoded
+
+    def _place(self, item, parent_uid, page):
+        """把预览控件放入容器（选项卡为对应页面），顶层控件加入中央布局"""
+        widget = item.widget
+        if item.parent is None:
+            self.central_layout.removeWidget(widget)
+        if parent_uid is None:
+            widget.setParent(self.central_widget)
+            self.central_layout.addWidget(widget)
+        else:
+            container = self.items[parent_uid].widget
+            if page is not None:
+                while container.count() <= page:
+                    container.addTab(QWidget(), tab_page_title(container.count()))
+                container = container.widget(page)
+            widget.setParent(container)
+        widget.show()
+        item.parent, item.page = parent_uid, page
+        item.geometry = None  # 换了容器后重新设置几何
@@ -0,0 +1,323 @@
+# 项目文件模块 - 带索引的 .pqd 项目格式，支持按区域局部加载和增量保存
+#
+# 文件布局：
+#   [固定长度文件头] "PQD2 <索引偏移> <索引长度>\n"
+#   [控件记录]       每个控件一行 JSON
+#   [索引]           JSON：每个控件的记录偏移、长度、包围盒和父容器
+#
+# 文件头长度固定，可以原地改写；保存时只把修改过的记录追加到文件末尾，
+# 再写入新的索引并更新文件头，未修改的记录保持原样不动。
+import json
+import os
+
+PROJECT_MAGIC = b"PQD2"
+PROJECT_VERSION = "2.0"
+HEADER_FORMAT = b"PQD2 %012d %012d\n"
+HEADER_SIZE = len(HEADER_FORMAT % (0, 0))
+
+# 空间索引的网格单元大小（像素）
+INDEX_CELL_SIZE = 512
+
+# 废弃数据超过有效数据的比例时，保存时整体压缩重写
+COMPACT_RATIO = 1.0
+
+
+def encode_value(value):
+    """将属性值转换为可 JSON 序列化的形式"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [encode_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: encode_value(v) for k, v in value.items()}
+    # QRect 等矩形对象
+    if all(hasattr(value, attr) for attr in ("x", "y", "width", "height")):
+        return {"x": value.x(), "y": value.y(),
+                "width": value.width(), "height": value.height()}
+    # QFont
+    if hasattr(value, "toString") and hasattr(value, "pointSize"):
+        return {"__font__": value.toString()}
+    # QColor
+    if hasattr(value, "name") and hasattr(value, "isValid"):
+        return {"__color__": value.name()}
+    # Qt 枚举/标志位（如 Qt.Alignment）
+    return int(value)
+
+
+def encode_properties(properties, defaults=None):
+    """将控件属性字典转换为可 JSON 序列化的字典
+
+    传入 defaults（已编码的类型默认属性模板）时只保留与默认值不同的属性，
+    几何属性始终保留，用于索引中的包围盒。
+    """
+    data = {name: encode_value(value) for name, value in properties.items()}
+    if defaults is not None:
+        data = elide_defaults(data, defaults)
+    return data
+
+
+def elide_defaults(data, defaults):
+    """去掉与默认属性模板相同的属性"""
+    return {name: value for name, value in data.items()
+            if name == "geometry" or defaults.get(name, _MISSING) != value}
+
+
+_MISSING = object()
+
+
+def geometry_tuple(geometry):
+    """从 QRect、字典或元组中取出 (x, y, width, height)"""
+    if geometry is None:
+        return (0, 0, 0, 0)
+    if isinstance(geometry, dict):
+        return (geometry.get("x", 0), geometry.get("y", 0),
+                geometry.get("width", 0), geometry.get("height", 0))
+    if isinstance(geometry, (list, tuple)):
+        return tuple(geometry)
+    return (geometry.x(), geometry.y(), geometry.width(), geometry.height())
+
+
+def rects_intersect(a, b):
+    """判断两个 (x, y, width, height) 矩形是否相交"""
+    return (a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and
+            a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+
+
+def rect_contains(outer, inner):
+    """判断矩形 outer 是否完全包含矩形 inner"""
+    return (outer[0] <= inner[0] and outer[1] <= inner[1] and
+            inner[0] + inner[2] <= outer[0] + outer[2] and
+            inner[1] + inner[3] <= outer[1] + outer[3])
+
+
+def dump_record(record):
+    """将控件记录序列化为一行 JSON 文本"""
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+
+def is_indexed_project(file_name):
+    """判断文件是否为带索引的项目格式"""
+    with open(file_name, "rb") as f:
+        return f.read(len(PROJECT_MAGIC)) == PROJECT_MAGIC
+
+
+def load_legacy_project(file_name):
+    """读取旧版（1.0）整体 JSON 项目文件，返回控件记录列表"""
+    with open(file_name, "r", encoding="utf-8") as f:
+        project_data = json.load(f)
+
+    records = []
+    for uid, widget_data in enumerate(project_data.get("widgets", []), 1):
+        records.append({
+            "uid": widget_data.get("uid", uid),
+            "widget_type": widget_data["widget_type"],
+            "properties": widget_data["properties"],
+            "parent": widget_data.get("parent"),
+        })
+    return records
+
+
+class IndexEntry:
+    """索引项 - 一个控件记录在文件中的位置和包围盒"""
+
+    __slots__ = ("uid", "offset", "length", "bbox", "parent")
+
+    def __init__(self, uid, offset, length, bbox, parent=None):
+        self.uid = uid
+        self.offset = offset
+        self.length = length
+        self.bbox = tuple(bbox)
+        self.parent = parent
+
+    def to_json(self):
+        return [self.uid, self.offset, self.length, list(self.bbox), self.parent]
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(*data)
+
+
+class IndexedProject:
+    """带索引的项目文件 - 按需读取控件记录"""
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.entries = []
+        self.by_uid = {}
+        self.index_offset = 0
+        self.index_length = 0
+        self._buckets = {}
+        self._read_index()
+
+    def _read_index(self):
+        """读取文件头和索引"""
+        with open(self.file_name, "rb") as f:
+            header = f.read(HEADER_SIZE)
+            if not header.startswith(PROJECT_MAGIC):
+                raise ValueError("不是有效的索引项目文件")
+            _, index_offset, index_length = header.split()
+            self.index_offset = int(index_offset)
+            self.index_length = int(index_length)
+            f.seek(self.index_offset)
+            index = json.loads(f.read(self.index_length).decode("utf-8"))
+
+        self.entries = [IndexEntry.from_json(e) for e in index["records"]]
+        self.by_uid = {e.uid: e for e in self.entries}
+
+        # 构建网格空间索引，区域查询只需访问相交的网格单元
+        self._buckets = {}
+        for position, entry in enumerate(self.entries):
+            for cell in self._cells(entry.bbox):
+                self._buckets.setdefault(cell, []).append(position)
+
+    @staticmethod
+    def _cells(rect):
+        """返回矩形覆盖的网格单元"""
+        x, y, w, h = rect
+        x0, y0 = x // INDEX_CELL_SIZE, y // INDEX_CELL_SIZE
+        x1 = (x + max(w, 1) - 1) // INDEX_CELL_SIZE
+        y1 = (y + max(h, 1) - 1) // INDEX_CELL_SIZE
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield (cx, cy)
+
+    def bounds(self):
+        """返回所有控件的整体范围 (width, height)"""
+        width = height = 0
+        for entry in self.entries:
+            x, y, w, h = entry.bbox
+            width = max(width, x + w)
+            height = max(height, y + h)
+        return width, height
+
+    def query_region(self, rect):
+        """返回与区域相交的索引项（按文件中的原始顺序）"""
+        positions = set()
+        for cell in self._cells(rect):
+            positions.update(self._buckets.get(cell, ()))
+        return [self.entries[p] for p in sorted(positions)
+                if rects_intersect(self.entries[p].bbox, rect)]
+
+    def query_container(self, uid):
+        """返回容器本身及其包围盒内的所有索引项"""
+        container = self.by_uid.get(uid)
+        if container is None:
+            return []
+        return [e for e in self.query_region(container.bbox)
+                if e is container or e.parent == uid or
+                rect_contains(container.bbox, e.bbox)]
+
+    def read_records(self, entries):
+        """读取一组控件记录，按偏移排序以顺序读取文件"""
+        records = {}
+        with open(self.file_name, "rb") as f:
+            for entry in sorted(entries, key=lambda e: e.offset):
+                f.seek(entry.offset)
+                records[entry.uid] = f.read(entry.length).decode("utf-8")
+        return [(records[e.uid], json.loads(records[e.uid])) for e in entries]
+
+    def read_raw(self, f, entry):
+        """从已打开的文件中读取记录的原始字节"""
+        f.seek(entry.offset)
+        return f.read(entry.length)
+
+    def live_size(self):
+        """有效记录的总字节数（含换行符）"""
+        return sum(e.length + 1 for e in self.entries)
+
+    def garbage_size(self):
+        """被替换或删除的记录及旧索引占用的字节数"""
+        return self.index_offset - HEADER_SIZE - self.live_size()
+
+
+def _make_entry(uid, offset, text, record):
+    return IndexEntry(uid, offset, len(text), record_bbox(record), record.get("parent"))
+
+
+def record_bbox(record):
+    """返回记录中控件的包围盒"""
+    bbox = record.get("bbox")
+    if bbox is not None:
+        return tuple(bbox)
+    return geometry_tuple(record["properties"].get("geometry"))
+
+
+def _write_index(f, entries):
+    """在当前位置写入索引并回写文件头"""
+    index_offset = f.tell()
+    index = json.dumps({
+        "version": PROJECT_VERSION,
+        "records": [e.to_json() for e in entries],
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    f.write(index)
+    f.truncate()
+    f.seek(0)
+    f.write(HEADER_FORMAT % (index_offset, len(index)))
+
+
+def write_project(file_name, records, source=None, order=None):
+    """完整写出项目文件
+
+    records 为已加载控件的 {uid: (记录文本, 记录)}；source 为原项目，
+    其中未加载的记录直接按原始字节复制。order 为最终的 uid 顺序。
+    """
+    if order is None:
+        order = list(records)
+    tmp_name = file_name + ".tmp"
+    entries = []
+    src = open(source.file_name, "rb") if source else None
+    try:
+        with open(tmp_name, "wb") as f:
+            f.write(HEADER_FORMAT % (0, 0))
+            for uid in order:
+                offset = f.tell()
+                if uid in records:
+                    text, record = records[uid]
+                    data = text.encode("utf-8")
+                    f.write(data + b"\n")
+                    entries.append(_make_entry(uid, offset, data, record))
+                else:
+                    old = source.by_uid[uid]
+                    f.write(source.read_raw(src, old) + b"\n")
+                    entries.append(IndexEntry(uid, offset, old.length, old.bbox, old.parent))
+            _write_index(f, entries)
+    finally:
+        if src:
+            src.close()
+    os.replace(tmp_name, file_name)
+
+
+def splice_project(project, records, order):
+    """增量保存：只追加修改过的记录，未修改的记录原样保留
+
+    records 为需要写入的 {uid: (记录文本, 记录)}，order 为最终的 uid 顺序，
+    不在 order 中的旧记录视为已删除。返回写入的记录数。
+    """
+    # 本次保存后将成为废弃数据的字节：旧索引、被替换和被删除的记录
+    kept = set(order)
+    removed = sum(e.length + 1 for uid, e in project.by_uid.items()
+                  if uid in records or uid not in kept)
+    garbage = project.garbage_size() + project.index_length + removed
+
+    # 废弃数据过多时整体压缩重写
+    if garbage > (project.live_size() - removed) * COMPACT_RATIO:
+        write_project(project.file_name, records, source=project, order=order)
+        project._read_index()
+        return len(records)
+
+    new_entries = {}
+    with open(project.file_name, "r+b") as f:
+        # 追加到旧索引之后，文件头更新前旧索引始终有效
+        f.seek(0, os.SEEK_END)
+        for uid in order:
+            if uid in records:
+                text, record = records[uid]
+                data = text.encode("utf-8")
+                offset = f.tell()
+                f.write(data + b"\n")
+                new_entries[uid] = _make_entry(uid, offset, data, record)
+        entries = [new_entries.get(uid) or project.by_uid[uid] for uid in order]
+        _write_index(f, entries)
+
+    project._read_index()
+    return len(new_entries)
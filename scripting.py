@@ -0,0 +1,299 @@
+# 脚本接口 - 不打开设计器窗口，用 Python 脚本批量创建和修改设计
+#
+#     from scripting import Design
+#     design = Design()
+#     with design.transaction():
+#         box = design.add("QGroupBox", 10, 10, 300, 200, title="登录")
+#         design.add("QLineEdit", 20, 40, parent=box, placeholderText="用户名")
+#     design.save("login.pqd")
+#     design.generate("py", "login.py")
+#
+# Design 中保存的是与项目文件相同的控件记录：属性为 JSON 形式（只保存设置过的属性，其余在
+# 加载时取默认值），几何为画布上的绝对坐标，容器在其中的控件之前。添加、修改、删除和保存
+# 都不依赖 Qt；generate 使用设计器的代码生成器，需要能导入 PyQt5，但不需要 QApplication
+# 和显示器（与命令行批量转换相同）。to_canvas / from_canvas 与设计器画布交换全部控件。
+#
+# 事务：transaction() 中的修改作为一个整体，其中出现异常时全部撤销；监听者在事务结束时
+# 只收到一次通知（变更和删除的控件编号），不在事务中的每个操作各通知一次。
+#
+# 本模块不依赖 Qt。
+from contextlib import contextmanager
+
+from project import (encode_value, geometry_tuple, dump_record, write_project,
+                     IndexedProject, is_indexed_project, load_legacy_project)
+from plugins import PLUGINS
+from widget_types import WIDGET_TYPES, CONTAINER_TYPES, default_size
+
+_MISSING = object()
+
+
+class Design:
+    """可脚本化的设计 - 按编号保存控件记录，支持事务和变更通知"""
+
+    def __init__(self, records=()):
+        self.records = {}    # uid -> 记录，按画布中的顺序
+        self.children = {}   # 容器 uid -> [其中控件的 uid]
+        self.next_uid = 1
+        self.listeners = []  # listener(变更的 uid 集合, 删除的 uid 集合)
+        self._order = {}     # uid -> 顺序号；撤销删除后按顺序号恢复原来的顺序
+        self._next_order = 0
+        self._reordered = False
+        self._journal = None  # 事务中的撤销记录 [(方法名, 参数...), ...]
+        self._changed = set()
+        self._removed = set()
+        for record in records:
+            record = dict(record, properties=dict(record["properties"]))
+            record.setdefault("parent", None)
+            self._insert(record)
+        self._changed.clear()
+
+    @classmethod
+    def open(cls, file_name):
+        """从项目文件（带索引的格式或旧版格式）读取全部控件"""
+        if is_indexed_project(file_name):
+            project = IndexedProject(file_name)
+            return cls(record for _, record in project.read_records(project.entries))
+        return cls(load_legacy_project(file_name))
+
+    @classmethod
+    def from_canvas(cls, canvas):
+        """设计器画布上的全部控件"""
+        return cls(canvas.group_records())
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, uid):
+        return uid in self.records
+
+    def __iter__(self):
+        """按画布中的顺序逐个产出控件记录（调用方不可修改）"""
+        if self._reordered:
+            order = self._order
+            self.records = dict(sorted(self.records.items(), key=lambda item: order[item[0]]))
+            self._reordered = False
+        return iter(self.records.values())
+
+    def get(self, uid):
+        """编号为 uid 的控件记录"""
+        record = self.records.get(uid)
+        if record is None:
+            raise KeyError(f"没有编号为 {uid} 的控件")
+        return record
+
+    def descendants(self, uid):
+        """容器中的全部控件（含嵌套的容器中的控件）的编号"""
+        result = []
+        stack = list(self.children.get(uid, ()))
+        while stack:
+            child = stack.pop()
+            result.append(child)
+            stack.extend(self.children.get(child, ()))
+        return result
+
+    # ---- 修改操作 ----
+
+    def add(self, widget_type, x=0, y=0, width=None, height=None, parent=None, page=None,
+            **properties):
+        """添加控件，返回其编号
+
+        尺寸缺省为控件类型的默认尺寸；parent 为容器的编号，选项卡中的控件用 page 指定页码
+        （缺省为第一页）；其余关键字参数为属性（如 text="确定"）。
+        """
+        if widget_type not in WIDGET_TYPES and widget_type not in PLUGINS.types:
+            raise ValueError(f"未知的控件类型：{widget_type}")
+        page = self._check_parent(parent, page)
+        default_width, default_height = default_size(widget_type)
+        geometry = {"x": x, "y": y,
+                    "width": default_width if width is None else width,
+                    "height": default_height if height is None else height}
+        record = {"uid": self.next_uid, "widget_type": widget_type,
+                  "properties": {"geometry": geometry}, "parent": parent}
+        if page is not None:
+            record["page"] = page
+        for name, value in properties.items():
+            record["properties"][name] = encode_value(value)
+        self._insert(record)
+        self._log("_remove", record["uid"])
+        self._notify()
+        return record["uid"]
+
+    def set_property(self, uid, name, value):
+        """设置控件的属性；geometry 可以是 {x, y, width, height} 或 (x, y, 宽, 高)"""
+        properties = self.get(uid)["properties"]
+        if name == "geometry":
+            x, y, width, height = geometry_tuple(value)
+            value = {"x": x, "y": y, "width": width, "height": height}
+        old = properties.get(name, _MISSING)
+        properties[name] = encode_value(value)
+        self._log("_restore_property", uid, name, old)
+        self._changed.add(uid)
+        self._notify()
+
+    def set_properties(self, uid, **properties):
+        """一次设置控件的多个属性"""
+        for name, value in properties.items():
+            self.set_property(uid, name, value)
+
+    def move(self, uid, x, y):
+        """移动控件，容器中的控件随容器一起移动（与在画布上拖动容器相同）"""
+        geometry = self.get(uid)["properties"]["geometry"]
+        dx, dy = x - geometry["x"], y - geometry["y"]
+        if not dx and not dy:
+            return
+        moved = [uid] + self.descendants(uid)
+        self._offset_all(moved, dx, dy)
+        self._log("_offset_all", moved, -dx, -dy)
+        self._notify()
+
+    def delete(self, uid):
+        """删除控件，容器中的控件一并删除"""
+        self.get(uid)
+        removed = []
+        for member in [uid] + self.descendants(uid):
+            removed.append((self._order[member], self.records[member]))
+            self._remove(member)
+        self._log("_reinsert", removed)
+        self._notify()
+
+    def clear(self):
+        """删除全部控件"""
+        roots = [uid for uid, record in self.records.items() if record["parent"] not in self.records]
+        with self.transaction():
+            for uid in roots:
+                self.delete(uid)
+
+    @contextmanager
+    def transaction(self):
+        """事务：其中的修改作为一个整体，出现异常时全部撤销；可以嵌套（并入外层事务）"""
+        if self._journal is not None:
+            yield self
+            return
+        self._journal = []
+        try:
+            yield self
+        except BaseException:
+            journal, self._journal = self._journal, None
+            for name, *args in reversed(journal):
+                getattr(self, name)(*args)
+            self._changed.clear()
+            self._removed.clear()
+            raise
+        self._journal = None
+        self._notify()
+
+    # ---- 保存和生成代码 ----
+
+    def save(self, file_name):
+        """保存为带索引的项目文件，返回写入的控件数"""
+        records = {record["uid"]: (dump_record(record), record) for record in self}
+        write_project(file_name, records, order=list(records))
+        return len(records)
+
+    def generate(self, fmt="py", file_name=None, table=False, lazy_tabs=False):
+        """生成代码（fmt 为 "py" 或 "ui"）：指定 file_name 时写入文件，否则返回代码文本
+
+        table 和 lazy_tabs 为 Python 代码的数据表模式和选项卡页面延迟构建（同命令行转换）。
+        需要能导入 PyQt5，不需要 QApplication。
+        """
+        from designer import DesignDocument, CodeGenerator, PYTHON_MODE_TABLE, PYTHON_MODE_STANZA
+        from components import load_plugins
+        load_plugins()
+        generator = CodeGenerator(DesignDocument(self))
+        if fmt == "py":
+            mode = PYTHON_MODE_TABLE if table else PYTHON_MODE_STANZA
+            if file_name:
+                return generator.write_python_code(file_name, mode, lazy_tabs)
+            return generator.generate_python_code(mode, lazy_tabs)
+        if fmt == "ui":
+            if file_name:
+                return generator.write_ui_code(file_name)
+            return generator.generate_ui_code()
+        raise ValueError(f"不支持的输出格式：{fmt}")
+
+    def to_canvas(self, canvas):
+        """用这些控件替换设计器画布上的全部控件（一次批量加载）"""
+        canvas.clear_widgets()
+        return canvas.load_records([(None, record) for record in self])
+
+    # ---- 内部操作（也用于撤销） ----
+
+    def _check_parent(self, parent, page):
+        """检查容器，返回控件的页码（选项卡中缺省为第一页，其他容器中为 None）"""
+        if parent is None:
+            return None
+        parent_type = self.get(parent)["widget_type"]
+        if parent_type not in CONTAINER_TYPES:
+            raise ValueError(f"编号为 {parent} 的控件（{parent_type}）不是容器")
+        if parent_type != "QTabWidget":
+            return None
+        if page is None:
+            return 0
+        if not isinstance(page, int) or page < 0:
+            raise ValueError(f"无效的选项卡页码：{page}")
+        return page
+
+    def _insert(self, record, order=None):
+        uid = record["uid"]
+        if uid in self.records:
+            raise ValueError(f"编号 {uid} 已被使用")
+        if order is None:
+            order = self._next_order
+            self._next_order += 1
+        else:
+            self._reordered = True
+        self.records[uid] = record
+        self._order[uid] = order
+        if record["parent"] is not None:
+            self.children.setdefault(record["parent"], []).append(uid)
+        self.next_uid = max(self.next_uid, uid + 1)
+        self._changed.add(uid)
+        self._removed.discard(uid)
+
+    def _remove(self, uid):
+        record = self.records.pop(uid)
+        del self._order[uid]
+        self.children.pop(uid, None)
+        siblings = self.children.get(record["parent"])
+        if siblings is not None:
+            siblings.remove(uid)
+        self._changed.discard(uid)
+        self._removed.add(uid)
+
+    def _reinsert(self, removed):
+        for order, record in removed:
+            self._insert(record, order)
+
+    def _restore_property(self, uid, name, value):
+        properties = self.records[uid]["properties"]
+        if value is _MISSING:
+            properties.pop(name, None)
+        else:
+            properties[name] = value
+
+    def _offset(self, uid, dx, dy):
+        properties = self.records[uid]["properties"]
+        x, y, width, height = geometry_tuple(properties.get("geometry"))
+        properties["geometry"] = {"x": x + dx, "y": y + dy, "width": width, "height": height}
+        self._changed.add(uid)
+
+    def _offset_all(self, uids, dx, dy):
+        for uid in uids:
+            self._offset(uid, dx, dy)
+
+    def _log(self, name, *args):
+        """记录撤销操作（只在事务中）：撤销时调用的方法名和参数
+
+        只保存名称和参数而不保存绑定方法，大批量修改时撤销记录不增加垃圾回收的负担。
+        """
+        if self._journal is not None:
+            self._journal.append((name,) + args)
+
+    def _notify(self):
+        """不在事务中时通知监听者变更和删除的控件"""
+        if self._journal is not None or not (self._changed or self._removed):
+            return
+        changed, removed = self._changed, self._removed
+        self._changed, self._removed = set(), set()
+        for listener in self.listeners:
+            listener(changed, removed)
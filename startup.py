@@ -0,0 +1,144 @@
+# 启动分析模块 - 记录设计器启动各阶段的耗时，并可统计各模块的导入耗时
+#
+# 启动分为两段：首帧之前只创建主窗口的框架（菜单、工具栏、画布和空的停靠窗口），
+# 控件库的条目、属性编辑器、代码生成器和缩略图在主窗口第一次绘制之后逐步创建。
+# 以 --profile-startup 参数启动（或设置 PQD_PROFILE_STARTUP 环境变量）时，在导入其他模块
+# 之前安装导入计时（与 python -X importtime 相同，分别统计模块自身和含其导入的模块的耗时），
+# 启动完成后把各阶段耗时和导入耗时最长的模块输出到标准错误。
+#
+# 本模块只依赖标准库，必须在其他模块之前导入。
+import os
+import sys
+import time
+
+PROFILE_FLAG = "--profile-startup"
+PROFILE_ENV = "PQD_PROFILE_STARTUP"
+
+# 报告中列出的导入耗时最长的模块数
+REPORT_IMPORTS = 20
+
+
+class _TimedLoader:
+    """包装模块的加载器，统计创建模块（扩展模块在这时加载和初始化）和执行模块代码
+    （含其中的导入）的耗时"""
+
+    def __init__(self, loader, profiler):
+        self.loader = loader
+        self.profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        self.profiler._enter(spec.name)
+        try:
+            return self.loader.create_module(spec)
+        finally:
+            self.profiler._leave()
+
+    def exec_module(self, module):
+        # 还原模块的加载器，importlib.resources 等按加载器类型工作的代码不受影响
+        module.__loader__ = module.__spec__.loader = self.loader
+        self.profiler._enter(module.__name__)
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.profiler._leave()
+
+
+class _ImportTimer:
+    """sys.meta_path 上的查找器：交给其余查找器查找，为找到的模块包装计时加载器"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self.profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """启动分析器 - 各阶段的结束时间和各模块的导入耗时"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = []         # [(阶段名称, 结束时间), ...]
+        self.imports = {}        # 模块名 -> (自身耗时, 累计耗时, 嵌套深度)
+        self.enabled = False
+        self._finder = None
+        self._stack = []         # 正在导入的模块 [名称, 开始时间, 其中导入其他模块的耗时]
+
+    def install_if_requested(self, argv):
+        """命令行参数中有 --profile-startup（从 argv 中去掉）或设置了环境变量时安装导入计时"""
+        if PROFILE_FLAG in argv:
+            argv.remove(PROFILE_FLAG)
+            self.install()
+        elif os.environ.get(PROFILE_ENV):
+            self.install()
+
+    def install(self):
+        self.enabled = True
+        if self._finder is None:
+            self._finder = _ImportTimer(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def _enter(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _leave(self):
+        name, start, children = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        own, cumulative, depth = self.imports.get(name, (0.0, 0.0, len(self._stack)))
+        self.imports[name] = (own + elapsed - children, cumulative + elapsed, depth)
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def mark(self, phase):
+        """记录阶段结束"""
+        self.phases.append((phase, time.perf_counter()))
+
+    def elapsed(self, phase=None):
+        """从开始到阶段结束（缺省为最后一个阶段）的耗时（秒）"""
+        for name, end in reversed(self.phases):
+            if phase is None or name == phase:
+                return end - self.start
+        return None
+
+    def report(self):
+        """各阶段耗时和导入耗时最长的模块"""
+        lines = ["启动分析（从导入 startup 模块开始计时，单位 ms）", "    耗时 |     累计 | 阶段"]
+        previous = self.start
+        for name, end in self.phases:
+            lines.append(f"{(end - previous) * 1000:8.1f} | {(end - self.start) * 1000:8.1f} | {name}")
+            previous = end
+        if self.imports:
+            total = sum(cumulative for _, cumulative, depth in self.imports.values() if depth == 0)
+            lines.append(f"导入 {len(self.imports)} 个模块，共 {total * 1000:.1f} ms；"
+                         f"耗时最长的 {REPORT_IMPORTS} 个：")
+            lines.append("    自身 |     累计 | 模块")
+            ranked = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)
+            for name, (own, cumulative, depth) in ranked[:REPORT_IMPORTS]:
+                lines.append(f"{own * 1000:8.1f} | {cumulative * 1000:8.1f} | {'  ' * depth}{name}")
+        return "\n".join(lines)
+
+    def finish(self):
+        """启动完成：停止导入计时，启用分析时输出报告"""
+        self.uninstall()
+        if self.enabled:
+            print(self.report(), file=sys.stderr)
+
+
+# 全局启动分析器
+STARTUP = StartupProfiler()
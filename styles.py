@@ -1,109 +1,130 @@
 # 自定义样式表模块
+#
+# 设计器界面的主题由调色板（QPalette）决定，切换主题只替换应用程序调色板，不设置样式表：
+# 设置了样式表（即使只有几条不含颜色的规则）的控件不再跟随调色板变化，切换时需要重新应用
+# 样式，画布上的控件也会因此继承不到画布的调色板，并且每个控件创建时都要匹配样式规则。
+# 画布使用独立的完整调色板（design_palette），画布上的控件不受界面主题影响。
+# DARK_STYLESHEET 和 BLOCKS_LIGHT_STYLESHEET 是原来整套的样式表，保留供需要时单独使用，
+# 由带变量的主题定义（DARK_THEME、BLOCKS_LIGHT_THEME）在第一次访问时编译而成。
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QPalette, QColor
+
+# 暗黑主题（主题定义，由 theme_compiler 编译为样式表）
+DARK_THEME = """
+@background: #1e1e1e;
+@base: #252525;
+@alternate: #2a2a2a;
+@button: #2d2d2d;
+@hover: #3a3a3a;
+@pressed: #444444;
+@border: #373737;
+@border-hover: #5e5e5e;
+@text: #e0e0e0;
+@accent: #007acc;
+@accent-hover: #009aee;
 
-# 暗黑主题样式表
-DARK_STYLESHEET = """
 QMainWindow, QDialog, QWidget {
-    background-color: #1e1e1e;
-    color: #e0e0e0;
+    background-color: @background;
+    color: @text;
 }
 
 QMenuBar, QMenu {
-    background-color: #252525;
-    color: #e0e0e0;
-    border: 1px solid #373737;
+    background-color: @base;
+    color: @text;
+    border: 1px solid @border;
 }
 
 QMenuBar::item:selected, QMenu::item:selected {
-    background-color: #3a3a3a;
+    background-color: @hover;
 }
 
 QToolBar {
-    background-color: #2d2d2d;
-    border: 1px solid #373737;
+    background-color: @button;
+    border: 1px solid @border;
     spacing: 3px;
 }
 
 QToolButton {
-    background-color: #2d2d2d;
-    border: 1px solid #373737;
+    background-color: @button;
+    border: 1px solid @border;
     border-radius: 3px;
 }
 
 QToolButton:hover {
-    background-color: #3a3a3a;
-    border: 1px solid #5e5e5e;
+    background-color: @hover;
+    border: 1px solid @border-hover;
 }
 
 QToolButton:pressed {
-    background-color: #3a3a3a;
+    background-color: @hover;
 }
 
 QPushButton {
-    background-color: #2d2d2d;
-    color: #e0e0e0;
-    border: 1px solid #373737;
+    background-color: @button;
+    color: @text;
+    border: 1px solid @border;
     border-radius: 3px;
     padding: 5px;
     min-width: 80px;
 }
 
 QPushButton:hover {
-    background-color: #3a3a3a;
-    border: 1px solid #5e5e5e;
+    background-color: @hover;
+    border: 1px solid @border-hover;
 }
 
 QPushButton:pressed {
-    background-color: #444444;
+    background-color: @pressed;
 }
 
 QLineEdit, QTextEdit, QPlainTextEdit, QSpinBox, QDoubleSpinBox {
-    background-color: #252525;
-    color: #e0e0e0;
-    border: 1px solid #373737;
+    background-color: @base;
+    color: @text;
+    border: 1px solid @border;
     border-radius: 3px;
     padding: 2px;
 }
 
 QComboBox {
-    background-color: #252525;
-    color: #e0e0e0;
-    border: 1px solid #373737;
+    background-color: @base;
+    color: @text;
+    border: 1px solid @border;
     border-radius: 3px;
     padding: 1px 18px 1px 3px;
     min-width: 6em;
 }
 
 QComboBox:hover {
-    border: 1px solid #5e5e5e;
+    border: 1px solid @border-hover;
 }
 
 QComboBox::drop-down {
     subcontrol-origin: padding;
     subcontrol-position: top right;
     width: 15px;
-    border-left: 1px solid #373737;
+    border-left: 1px solid @border;
 }
 
 QComboBox QAbstractItemView {
-    background-color: #252525;
-    color: #e0e0e0;
-    border: 1px solid #373737;
-    selection-background-color: #3a3a3a;
+    background-color: @base;
+    color: @text;
+    border: 1px solid @border;
+    selection-background-color: @hover;
 }
 
 QLabel {
-    color: #e0e0e0;
+    color: @text;
 }
 
 QTabWidget::pane {
-    border: 1px solid #373737;
+    border: 1px solid @border;
 }
 
 QTabBar::tab {
-    background-color: #2d2d2d;
-    color: #e0e0e0;
-    border: 1px solid #373737;
-    border-bottom-color: #373737;
+    background-color: @button;
+    color: @text;
+    border: 1px solid @border;
+    border-bottom-color: @border;
     border-top-left-radius: 4px;
     border-top-right-radius: 4px;
     min-width: 8ex;
@@ -112,47 +133,48 @@ QTabBar::tab {
 }
 
 QTabBar::tab:selected, QTabBar::tab:hover {
-    background-color: #3a3a3a;
+    background-color: @hover;
 }
 
 QTabBar::tab:selected {
-    border-bottom-color: #3a3a3a;
+    border-bottom-color: @hover;
 }
 
 QDockWidget {
-    border: 1px solid #373737;
+    border: 1px solid @border;
     titlebar-close-icon: url(close.png);
     titlebar-normal-icon: url(normal.png);
 }
 
 QDockWidget::title {
     text-align: left;
-    background-color: #2d2d2d;
+    background-color: @button;
     padding-left: 5px;
 }
 
-QListWidget, QTreeWidget, QTableWidget {
-    background-color: #252525;
-    color: #e0e0e0;
-    border: 1px solid #373737;
-    alternate-background-color: #2a2a2a;
+QListWidget, QTreeWidget, QTableWidget, #widget_box {
+    background-color: @base;
+    color: @text;
+    border: 1px solid @border;
+    alternate-background-color: @alternate;
 }
 
-QListWidget::item:selected, QTreeWidget::item:selected, QTableWidget::item:selected {
-    background-color: #3a3a3a;
-    color: #e0e0e0;
+QListWidget::item:selected, QTreeWidget::item:selected, QTableWidget::item:selected,
+#widget_box::item:selected {
+    background-color: @hover;
+    color: @text;
 }
 
 QScrollBar:vertical {
-    background-color: #2d2d2d;
+    background-color: @button;
     width: 12px;
     margin: 12px 0 12px 0;
-    border: 1px solid #373737;
+    border: 1px solid @border;
     border-radius: 2px;
 }
 
 QScrollBar::handle:vertical {
-    background-color: #5e5e5e;
+    background-color: @border-hover;
     min-height: 20px;
     border-radius: 2px;
 }
@@ -174,15 +196,15 @@ QScrollBar::sub-line:vertical {
 }
 
 QScrollBar:horizontal {
-    background-color: #2d2d2d;
+    background-color: @button;
     height: 12px;
     margin: 0 12px 0 12px;
-    border: 1px solid #373737;
+    border: 1px solid @border;
     border-radius: 2px;
 }
 
 QScrollBar::handle:horizontal {
-    background-color: #5e5e5e;
+    background-color: @border-hover;
     min-width: 20px;
     border-radius: 2px;
 }
@@ -204,16 +226,16 @@ QScrollBar::sub-line:horizontal {
 }
 
 QSlider::groove:horizontal {
-    border: 1px solid #373737;
+    border: 1px solid @border;
     height: 4px;
-    background: #3a3a3a;
+    background: @hover;
     margin: 0px;
     border-radius: 2px;
 }
 
 QSlider::handle:horizontal {
-    background: #007acc;
-    border: 1px solid #373737;
+    background: @accent;
+    border: 1px solid @border;
     width: 12px;
     height: 12px;
     margin: -4px 0;
@@ -221,11 +243,11 @@ QSlider::handle:horizontal {
 }
 
 QSlider::handle:horizontal:hover {
-    background: #009aee;
+    background: @accent-hover;
 }
 
 QGroupBox {
-    border: 1px solid #373737;
+    border: 1px solid @border;
     border-radius: 3px;
     margin-top: 1ex;
     font-weight: bold;
@@ -235,15 +257,15 @@ QGroupBox::title {
     subcontrol-origin: margin;
     subcontrol-position: top left;
     padding: 0 3px;
-    color: #e0e0e0;
+    color: @text;
 }
 
 QHeaderView::section {
-    background-color: #2d2d2d;
-    color: #e0e0e0;
+    background-color: @button;
+    color: @text;
     padding: 4px;
-    border: 1px solid #373737;
-    border-top: 1px solid #373737;
+    border: 1px solid @border;
+    border-top: 1px solid @border;
 }
 
 QSizeGrip {
@@ -252,56 +274,68 @@ QSizeGrip {
 }
 
 QToolTip {
-    border: 1px solid #373737;
-    background-color: #252525;
-    color: #e0e0e0;
+    border: 1px solid @border;
+    background-color: @base;
+    color: @text;
     padding: 2px;
     opacity: 200;
 }
 """
 
-# 现代积木风格样式表 - 浅色主题
-BLOCKS_LIGHT_STYLESHEET = """
+# 现代积木风格 - 浅色主题（主题定义）
+BLOCKS_LIGHT_THEME = """
+@background: #f0f0f0;
+@base: white;
+@hover: #e6e6e6;
+@pressed: #d9d9d9;
+@border: #dddddd;
+@border-hover: #bbbbbb;
+@text: #333333;
+@accent: #4d94ff;
+@accent-hover: #3a85ff;
+@accent-pressed: #2a75ff;
+@accent-text: white;
+
 QMainWindow, QDialog, QWidget {
-    background-color: #f0f0f0;
-    color: #333333;
+    background-color: @background;
+    color: @text;
 }
 
 QMenuBar, QMenu {
-    background-color: #ffffff;
-    color: #333333;
-    border: 1px solid #dddddd;
+    background-color: @base;
+    color: @text;
+    border: 1px solid @border;
 }
 
 QMenuBar::item:selected, QMenu::item:selected {
-    background-color: #e6e6e6;
+    background-color: @hover;
 }
 
 QToolBar {
-    background-color: #ffffff;
-    border: 1px solid #dddddd;
+    background-color: @base;
+    border: 1px solid @border;
     spacing: 3px;
 }
 
 QToolButton {
-    background-color: #ffffff;
-    border: 1px solid #dddddd;
+    background-color: @base;
+    border: 1px solid @border;
     border-radius: 5px;
     padding: 4px;
 }
 
 QToolButton:hover {
-    background-color: #e6e6e6;
-    border: 1px solid #bbbbbb;
+    background-color: @hover;
+    border: 1px solid @border-hover;
 }
 
 QToolButton:pressed {
-    background-color: #d9d9d9;
+    background-color: @pressed;
 }
 
 QPushButton {
-    background-color: #4d94ff;
-    color: white;
+    background-color: @accent;
+    color: @accent-text;
     border: none;
     border-radius: 5px;
     padding: 8px 16px;
@@ -309,63 +343,63 @@ QPushButton {
 }
 
 QPushButton:hover {
-    background-color: #3a85ff;
+    background-color: @accent-hover;
 }
 
 QPushButton:pressed {
-    background-color: #2a75ff;
+    background-color: @accent-pressed;
 }
 
 QLineEdit, QTextEdit, QPlainTextEdit, QSpinBox, QDoubleSpinBox {
-    background-color: white;
-    color: #333333;
-    border: 2px solid #dddddd;
+    background-color: @accent-text;
+    color: @text;
+    border: 2px solid @border;
     border-radius: 5px;
     padding: 6px;
 }
 
 QLineEdit:focus, QTextEdit:focus, QPlainTextEdit:focus, QSpinBox:focus, QDoubleSpinBox:focus {
-    border: 2px solid #4d94ff;
+    border: 2px solid @accent;
 }
 
 QComboBox {
-    background-color: white;
-    color: #333333;
-    border: 2px solid #dddddd;
+    background-color: @accent-text;
+    color: @text;
+    border: 2px solid @border;
     border-radius: 5px;
     padding: 6px 12px 6px 6px;
     min-width: 6em;
 }
 
 QComboBox:hover {
-    border: 2px solid #bbbbbb;
+    border: 2px solid @border-hover;
 }
 
 QComboBox:focus {
-    border: 2px solid #4d94ff;
+    border: 2px solid @accent;
 }
 
 QComboBox::drop-down {
     subcontrol-origin: padding;
     subcontrol-position: top right;
     width: 15px;
-    border-left: 1px solid #dddddd;
+    border-left: 1px solid @border;
 }
 
 QComboBox QAbstractItemView {
-    background-color: white;
-    color: #333333;
-    border: 1px solid #dddddd;
-    selection-background-color: #e6e6e6;
+    background-color: @accent-text;
+    color: @text;
+    border: 1px solid @border;
+    selection-background-color: @hover;
 }
 
 QLabel {
-    color: #333333;
+    color: @text;
     font-size: 13px;
 }
 
 QGroupBox {
-    border: 2px solid #dddddd;
+    border: 2px solid @border;
     border-radius: 5px;
     margin-top: 1ex;
     font-weight: bold;
@@ -376,8 +410,8 @@ QGroupBox::title {
     subcontrol-origin: margin;
     subcontrol-position: top left;
     padding: 0 5px;
-    color: #333333;
-    background-color: #f0f0f0;
+    color: @text;
+    background-color: @background;
 }
 
 /* 积木风格特别样式 */
@@ -386,21 +420,21 @@ QGroupBox::title {
 }
 
 #widget_box QListWidget::item {
-    background-color: white;
-    border: 2px solid #dddddd;
+    background-color: @accent-text;
+    border: 2px solid @border;
     border-radius: 5px;
     margin: 5px;
     padding: 10px;
 }
 
 #widget_box QListWidget::item:hover {
-    background-color: #e6e6e6;
-    border-color: #bbbbbb;
+    background-color: @hover;
+    border-color: @border-hover;
 }
 
 #widget_box QListWidget::item:selected {
-    background-color: #d9d9d9;
-    border-color: #4d94ff;
+    background-color: @pressed;
+    border-color: @accent;
 }
 
 #design_canvas QWidget {
@@ -409,10 +443,84 @@ QGroupBox::title {
 }
 
 #design_canvas QWidget:hover {
-    border: 2px dashed #bbbbbb;
+    border: 2px dashed @border-hover;
 }
 
 #design_canvas QWidget[selected="true"] {
-    border: 2px solid #4d94ff !important;
+    border: 2px solid @accent !important;
 }
 """
+
+# 编译后的样式表名称 -> 主题定义；第一次访问时才编译（编译结果缓存在磁盘上，
+# 主题定义未修改时直接读取），导入本模块不编译主题、不写缓存
+STYLESHEET_THEMES = {
+    "DARK_STYLESHEET": DARK_THEME,
+    "BLOCKS_LIGHT_STYLESHEET": BLOCKS_LIGHT_THEME,
+}
+
+
+def __getattr__(name):
+    """按需编译 DARK_STYLESHEET 和 BLOCKS_LIGHT_STYLESHEET"""
+    if name not in STYLESHEET_THEMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from theme_compiler import compile_theme
+    stylesheet = globals()[name] = compile_theme(STYLESHEET_THEMES[name])
+    return stylesheet
+
+
+# 主题：名称、显示名称和调色板各颜色角色的颜色，未列出的角色由按钮色和窗口色推算
+THEMES = {
+    "light": {
+        "text": "浅色",
+        "colors": {
+            "Window": "#f0f0f0", "WindowText": "#333333", "Base": "#ffffff",
+            "AlternateBase": "#f7f7f7", "Text": "#333333", "Button": "#ffffff",
+            "ButtonText": "#333333", "Highlight": "#4d94ff", "HighlightedText": "#ffffff",
+            "ToolTipBase": "#ffffff", "ToolTipText": "#333333", "Link": "#2a75ff",
+            "Mid": "#dddddd", "PlaceholderText": "#999999",
+        },
+    },
+    "dark": {
+        "text": "深色",
+        "colors": {
+            "Window": "#1e1e1e", "WindowText": "#e0e0e0", "Base": "#252525",
+            "AlternateBase": "#2a2a2a", "Text": "#e0e0e0", "Button": "#2d2d2d",
+            "ButtonText": "#e0e0e0", "Highlight": "#007acc", "HighlightedText": "#ffffff",
+            "ToolTipBase": "#252525", "ToolTipText": "#e0e0e0", "Link": "#3a9ff0",
+            "Mid": "#373737", "PlaceholderText": "#808080",
+        },
+    },
+}
+
+DEFAULT_THEME = "light"
+
+# 禁用状态下文字颜色的透明度
+DISABLED_TEXT_ALPHA = 110
+
+
+def theme_palette(name):
+    """主题的调色板"""
+    colors = THEMES[name]["colors"]
+    palette = QPalette(QColor(colors["Button"]), QColor(colors["Window"]))
+    for role, color in colors.items():
+        palette.setColor(getattr(QPalette, role), QColor(color))
+    for role in ("WindowText", "Text", "ButtonText"):
+        color = QColor(colors[role])
+        color.setAlpha(DISABLED_TEXT_ALPHA)
+        palette.setColor(QPalette.Disabled, getattr(QPalette, role), color)
+    return palette
+
+
+def design_palette():
+    """画布的调色板：界面风格的标准调色板，所有颜色角色都显式设置，不继承界面主题"""
+    palette = QApplication.style().standardPalette()
+    palette.setColor(QPalette.Window, QColor(240, 240, 240))
+    for group in (QPalette.Active, QPalette.Inactive, QPalette.Disabled):
+        for role in range(QPalette.NColorRoles):
+            palette.setBrush(group, role, palette.brush(group, role))
+    return palette
+
+
+def apply_theme(app, name):
+    """切换界面主题：替换应用程序调色板，画布（调色板已完整设置）及其中的控件不受影响"""
+    app.setPalette(theme_palette(name))
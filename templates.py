@@ -0,0 +1,150 @@
+# 组合模板模块 - 把一组控件（一个控件及其中包含的控件）保存为可复用的模板，整体放到画布上
+#
+# 模板文件（*.pqt）是 JSON：{"name": 名称, "size": [宽, 高], "widgets": [记录, ...]}。
+# 记录与项目文件中的控件记录格式相同（只保存与默认值不同的属性），几何相对模板左上角，
+# 编号为模板内的局部编号，parent 为 null 的控件是模板的顶层控件。
+# 放到画布上时重新分配编号、平移几何，顶层控件放入落点所在的容器。
+#
+# 本模块不依赖 Qt。
+import json
+import os
+
+from project import geometry_tuple
+
+TEMPLATE_SUFFIX = ".pqt"
+
+# 模板目录：环境变量指定的目录，缺省为用户数据目录下的 pyqt5-gui-designer/templates
+TEMPLATE_DIR_ENV = "PQD_TEMPLATE_DIR"
+
+# 控件库中模板条目的键（即拖拽数据）前缀
+TEMPLATE_PREFIX = "template:"
+
+
+def default_template_dir():
+    """模板目录"""
+    directory = os.environ.get(TEMPLATE_DIR_ENV)
+    if directory:
+        return directory
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "pyqt5-gui-designer", "templates")
+
+
+class Template:
+    """组合模板 - 一组相对几何的控件记录"""
+
+    def __init__(self, name, records, size):
+        self.name = name
+        self.records = records   # 局部编号、相对几何的控件记录，容器在其中的控件之前
+        self.size = size         # 整体的 (宽, 高)
+
+    @property
+    def key(self):
+        return TEMPLATE_PREFIX + self.name
+
+    @classmethod
+    def from_records(cls, name, records):
+        """由画布上一组控件的记录（按画布中的顺序）创建模板
+
+        不在这组控件中的容器视为外部容器，包含于其中的控件成为模板的顶层控件。
+        """
+        boxes = [geometry_tuple(record["properties"].get("geometry")) for record in records]
+        left = min((box[0] for box in boxes), default=0)
+        top = min((box[1] for box in boxes), default=0)
+        right = max((box[0] + box[2] for box in boxes), default=0)
+        bottom = max((box[1] + box[3] for box in boxes), default=0)
+
+        local = {record["uid"]: n for n, record in enumerate(records, 1)}
+        template_records = []
+        for record, (x, y, width, height) in zip(records, boxes):
+            properties = dict(record["properties"])
+            properties["geometry"] = {"x": x - left, "y": y - top, "width": width, "height": height}
+            parent = local.get(record.get("parent"))
+            template_record = {"uid": local[record["uid"]], "widget_type": record["widget_type"],
+                               "properties": properties, "parent": parent}
+            if parent is not None and record.get("page") is not None:
+                template_record["page"] = record["page"]
+            template_records.append(template_record)
+        return cls(name, template_records, (right - left, bottom - top))
+
+    def instantiate(self, origin, first_uid, parent=None, page=None):
+        """返回放到画布上的控件记录：编号从 first_uid 开始，几何平移到 origin，
+        顶层控件放入容器 parent（选项卡为第 page 页）"""
+        x0, y0 = origin
+        offset = first_uid - 1
+        records = []
+        for record in self.records:
+            x, y, width, height = geometry_tuple(record["properties"]["geometry"])
+            properties = dict(record["properties"])
+            properties["geometry"] = {"x": x + x0, "y": y + y0, "width": width, "height": height}
+            instance = {"uid": record["uid"] + offset, "widget_type": record["widget_type"],
+                        "properties": properties}
+            if record.get("parent") is None:
+                instance["parent"], instance["page"] = parent, page
+            else:
+                instance["parent"], instance["page"] = record["parent"] + offset, record.get("page")
+            records.append(instance)
+        return records
+
+    def palette_entry(self):
+        """控件库中显示的条目信息"""
+        types = sorted({record["widget_type"] for record in self.records})
+        return {"icon": "🧱", "text": self.name,
+                "description": f"组合模板：{len(self.records)} 个控件（{', '.join(types)}）"}
+
+    def to_data(self):
+        return {"name": self.name, "size": list(self.size), "widgets": self.records}
+
+    @classmethod
+    def from_data(cls, data):
+        return cls(data["name"], data["widgets"], tuple(data["size"]))
+
+
+class TemplateLibrary:
+    """模板库 - 模板目录中的全部模板，按名称索引"""
+
+    def __init__(self):
+        self.directory = None
+        self.templates = {}   # 控件库键 -> Template
+
+    def load(self, directory=None):
+        """读取模板目录中的模板，无效的模板文件被忽略"""
+        self.directory = directory or default_template_dir()
+        self.templates = {}
+        if not os.path.isdir(self.directory):
+            return
+        for file_name in sorted(os.listdir(self.directory)):
+            if not file_name.endswith(TEMPLATE_SUFFIX):
+                continue
+            try:
+                with open(os.path.join(self.directory, file_name), "r", encoding="utf-8") as f:
+                    template = Template.from_data(json.load(f))
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            self.templates[template.key] = template
+
+    def get(self, key):
+        """控件库键对应的模板，不是模板时返回 None"""
+        return self.templates.get(key) if key and key.startswith(TEMPLATE_PREFIX) else None
+
+    def file_name(self, name):
+        """模板的文件路径（名称中不能用于文件名的字符替换为下划线）"""
+        safe = "".join("_" if c in '<>:"/\\|?*' else c for c in name).strip() or "template"
+        return os.path.join(self.directory or default_template_dir(), safe + TEMPLATE_SUFFIX)
+
+    def save(self, template):
+        """保存模板（同名模板被覆盖）"""
+        file_name = self.file_name(template.name)
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        tmp_name = file_name + ".tmp"
+        with open(tmp_name, "w", encoding="utf-8") as f:
+            json.dump(template.to_data(), f, ensure_ascii=False, indent=1)
+        os.replace(tmp_name, file_name)
+        self.templates[template.key] = template
+
+    def palette_entries(self):
+        """控件库中模板条目 {键: 条目信息}"""
+        return {key: template.palette_entry() for key, template in self.templates.items()}
+
+
+# 全局模板库
+TEMPLATES = TemplateLibrary()
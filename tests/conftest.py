@@ -0,0 +1,19 @@
+# 测试公共设置 - 从仓库根目录导入模块；使用 Qt 的测试在无显示器的 offscreen 平台上运行，
+# 缩略图和样式表等缓存写入临时目录
+import os
+import sys
+import tempfile
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("PQD_CACHE_DIR", tempfile.mkdtemp(prefix="pqd-test-cache-"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """整个测试会话共用的 QApplication（未安装 PyQt5 时跳过）"""
+    pytest.importorskip("PyQt5")
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,132 @@
+# 代码生成测试 - 片段缓存失效、输出模式、选项卡页面延迟构建和省略 Qt 默认值
+from codegen_ir import build_widget_ir, elide_qt_defaults
+
+GEOMETRY = {"x": 10, "y": 10, "width": 80, "height": 30}
+
+
+def button(text, uid=1):
+    return {"uid": uid, "widget_type": "QPushButton",
+            "properties": {"geometry": GEOMETRY, "text": text}, "parent": None}
+
+
+def elided(widget_type, **properties):
+    ir = build_widget_ir(widget_type, "w", dict(properties, geometry=GEOMETRY))
+    return [node.name for node in elide_qt_defaults(ir).nodes]
+
+
+def test_reloaded_uid_does_not_reuse_stale_fragment(qapp):
+    from designer import CodeGenerator, DesignCanvas
+    canvas = DesignCanvas()
+    generator = CodeGenerator(canvas)
+
+    canvas.load_records([(None, button("AAA"))])
+    assert "AAA" in generator.generate_python_code()
+
+    # 打开另一个项目：清空画布后加载编号相同的控件
+    canvas.clear_widgets()
+    canvas.load_records([(None, button("BBB"))])
+    code = generator.generate_python_code()
+    assert "BBB" in code and "AAA" not in code
+    assert "BBB" in generator.generate_ui_code()
+
+
+def test_changed_widget_fragment_is_rebuilt(qapp):
+    from designer import CodeGenerator, DesignCanvas
+    canvas = DesignCanvas()
+    generator = CodeGenerator(canvas)
+    widget, _ = canvas.load_records([(None, button("AAA")), (None, button("CCC", uid=2))])
+    generator.generate_python_code()
+
+    canvas.widgets[0]["properties"]["text"] = "新文本"
+    canvas.widget_changed.emit(widget)
+
+    code = generator.generate_python_code()
+    assert "新文本" in code and "AAA" not in code and "CCC" in code
+
+
+def test_deleted_widget_fragment_is_dropped(qapp):
+    from designer import CodeGenerator, DesignCanvas
+    canvas = DesignCanvas()
+    generator = CodeGenerator(canvas)
+    first, _ = canvas.load_records([(None, button("AAA")), (None, button("CCC", uid=2))])
+    generator.generate_python_code()
+
+    canvas.delete_widget(first)
+
+    assert all(1 not in cache for cache in generator.fragment_cache.values())
+    assert "AAA" not in generator.generate_python_code()
+
+
+def build_window(code):
+    """运行生成的代码，返回构建好的主窗口"""
+    namespace = {"__name__": "generated"}
+    exec(compile(code, "generated.py", "exec"), namespace)
+    return namespace["MyWindow"]()
+
+
+def widget_summary(window):
+    from PyQt5.QtWidgets import QWidget
+    summary = []
+    for widget in window.centralWidget().findChildren(QWidget):
+        text = widget.text() if hasattr(widget, "text") and callable(widget.text) else None
+        summary.append((type(widget).__name__, widget.geometry().getRect(), text))
+    return summary
+
+
+def test_table_mode_builds_same_window_as_stanza_mode(qapp):
+    from designer import PYTHON_MODE_TABLE, CodeGenerator, DesignCanvas
+    canvas = DesignCanvas()
+    canvas.load_records([
+        (None, button('say "hi" \'x\'')),
+        (None, {"uid": 2, "widget_type": "QLabel", "parent": None,
+                "properties": {"geometry": {"x": 10, "y": 60, "width": 120, "height": 30},
+                               "text": "标签"}}),
+        (None, {"uid": 3, "widget_type": "QCheckBox", "parent": None,
+                "properties": {"geometry": {"x": 10, "y": 100, "width": 120, "height": 30},
+                               "text": "选项", "checked": True}}),
+    ])
+    generator = CodeGenerator(canvas)
+
+    stanza = build_window(generator.generate_python_code())
+    table_code = generator.generate_python_code(PYTHON_MODE_TABLE)
+    table = build_window(table_code)
+
+    assert widget_summary(table) == widget_summary(stanza)
+    assert [w[2] for w in widget_summary(table)] == ['say "hi" \'x\'', "标签", "选项"]
+
+
+def test_lazy_tab_page_is_built_on_first_switch(qapp):
+    from PyQt5.QtWidgets import QPushButton, QTabWidget
+    from designer import CodeGenerator, DesignCanvas
+    canvas = DesignCanvas()
+    canvas.load_records([
+        (None, {"uid": 1, "widget_type": "QTabWidget", "parent": None,
+                "properties": {"geometry": {"x": 10, "y": 10, "width": 300, "height": 200}}}),
+        (None, dict(button("第一页", uid=2), parent=1, page=0)),
+        (None, dict(button("第二页", uid=3), parent=1, page=1)),
+    ])
+    generator = CodeGenerator(canvas)
+
+    def texts(window):
+        return sorted(b.text() for b in window.findChildren(QPushButton))
+
+    assert texts(build_window(generator.generate_python_code())) == ["第一页", "第二页"]
+
+    window = build_window(generator.generate_python_code(lazy_tabs=True))
+    assert texts(window) == ["第一页"]
+    tab = window.findChildren(QTabWidget)[0]
+    tab.setCurrentIndex(1)
+    assert texts(window) == ["第一页", "第二页"]
+    assert window.findChildren(QPushButton)[1].parent() is tab.widget(1)
+
+    # 切换回来不会重复构建
+    tab.setCurrentIndex(0)
+    tab.setCurrentIndex(1)
+    assert texts(window) == ["第一页", "第二页"]
+
+
+def test_value_default_elided_only_inside_range():
+    assert "value" not in elided("QSpinBox", value=0)
+    assert "value" not in elided("QSpinBox", minimum=-5, maximum=5, value=0)
+    assert "value" in elided("QSpinBox", minimum=5, maximum=10, value=0)
+    assert "value" in elided("QSlider", minimum=-10, maximum=-1, value=0)
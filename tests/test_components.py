@@ -0,0 +1,65 @@
+# 控件组件测试 - 列表项文件按块读取和控件库搜索
+import pytest
+
+
+def test_item_file_reads_rows_across_blocks(qapp, tmp_path):
+    from components import ITEM_BLOCK_SIZE, ItemFile
+    file_name = tmp_path / "items.txt"
+    rows = [f"第{i}项" for i in range(ITEM_BLOCK_SIZE * 2 + 5)]
+    file_name.write_bytes("\r\n".join(rows).encode("utf-8"))  # Windows 换行，最后一行没有换行
+
+    items = ItemFile(str(file_name))
+
+    assert len(items) == len(rows)
+    for row in (0, ITEM_BLOCK_SIZE - 1, ITEM_BLOCK_SIZE, len(rows) - 1, 3):
+        assert items[row] == rows[row]
+    with pytest.raises(IndexError):
+        items[len(rows)]
+
+
+def test_empty_item_file(qapp, tmp_path):
+    from components import ItemFile
+    file_name = tmp_path / "empty.txt"
+    file_name.write_bytes(b"")
+    assert len(ItemFile(str(file_name))) == 0
+
+
+PALETTE = {
+    "QLabel": {"text": "标签", "description": "显示文本"},
+    "QLineEdit": {"text": "单行输入", "description": "输入一行 label 文本"},
+    "QListView": {"text": "数据列表", "description": "按需读取的列表"},
+    "Label": {"text": "自定义", "description": ""},
+    "QTableView": {"text": "数据表格", "description": ""},
+}
+
+
+def palette_names(index, query):
+    names = list(PALETTE)
+    return [names[n] for n in index.search(query)]
+
+
+def test_palette_search_ranks_exact_prefix_substring_description_fuzzy(qapp):
+    from components import PaletteIndex
+    index = PaletteIndex(PALETTE)
+
+    # 完全相同（Label、去掉 Q 的 QLabel）> 描述中的子串
+    assert palette_names(index, "label") == ["QLabel", "Label", "QLineEdit"]
+    # 前缀 > 模糊匹配，模糊匹配中字符越紧凑越靠前
+    assert palette_names(index, "qt") == ["QTableView", "QListView", "QLineEdit"]
+    assert palette_names(index, "qlv") == ["QListView", "QTableView"]
+    # 子串匹配按控件库中的顺序
+    assert palette_names(index, "view") == ["QListView", "QTableView"]
+    assert palette_names(index, "数据") == ["QListView", "QTableView"]
+    assert palette_names(index, "xyz") == []
+    assert palette_names(index, "") == list(PALETTE)
+
+
+def test_palette_search_narrows_previous_matches(qapp):
+    from components import PaletteIndex
+    index = PaletteIndex(PALETTE)
+    assert palette_names(index, "q") == ["QLabel", "QLineEdit", "QListView", "QTableView"]
+    assert palette_names(index, "qli") == ["QLineEdit", "QListView", "QTableView"]
+    assert index.last_matches == {1, 2, 4}
+    assert palette_names(index, "qlin") == ["QLineEdit"]
+    # 删除字符后重新从倒排表查找
+    assert palette_names(index, "qt") == ["QTableView", "QListView", "QLineEdit"]
@@ -0,0 +1,50 @@
+# 命令行批量转换测试 - 清单记录未变化的项目时跳过
+import os
+
+from project import dump_record, write_project
+
+
+def write_design(file_name, text):
+    record = {"uid": 1, "widget_type": "QPushButton", "parent": None,
+              "properties": {"geometry": {"x": 10, "y": 10, "width": 80, "height": 30},
+                             "text": text}}
+    write_project(str(file_name), {1: (dump_record(record), record)})
+
+
+def test_unchanged_project_is_skipped(qapp, tmp_path, capsys):
+    from main import convert_main
+    designs, build = tmp_path / "designs", tmp_path / "build"
+    designs.mkdir()
+    write_design(designs / "form.pqd", "第一版")
+    argv = [str(designs), "-o", str(build), "-f", "py", "-j", "1"]
+
+    assert convert_main(argv) == 0
+    output = build / "form.py"
+    assert "第一版" in output.read_text(encoding="utf-8")
+    assert "转换 1" in capsys.readouterr().out
+    mtime = os.stat(output).st_mtime_ns
+
+    assert convert_main(argv) == 0
+    assert "跳过 1" in capsys.readouterr().out
+    assert os.stat(output).st_mtime_ns == mtime
+
+    # 源文件改动后重新转换
+    write_design(designs / "form.pqd", "第二版")
+    assert convert_main(argv) == 0
+    assert "转换 1" in capsys.readouterr().out
+    assert "第二版" in output.read_text(encoding="utf-8")
+
+
+def test_modified_output_is_regenerated(qapp, tmp_path, capsys):
+    from main import convert_main
+    designs, build = tmp_path / "designs", tmp_path / "build"
+    designs.mkdir()
+    write_design(designs / "form.pqd", "按钮")
+    argv = [str(designs), "-o", str(build), "-f", "py", "-j", "1"]
+    convert_main(argv)
+
+    (build / "form.py").write_text("# 手工改动", encoding="utf-8")
+    convert_main(argv)
+
+    assert "转换 1" in capsys.readouterr().out.splitlines()[-2]
+    assert "按钮" in (build / "form.py").read_text(encoding="utf-8")
@@ -0,0 +1,37 @@
+# 导出清单测试 - 内容没有变化的输出文件不重写
+import os
+
+from manifest import OutputManifest
+
+
+def test_unchanged_output_is_not_rewritten(tmp_path):
+    output = str(tmp_path / "form.py")
+    manifest = OutputManifest(str(tmp_path / ".export.json"))
+
+    assert manifest.write(output, ["print(1)\n", "print(2)\n"])
+    os.utime(output, ns=(1, 1))  # 固定修改时间，确认不重写时保持不变
+
+    assert not manifest.write(output, ["print(1)\n", "print(2)\n"])
+    assert os.stat(output).st_mtime_ns == 1
+    assert not os.path.exists(output + ".tmp")
+
+    assert manifest.write(output, ["print(3)\n"])
+    with open(output, encoding="utf-8") as f:
+        assert f.read() == "print(3)\n"
+    assert (manifest.written, manifest.skipped) == (2, 1)
+
+
+def test_manifest_survives_reload_and_detects_edits(tmp_path):
+    output = str(tmp_path / "form.ui")
+    manifest_file = str(tmp_path / ".export.json")
+    manifest = OutputManifest(manifest_file)
+    manifest.write(output, ["<ui/>\n"])
+    manifest.save()
+
+    reloaded = OutputManifest(manifest_file)
+    assert not reloaded.write(output, ["<ui/>\n"])
+
+    # 输出文件被手工改动后，即使生成的内容不变也要重写
+    with open(output, "w", encoding="utf-8") as f:
+        f.write("<ui>edited</ui>\n")
+    assert reloaded.write(output, ["<ui/>\n"])
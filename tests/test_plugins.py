@@ -0,0 +1,61 @@
+# 插件测试 - 扫描清单注册控件类型，不导入插件模块
+import json
+import sys
+
+from plugins import PluginRegistry
+
+
+def write_manifest(directory, name, data):
+    (directory / f"{name}.plugin.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_scan_registers_types_without_importing(tmp_path):
+    write_manifest(tmp_path, "acme", {
+        "module": "acme_gauge_plugin",
+        "widgets": [
+            {"class": "Gauge", "size": [120, 120], "properties": {"value": 0, "title": "仪表"},
+             "setters": {"title": "setCaption"}},
+            {"class": "QPushButton"},
+        ],
+    })
+    write_manifest(tmp_path, "other", {"module": "other_plugin", "widgets": [{"class": "Gauge"}]})
+    (tmp_path / "broken.plugin.json").write_text("{", encoding="utf-8")
+    (tmp_path / "notes.json").write_text("{}", encoding="utf-8")
+
+    registry = PluginRegistry()
+    added = registry.scan([str(tmp_path)], reserved={"QPushButton"})
+
+    assert [t.widget_type for t in added] == ["Gauge"]
+    assert "Gauge" in registry and "QPushButton" not in registry
+    acme, broken, other = registry.plugins
+    assert acme.ignored == ["QPushButton"] and other.ignored == ["Gauge"]
+    assert broken.error and broken.status == "失败"
+
+    gauge = registry.types["Gauge"]
+    assert gauge.size == (120, 120)
+    assert registry.setters("Gauge") == {"objectName": "setObjectName", "value": "setValue",
+                                         "title": "setCaption"}
+    assert registry.dynamic_properties("Gauge") == {"title"}
+    assert registry.import_lines(["Gauge", "QLabel"]) == ["from acme_gauge_plugin import Gauge"]
+
+    # 只读取了清单，插件模块没有导入
+    assert acme.status == "未导入" and "acme_gauge_plugin" not in sys.modules
+
+    # 同一目录只扫描一次
+    assert registry.scan([str(tmp_path)]) == []
+
+
+def test_widget_class_imports_module_on_first_use(tmp_path):
+    (tmp_path / "dial_plugin_mod.py").write_text("class Dial:\n    pass\n", encoding="utf-8")
+    write_manifest(tmp_path, "dial", {"module": "dial_plugin_mod", "widgets": [{"class": "Dial"}]})
+    registry = PluginRegistry()
+    registry.scan([str(tmp_path)])
+    plugin = registry.plugins[0]
+    try:
+        assert plugin.import_time is None
+        assert registry.widget_class("Dial").__name__ == "Dial"
+        assert plugin.status == "已导入" and plugin.import_time is not None
+    finally:
+        sys.modules.pop("dial_plugin_mod", None)
+        if plugin.path in sys.path:
+            sys.path.remove(plugin.path)
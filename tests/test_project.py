@@ -0,0 +1,115 @@
+# 项目文件测试 - 增量保存（拼接）、局部加载和省略默认值的往返
+from project import (IndexedProject, dump_record, elide_defaults, encode_properties,
+                     splice_project, write_project)
+
+
+def make_record(uid, x, text, parent=None, y=10):
+    return {"uid": uid, "widget_type": "QPushButton",
+            "properties": {"geometry": {"x": x, "y": y, "width": 80, "height": 30}, "text": text},
+            "parent": parent}
+
+
+def entry(record):
+    return dump_record(record), record
+
+
+def read_all(file_name):
+    project = IndexedProject(file_name)
+    return {record["uid"]: record for _, record in project.read_records(project.entries)}
+
+
+def test_splice_replaces_appends_and_deletes(tmp_path):
+    file_name = str(tmp_path / "design.pqd")
+    records = {uid: entry(make_record(uid, uid * 100, f"按钮{uid}")) for uid in range(1, 6)}
+    write_project(file_name, records)
+    project = IndexedProject(file_name)
+
+    # 修改 2、删除 4、新增 6；其余记录不重写
+    changed = {2: entry(make_record(2, 200, "已修改")), 6: entry(make_record(6, 600, "新增"))}
+    written = splice_project(project, changed, [1, 2, 3, 5, 6])
+
+    assert written == 2
+    loaded = read_all(file_name)
+    assert [e.uid for e in IndexedProject(file_name).entries] == [1, 2, 3, 5, 6]
+    assert loaded[2]["properties"]["text"] == "已修改"
+    assert loaded[6]["properties"]["text"] == "新增"
+    assert loaded[1] == records[1][1] and loaded[5] == records[5][1]
+    assert 4 not in loaded
+
+
+def test_splice_keeps_unchanged_bytes_in_place(tmp_path):
+    file_name = str(tmp_path / "design.pqd")
+    records = {uid: entry(make_record(uid, uid * 100, f"按钮{uid}")) for uid in range(1, 4)}
+    write_project(file_name, records)
+    offsets = {e.uid: e.offset for e in IndexedProject(file_name).entries}
+
+    project = IndexedProject(file_name)
+    splice_project(project, {3: entry(make_record(3, 300, "改"))}, [1, 2, 3])
+
+    entries = {e.uid: e for e in IndexedProject(file_name).entries}
+    assert entries[1].offset == offsets[1] and entries[2].offset == offsets[2]
+    assert entries[3].offset > offsets[3]
+
+
+def test_write_project_copies_unloaded_records_from_source(tmp_path):
+    source_name = str(tmp_path / "source.pqd")
+    records = {uid: entry(make_record(uid, uid * 100, f"按钮{uid}")) for uid in range(1, 4)}
+    write_project(source_name, records)
+    source = IndexedProject(source_name)
+
+    # 只有 2 已加载并修改，1 和 3 从原项目复制
+    target_name = str(tmp_path / "target.pqd")
+    write_project(target_name, {2: entry(make_record(2, 200, "另存"))}, source=source,
+                  order=[1, 2, 3])
+
+    loaded = read_all(target_name)
+    assert loaded[1] == records[1][1] and loaded[3] == records[3][1]
+    assert loaded[2]["properties"]["text"] == "另存"
+
+
+def test_load_all_loads_entries_outside_the_visible_region(qapp, tmp_path):
+    from PyQt5.QtCore import QRect
+    from designer import DesignCanvas
+    file_name = str(tmp_path / "design.pqd")
+    records = {uid: entry(make_record(uid, 10, f"按钮{uid}", y=uid * 500)) for uid in range(1, 21)}
+    write_project(file_name, records)
+    canvas = DesignCanvas()
+    canvas.attach_project(IndexedProject(file_name))
+
+    canvas.load_region(QRect(0, 0, 800, 1200))
+    assert len(canvas.widgets) < 20
+
+    canvas.load_all()
+    assert sorted(w["uid"] for w in canvas.widgets) == list(range(1, 21))
+    assert canvas.load_all() == []
+
+
+def test_elided_properties_expand_back_from_template():
+    defaults = {"geometry": {"x": 0, "y": 0, "width": 100, "height": 30},
+                "text": "", "enabled": True, "toolTip": ""}
+    properties = {"geometry": {"x": 5, "y": 6, "width": 100, "height": 30},
+                  "text": "确定", "enabled": True, "toolTip": ""}
+
+    saved = encode_properties(properties, defaults)
+
+    # 几何始终保留，与默认值相同的属性省略；加载时由模板补全
+    assert saved == {"geometry": properties["geometry"], "text": "确定"}
+    assert {**defaults, **saved} == properties
+    assert elide_defaults({**defaults, **saved}, defaults) == saved
+
+
+def test_canvas_saves_only_changed_properties_and_restores_defaults(qapp):
+    from PyQt5.QtCore import QPoint
+    from designer import DesignCanvas
+    canvas = DesignCanvas()
+    widget = canvas.create_widget("QPushButton", QPoint(20, 20))
+    canvas.widgets[0]["properties"]["text"] = "确定"
+    canvas.apply_property(widget, "text", "确定")
+
+    (text, record), = canvas.collect_records().values()
+    assert set(record["properties"]) == {"geometry", "text"}
+
+    loaded = DesignCanvas()
+    loaded.load_records([(text, record)])
+    assert loaded.widgets[0]["properties"] == canvas.widgets[0]["properties"]
+    assert loaded.widgets[0]["widget"].text() == "确定"
@@ -0,0 +1,81 @@
+# 脚本接口测试 - 事务撤销、单次通知和保存后读回
+import copy
+
+import pytest
+
+from scripting import Design
+
+
+def snapshot(design):
+    return [copy.deepcopy(record) for record in design], copy.deepcopy(design.children)
+
+
+def build(design):
+    box = design.add("QGroupBox", 10, 10, 300, 200, title="登录")
+    design.add("QLineEdit", 20, 40, parent=box, placeholderText="用户名")
+    design.add("QPushButton", 400, 10, text="确定")
+    return box
+
+
+def test_transaction_rolls_back_every_change_on_error():
+    design = Design()
+    box = build(design)
+    before = snapshot(design)
+
+    with pytest.raises(RuntimeError):
+        with design.transaction():
+            design.set_property(3, "text", "取消")
+            design.move(box, 50, 60)
+            design.delete(box)
+            design.add("QLabel", 0, 0, text="新增")
+            raise RuntimeError
+
+    assert snapshot(design) == before
+    assert len(design) == 3
+
+
+def test_transaction_notifies_listeners_once():
+    design = Design()
+    calls = []
+    design.listeners.append(lambda changed, removed: calls.append((set(changed), set(removed))))
+
+    with design.transaction():
+        box = build(design)
+        design.delete(box)
+
+    assert calls == [({3}, {1, 2})]
+
+
+def test_failed_transaction_does_not_notify():
+    design = Design()
+    calls = []
+    design.listeners.append(lambda changed, removed: calls.append(changed))
+
+    with pytest.raises(ValueError):
+        with design.transaction():
+            design.add("QPushButton", 0, 0)
+            design.add("QPushButton", 0, 0, parent=1)   # 按钮不是容器
+
+    assert calls == [] and len(design) == 0
+
+
+def test_move_and_delete_cascade_to_children():
+    design = Design()
+    box = build(design)
+
+    design.move(box, 30, 40)
+    assert design.get(2)["properties"]["geometry"]["x"] == 40
+    assert design.get(2)["properties"]["geometry"]["y"] == 70
+
+    design.delete(box)
+    assert 2 not in design and list(design.records) == [3]
+
+
+def test_save_and_open_round_trip(tmp_path):
+    design = Design()
+    build(design)
+    file_name = str(tmp_path / "login.pqd")
+
+    design.save(file_name)
+
+    assert list(Design.open(file_name)) == list(design)
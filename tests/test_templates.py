@@ -0,0 +1,57 @@
+# 组合模板测试 - 由画布记录创建模板，放到画布上时重新编号和平移
+from templates import Template, TemplateLibrary
+
+
+def record(uid, widget_type, x, y, width, height, parent=None, page=None, **properties):
+    properties["geometry"] = {"x": x, "y": y, "width": width, "height": height}
+    result = {"uid": uid, "widget_type": widget_type, "properties": properties, "parent": parent}
+    if page is not None:
+        result["page"] = page
+    return result
+
+
+def make_template():
+    # 选项卡（编号 7，位于外部容器 3 中）及其第二页中的按钮
+    return Template.from_records("登录", [
+        record(7, "QTabWidget", 100, 50, 300, 200, parent=3),
+        record(9, "QPushButton", 120, 100, 80, 30, parent=7, page=1, text="确定"),
+    ])
+
+
+def test_from_records_uses_local_uids_and_relative_geometry():
+    template = make_template()
+
+    assert template.size == (300, 200)
+    tab, ok = template.records
+    assert (tab["uid"], tab["parent"]) == (1, None) and "page" not in tab
+    assert (ok["uid"], ok["parent"], ok["page"]) == (2, 1, 1)
+    assert ok["properties"]["geometry"] == {"x": 20, "y": 50, "width": 80, "height": 30}
+    assert ok["properties"]["text"] == "确定"
+
+
+def test_instantiate_offsets_uids_and_places_into_container():
+    template = make_template()
+
+    tab, ok = template.instantiate((10, 20), first_uid=40, parent=5, page=2)
+
+    assert (tab["uid"], tab["parent"], tab["page"]) == (40, 5, 2)
+    assert (ok["uid"], ok["parent"], ok["page"]) == (41, 40, 1)
+    assert tab["properties"]["geometry"] == {"x": 10, "y": 20, "width": 300, "height": 200}
+    assert ok["properties"]["geometry"] == {"x": 30, "y": 70, "width": 80, "height": 30}
+    # 模板本身不被修改，可以多次放置
+    assert template.records[1]["properties"]["geometry"]["x"] == 20
+
+
+def test_library_saves_and_loads(tmp_path):
+    library = TemplateLibrary()
+    library.load(str(tmp_path))
+    library.save(make_template())
+    (tmp_path / "broken.pqt").write_text("{", encoding="utf-8")
+
+    reloaded = TemplateLibrary()
+    reloaded.load(str(tmp_path))
+
+    template = reloaded.get("template:登录")
+    assert template is not None and template.size == (300, 200)
+    assert template.records == make_template().records
+    assert reloaded.get("QPushButton") is None
@@ -0,0 +1,47 @@
+# 主题编译器测试 - 变量展开、去重和磁盘缓存
+import pytest
+
+from theme_compiler import ThemeCompiler, compile_source
+
+THEME = """
+@accent: #3399ff;
+@border: 1px solid @accent;
+QPushButton { color: @accent; border: @border; color: #FFFFFF; }
+QLabel { border: 1px solid #3399ff; color: #ffffff; }
+"""
+
+
+def test_variables_are_expanded_and_rules_deduplicated():
+    stylesheet = compile_source(THEME)
+    assert stylesheet == "QPushButton,QLabel{border:1px solid #39f;color:#fff}"
+
+
+def test_overrides_replace_variables():
+    assert "#000" in compile_source(THEME, {"accent": "#000000"})
+
+
+@pytest.mark.parametrize("source", ["@a: @b; @b: @a; X { c: @a; }", "X { c: @missing; }"])
+def test_undefined_or_cyclic_variables_raise(source):
+    with pytest.raises(ValueError):
+        compile_source(source)
+
+
+def test_compiled_stylesheet_is_read_from_disk_cache(tmp_path):
+    first = ThemeCompiler(str(tmp_path))
+    stylesheet = first.compile(THEME)
+
+    second = ThemeCompiler(str(tmp_path))
+    assert second.compile(THEME) == stylesheet
+    assert (first.compiled, second.compiled, second.loaded) == (1, 0, 1)
+
+
+def test_styles_compiles_stylesheets_on_first_access(qapp):
+    import styles
+    styles.__dict__.pop("DARK_STYLESHEET", None)
+
+    stylesheet = styles.DARK_STYLESHEET
+
+    assert stylesheet == compile_source(styles.DARK_THEME)
+    assert styles.__dict__["DARK_STYLESHEET"] is stylesheet
+    with pytest.raises(AttributeError):
+        styles.MISSING_STYLESHEET
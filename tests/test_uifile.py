@@ -0,0 +1,91 @@
+# .ui 文件测试 - 写出时转义特殊字符，导入后与原控件一致
+import io
+
+from uifile import UiWriter, iter_ui_records
+
+SPECIAL = 'say "hi" & <b>]]></b> \'单引号\''
+
+
+def test_writer_escapes_text_and_attributes():
+    out = io.StringIO()
+    writer = UiWriter(out)
+    writer.start("widget", {"class": "QLabel", "name": 'a"<&>'})
+    writer.string_property("text", SPECIAL)
+    writer.end("widget")
+
+    xml = out.getvalue()
+    assert "<b>" not in xml and 'a"<' not in xml
+    assert "&amp;" in xml and "&lt;" in xml
+
+
+UNKNOWN_UI = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <widget class="QFrame" name="frame">
+   <property name="geometry"><rect><x>10</x><y>10</y><width>200</width><height>150</height></rect></property>
+   <property name="frameShape"><enum>QFrame::StyledPanel</enum></property>
+   <widget class="QPushButton" name="ok">
+    <property name="geometry"><rect><x>5</x><y>5</y><width>80</width><height>30</height></rect></property>
+    <property name="text"><string>OK</string></property>
+   </widget>
+  </widget>
+  <widget class="QDoubleSpinBox" name="dbl">
+   <property name="geometry"><rect><x>10</x><y>200</y><width>100</width><height>30</height></rect></property>
+   <property name="value"><double>1.5</double></property>
+   <property name="toolTip"><string>tip</string></property>
+  </widget>
+ </widget>
+</ui>
+"""
+
+
+def test_unknown_classes_import_as_placeholders(qapp, tmp_path):
+    from designer import CodeGenerator, DesignCanvas
+    file_name = tmp_path / "unknown.ui"
+    file_name.write_text(UNKNOWN_UI, encoding="utf-8")
+
+    records = list(iter_ui_records(str(file_name)))
+
+    frame, ok, dbl = records
+    assert frame["widget_type"] == dbl["widget_type"] == "QLabel"
+    assert frame["properties"]["uiClass"] == "QFrame"
+    assert "frameShape" not in frame["properties"]
+    assert dbl["properties"]["uiClass"] == "QDoubleSpinBox"
+    assert "value" not in dbl["properties"] and dbl["properties"]["toolTip"] == "tip"
+    assert ok["widget_type"] == "QPushButton" and ok["parent"] is None
+
+    # 生成的代码可以直接运行
+    canvas = DesignCanvas()
+    canvas.load_records([(None, record) for record in records])
+    namespace = {"__name__": "generated"}
+    exec(compile(CodeGenerator(canvas).generate_python_code(), "generated.py", "exec"), namespace)
+    window = namespace["MyWindow"]()
+    window.close()
+
+
+def test_generated_ui_imports_back(qapp, tmp_path):
+    from designer import CodeGenerator, DesignCanvas
+    records = [
+        {"uid": 1, "widget_type": "QGroupBox", "parent": None,
+         "properties": {"geometry": {"x": 10, "y": 10, "width": 300, "height": 200},
+                        "title": "A & <B>"}},
+        {"uid": 2, "widget_type": "QPushButton", "parent": None,
+         "properties": {"geometry": {"x": 20, "y": 240, "width": 100, "height": 30},
+                        "text": SPECIAL}},
+        {"uid": 3, "widget_type": "QLabel", "parent": None,
+         "properties": {"geometry": {"x": 20, "y": 300, "width": 100, "height": 30},
+                        "text": "第一行\n第二行 é"}},
+    ]
+    canvas = DesignCanvas()
+    canvas.load_records([(None, record) for record in records])
+    file_name = str(tmp_path / "form.ui")
+    CodeGenerator(canvas).write_ui_code(file_name)
+
+    imported = list(iter_ui_records(file_name))
+
+    assert [(r["uid"], r["widget_type"], r["parent"]) for r in imported] == \
+        [(r["uid"], r["widget_type"], r["parent"]) for r in records]
+    for original, record in zip(records, imported):
+        for name, value in original["properties"].items():
+            assert record["properties"][name] == value
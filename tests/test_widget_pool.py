@@ -0,0 +1,54 @@
+# 控件对象池测试 - 放回的控件恢复默认状态，池中内存不超过预算
+GEOMETRY = {"x": 10, "y": 10, "width": 80, "height": 30}
+
+
+def button(uid, **properties):
+    return {"uid": uid, "widget_type": "QPushButton", "parent": None,
+            "properties": dict(properties, geometry=GEOMETRY)}
+
+
+def test_reused_widget_is_reset_to_defaults(qapp):
+    from designer import DesignCanvas
+    canvas = DesignCanvas()
+    widget, = canvas.load_records([(None, button(1, text="已修改", enabled=False,
+                                                 toolTip="提示"))])
+    canvas.delete_widget(widget)
+    assert canvas.pool.size() == 1 and widget.isHidden()
+
+    reused, = canvas.load_records([(None, button(2))])
+
+    assert reused is widget and canvas.pool.hits == 1
+    assert reused.text() == "按钮" and reused.isEnabled() and reused.toolTip() == ""
+    assert not reused.isHidden()
+
+
+def test_clear_widgets_releases_into_pool(qapp):
+    from designer import DesignCanvas
+    canvas = DesignCanvas()
+    canvas.load_records([(None, button(uid)) for uid in range(1, 4)])
+
+    canvas.clear_widgets()
+
+    assert canvas.widgets == [] and canvas.uids == {} and canvas.pool.size() == 3
+
+
+def test_release_respects_budget_and_pooled_types(qapp):
+    from PyQt5.QtWidgets import QWidget
+    from components import WidgetFactory
+    from widget_pool import POOL_WIDGET_COSTS, WidgetPool
+    owner = QWidget()
+    resets = []
+    pool = WidgetPool(owner, lambda widget, widget_type: resets.append(widget_type),
+                      budget=POOL_WIDGET_COSTS["QPushButton"] + 1)
+
+    first = WidgetFactory.create_widget("QPushButton", owner)
+    second = WidgetFactory.create_widget("QPushButton", owner)
+    assert pool.release("QPushButton", first)
+    assert not pool.release("QPushButton", second)   # 超出预算，销毁
+    assert not pool.release("QTabWidget", WidgetFactory.create_widget("QTabWidget", owner))
+    assert not pool.release("QLabel", WidgetFactory.create_widget("QLabel"))  # 不是画布的子控件
+    assert resets == ["QPushButton"] and pool.memory == POOL_WIDGET_COSTS["QPushButton"]
+
+    assert pool.acquire("QPushButton") is first and pool.memory == 0
+    assert pool.acquire("QPushButton") is not first and pool.misses == 1
+    pool.clear()
@@ -0,0 +1,248 @@
+# 主题编译模块 - 把“变量 + 规则”形式的主题定义编译为精简的 Qt 样式表
+#
+# 主题定义是带变量的样式表：顶层的 `@名称: 值;` 定义变量，规则中的 `@名称` 引用变量，
+# 变量的值中也可以引用其他变量。编译依次进行：
+#   解析      去掉注释，拆分出变量定义和规则（选择器 + 声明列表）
+#   替换变量  展开变量引用，compile_theme 的 variables 参数可以覆盖主题中的变量（用户主题）
+#   去重      同一规则中重复的属性只保留最后一个；完全相同的规则只保留最后一个；
+#             相邻的选择器相同的规则合并，相邻的声明相同的规则合并选择器（只合并相邻的规则，
+#             不改变层叠顺序）
+#   精简      去掉多余的空白和最后一个分号，#rrggbb 写作 #rgb
+# 编译结果按（编译器版本、主题定义、覆盖的变量）的哈希缓存在磁盘上，主题未修改时直接读取。
+#
+# 本模块不依赖 Qt。
+import hashlib
+import json
+import os
+import re
+
+# 编译方式的版本，修改编译方式后递增以使旧缓存失效
+COMPILER_VERSION = 1
+
+THEME_SUFFIX = ".qsst"
+
+# 缓存目录的环境变量（与缩略图缓存相同），缺省为用户缓存目录下的 pyqt5-gui-designer/stylesheets
+CACHE_DIR_ENV = "PQD_CACHE_DIR"
+
+COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+VARIABLE_RE = re.compile(r"@([A-Za-z_][\w-]*)")
+DEFINITION_RE = re.compile(r"\s*@([A-Za-z_][\w-]*)\s*:(.*)", re.S)
+HEX_COLOR_RE = re.compile(r"#([0-9a-fA-F]{6})\b")
+
+
+def default_cache_dir():
+    """编译结果的缓存目录"""
+    base = os.environ.get(CACHE_DIR_ENV)
+    if base:
+        return os.path.join(base, "stylesheets")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pyqt5-gui-designer", "stylesheets")
+
+
+def split_top_level(text, separator):
+    """按 separator 拆分，忽略括号和引号中的 separator"""
+    parts, depth, quote, start = [], 0, None, 0
+    for n, c in enumerate(text):
+        if quote:
+            if c == quote:
+                quote = None
+        elif c in "\"'":
+            quote = c
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == separator and depth == 0:
+            parts.append(text[start:n])
+            start = n + 1
+    parts.append(text[start:])
+    return parts
+
+
+def parse_theme(source):
+    """解析主题定义，返回 (变量 {名称: 值}, 规则 [(选择器, [(属性, 值), ...]), ...])"""
+    text = COMMENT_RE.sub("", source)
+    variables, rules = {}, []
+    pos = 0
+    while True:
+        brace = text.find("{", pos)
+        head = text[pos:] if brace < 0 else text[pos:brace]
+        # 规则之前的 `@名称: 值;` 是变量定义，最后一个分号之后是选择器
+        *definitions, selector = split_top_level(head, ";")
+        for definition in definitions:
+            match = DEFINITION_RE.fullmatch(definition)
+            if match is None:
+                if definition.strip():
+                    raise ValueError(f"无效的变量定义：{definition.strip()}")
+                continue
+            variables[match.group(1)] = match.group(2).strip()
+        if brace < 0:
+            if selector.strip():
+                raise ValueError(f"缺少规则内容：{selector.strip()}")
+            return variables, rules
+        end = text.find("}", brace)
+        if end < 0:
+            raise ValueError(f"规则没有结束：{selector.strip()}")
+        declarations = []
+        for declaration in split_top_level(text[brace + 1:end], ";"):
+            if not declaration.strip():
+                continue
+            name, colon, value = declaration.partition(":")
+            if not colon:
+                raise ValueError(f"无效的声明：{declaration.strip()}")
+            declarations.append((name.strip(), value.strip()))
+        rules.append((selector.strip(), declarations))
+        pos = end + 1
+
+
+def resolve_variables(variables, overrides=None):
+    """展开变量值中引用的变量，overrides 覆盖同名变量"""
+    raw = dict(variables)
+    raw.update(overrides or {})
+    resolved = {}
+
+    def resolve(name, chain):
+        if name in resolved:
+            return resolved[name]
+        if name not in raw:
+            raise ValueError(f"未定义的变量：@{name}")
+        if name in chain:
+            raise ValueError(f"变量循环引用：{' -> '.join('@' + n for n in chain + [name])}")
+        value = VARIABLE_RE.sub(lambda m: resolve(m.group(1), chain + [name]), raw[name])
+        resolved[name] = value
+        return value
+
+    for name in raw:
+        resolve(name, [])
+    return resolved
+
+
+def substitute(value, variables):
+    """把值中的变量引用替换为变量的值"""
+    def replace(match):
+        if match.group(1) not in variables:
+            raise ValueError(f"未定义的变量：@{match.group(1)}")
+        return variables[match.group(1)]
+    return VARIABLE_RE.sub(replace, value)
+
+
+def minify_selector(selector):
+    selector = " ".join(selector.split())
+    return re.sub(r"\s*([,>])\s*", r"\1", selector)
+
+
+def minify_value(value):
+    value = " ".join(value.split())
+    value = re.sub(r"\s*([,()])\s*", r"\1", value)
+    value = re.sub(r"\s*!\s*important", " !important", value)
+
+    def shorten(match):
+        digits = match.group(1).lower()
+        if digits[0::2] == digits[1::2]:
+            return "#" + digits[0::2]
+        return "#" + digits
+    return HEX_COLOR_RE.sub(shorten, value)
+
+
+def unique_declarations(declarations):
+    """重复的属性只保留最后一个（位置也取最后一个，简写属性和分项属性的先后不变）"""
+    seen = set()
+    unique = []
+    for name, value in reversed(declarations):
+        if name not in seen:
+            seen.add(name)
+            unique.append((name, value))
+    return tuple(reversed(unique))
+
+
+def dedupe_rules(rules):
+    """去掉重复的属性和规则，合并相邻的选择器相同或声明相同的规则（不改变层叠顺序）"""
+    rules = [(selector, unique_declarations(declarations)) for selector, declarations in rules]
+    # 完全相同的规则只保留最后一个（前面的会被它覆盖）
+    last = {rule: n for n, rule in enumerate(rules)}
+    rules = [rule for n, rule in enumerate(rules) if last[rule] == n and rule[1]]
+
+    merged = []
+    for selector, declarations in rules:
+        if merged and merged[-1][0] == selector:
+            merged[-1] = (selector, unique_declarations(merged[-1][1] + declarations))
+        elif merged and merged[-1][1] == declarations:
+            merged[-1] = (merged[-1][0] + "," + selector, declarations)
+        else:
+            merged.append((selector, declarations))
+    return merged
+
+
+def render_rules(rules):
+    return "".join(selector + "{" + ";".join(f"{name}:{value}" for name, value in declarations) + "}"
+                   for selector, declarations in rules)
+
+
+def compile_source(source, overrides=None):
+    """编译主题定义（不使用缓存），返回精简的样式表"""
+    variables, rules = parse_theme(source)
+    variables = resolve_variables(variables, overrides)
+    compiled = [(minify_selector(selector),
+                 [(name.lower(), minify_value(substitute(value, variables)))
+                  for name, value in declarations])
+                for selector, declarations in rules]
+    return render_rules(dedupe_rules(compiled))
+
+
+class ThemeCompiler:
+    """带缓存的主题编译器 - 编译结果按主题定义的哈希缓存在内存和磁盘上"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.cache = {}   # 哈希 -> 样式表
+        self.compiled = self.loaded = 0   # 统计：编译次数、从磁盘缓存读取的次数
+
+    def _key(self, source, overrides):
+        overrides = json.dumps(overrides or {}, sort_keys=True, ensure_ascii=False)
+        data = f"{COMPILER_VERSION}\0{overrides}\0{source}"
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir or default_cache_dir(), key[:2], key + ".qss")
+
+    def compile(self, source, overrides=None):
+        """编译主题定义，overrides 为覆盖的变量 {名称: 值}，返回精简的样式表"""
+        key = self._key(source, overrides)
+        if key in self.cache:
+            return self.cache[key]
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stylesheet = f.read()
+            self.loaded += 1
+        except OSError:
+            stylesheet = compile_source(source, overrides)
+            self.compiled += 1
+            self._save(path, stylesheet)
+        self.cache[key] = stylesheet
+        return stylesheet
+
+    def compile_file(self, file_name, overrides=None):
+        """编译主题文件（*.qsst）"""
+        with open(file_name, "r", encoding="utf-8") as f:
+            return self.compile(f.read(), overrides)
+
+    def _save(self, path, stylesheet):
+        """原子地写入缓存，缓存目录不可写时只保留在内存中"""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_name = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_name, "w", encoding="utf-8") as f:
+                f.write(stylesheet)
+            os.replace(tmp_name, path)
+        except OSError:
+            pass
+
+
+# 全局主题编译器
+THEME_COMPILER = ThemeCompiler()
+
+
+def compile_theme(source, variables=None):
+    """用全局编译器编译主题定义，variables 覆盖主题中的变量"""
+    return THEME_COMPILER.compile(source, variables)
@@ -0,0 +1,147 @@
+# 控件缩略图模块 - 为控件库渲染真实控件的缩略图，并缓存在磁盘上
+#
+# 缩略图按 (控件类型, 界面风格, Qt 版本, 设备像素比, 尺寸) 缓存为 PNG 文件。读取和解码缓存、
+# 编码和写入新缩略图都在后台线程中进行（QImage 可以在任意线程中使用）；只有创建控件并
+# 抓取图像必须在界面线程中进行，这部分在空闲时分片执行，每片不超过 THUMBNAIL_TIME_SLICE
+# 毫秒，控件库始终可以响应输入。再次启动时缩略图直接从磁盘缓存读取，不再创建控件。
+import hashlib
+import os
+import time
+from collections import deque
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import (Qt, QObject, QSize, QTimer, QStandardPaths, pyqtSignal,
+                          QT_VERSION_STR)
+from PyQt5.QtGui import QImage
+
+from components import WidgetFactory
+from styles import design_palette
+
+# 缩略图的逻辑尺寸
+THUMBNAIL_SIZE = QSize(48, 32)
+
+# 界面线程中每片渲染的最长时间（毫秒）
+THUMBNAIL_TIME_SLICE = 8
+
+# 缩略图绘制方式的版本，修改绘制方式后递增以使旧缓存失效
+THUMBNAIL_VERSION = 1
+
+# 缓存目录的环境变量，缺省为系统缓存目录下的 pyqt5-gui-designer/thumbnails
+CACHE_DIR_ENV = "PQD_CACHE_DIR"
+
+
+def default_cache_dir():
+    """缩略图缓存目录"""
+    base = os.environ.get(CACHE_DIR_ENV)
+    if base:
+        return os.path.join(base, "thumbnails")
+    base = QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation)
+    return os.path.join(base, "pyqt5-gui-designer", "thumbnails")
+
+
+def render_thumbnail(widget_type, size, device_pixel_ratio=1.0):
+    """创建控件（默认尺寸和初始状态）并抓取图像，缩放到缩略图尺寸，返回 QImage"""
+    widget = WidgetFactory.create_widget(widget_type, None)
+    widget.setAttribute(Qt.WA_DontShowOnScreen)
+    widget.setPalette(design_palette())   # 与画布上的控件一致，不随界面主题变化
+    widget.resize(*WidgetFactory.default_size(widget_type))
+    widget.ensurePolished()
+    image = widget.grab().toImage()
+    widget.deleteLater()
+    image = image.scaled(size * device_pixel_ratio, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    image.setDevicePixelRatio(device_pixel_ratio)
+    return image
+
+
+class ThumbnailCache(QObject):
+    """控件缩略图缓存 - 后台线程读写磁盘缓存，界面线程分片渲染缺失的缩略图
+
+    request() 之后，每个控件类型的缩略图可用时发出 thumbnail_ready(控件类型, QImage)。
+    """
+
+    thumbnail_ready = pyqtSignal(str, QImage)
+    _missing = pyqtSignal(str, float)   # 后台线程 -> 界面线程：磁盘缓存中没有该缩略图
+
+    def __init__(self, cache_dir=None, size=THUMBNAIL_SIZE, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.size = size
+        # concurrent.futures 在创建缓存（首帧之后）时才导入，不增加启动时间
+        from concurrent.futures import ThreadPoolExecutor
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnails")
+        self.pending = deque()   # 等待在界面线程中渲染的 (控件类型, 设备像素比)
+        self.loaded = 0      # 从磁盘缓存读取的缩略图数
+        self.rendered = 0    # 渲染的缩略图数
+        self.render_time = 0.0
+        self.longest_slice = 0.0
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self._render_slice)
+        self._missing.connect(self._queue_render)
+
+    def _path(self, widget_type, device_pixel_ratio):
+        """缩略图的缓存文件路径，由类型、界面风格、Qt 版本、设备像素比和尺寸决定"""
+        style = QApplication.style().objectName()
+        key = (f"{THUMBNAIL_VERSION}|{widget_type}|{style}|{QT_VERSION_STR}|"
+               f"{device_pixel_ratio}|{self.size.width()}x{self.size.height()}")
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, name[:2], name + ".png")
+
+    def request(self, widget_types, device_pixel_ratio=1.0):
+        """请求这些控件类型的缩略图：在后台线程中读取磁盘缓存，缺失的在空闲时渲染"""
+        paths = [(widget_type, self._path(widget_type, device_pixel_ratio))
+                 for widget_type in widget_types]
+        self.executor.submit(self._load, paths, device_pixel_ratio)
+
+    def _load(self, paths, device_pixel_ratio):
+        """后台线程：读取并解码缓存的缩略图"""
+        for widget_type, path in paths:
+            image = QImage(path) if os.path.exists(path) else QImage()
+            if image.isNull():
+                self._missing.emit(widget_type, device_pixel_ratio)
+            else:
+                image.setDevicePixelRatio(device_pixel_ratio)
+                self.loaded += 1
+                self.thumbnail_ready.emit(widget_type, image)
+
+    def _save(self, image, path):
+        """后台线程：编码缩略图并原子地写入缓存"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_name = f"{path}.{os.getpid()}.tmp"
+        if image.save(tmp_name, "PNG"):
+            os.replace(tmp_name, path)
+
+    def _queue_render(self, widget_type, device_pixel_ratio):
+        self.pending.append((widget_type, device_pixel_ratio))
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def _render_slice(self):
+        """界面线程：在一个时间片内渲染尽可能多的缺失缩略图（至少一张），其余留到下一次空闲"""
+        start = time.perf_counter()
+        deadline = start + THUMBNAIL_TIME_SLICE / 1000
+        now = start
+        while self.pending:
+            # 按平均渲染耗时预计下一张会超出时间片时留到下一次空闲
+            if self.rendered and now > start and now + self.render_time / self.rendered > deadline:
+                break
+            widget_type, ratio = self.pending.popleft()
+            image = render_thumbnail(widget_type, self.size, ratio)
+            self.thumbnail_ready.emit(widget_type, image)
+            self.executor.submit(self._save, image, self._path(widget_type, ratio))
+            finished = time.perf_counter()
+            self.rendered += 1
+            self.render_time += finished - now
+            now = finished
+        self.longest_slice = max(self.longest_slice, time.perf_counter() - start)
+        if not self.pending:
+            self.timer.stop()
+
+    def wait(self):
+        """等待后台线程完成已提交的读写（用于退出前和测试）"""
+        self.executor.submit(lambda: None).result()
+
+    def shutdown(self):
+        self.timer.stop()
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,364 @@
+# UI 文件模块 - Qt Designer .ui 格式的流式 XML 写入和读取
+#
+# 写入基于 xml.sax 的 XMLGenerator 逐元素写出，文本和属性值都会正确转义；
+# 读取基于 ElementTree.iterparse 增量解析，处理完的元素随即清除。
+# 两个方向都不需要在内存中构建完整的 DOM 树。
+# xml.sax.saxutils（会导入 urllib.request 等）和 ElementTree 在第一次写入、读取时才导入，
+# 不增加设计器的启动时间。
+import io
+
+from plugins import PLUGINS
+from widget_types import WIDGET_TYPES
+
+# 每一级缩进的字符（与 Qt Designer 一致为一个空格）
+INDENT = " "
+
+# Qt::Alignment 各标志位对应的名称
+ALIGNMENT_FLAGS = [
+    (0x0001, "Qt::AlignLeft"),
+    (0x0002, "Qt::AlignRight"),
+    (0x0004, "Qt::AlignHCenter"),
+    (0x0008, "Qt::AlignJustify"),
+    (0x0020, "Qt::AlignTop"),
+    (0x0040, "Qt::AlignBottom"),
+    (0x0080, "Qt::AlignVCenter"),
+]
+
+# 以字符串保存的枚举属性 -> (.ui 中的枚举前缀, 取值映射)
+ENUM_PROPERTIES = {
+    "orientation": ("Qt::", {"horizontal": "Horizontal", "vertical": "Vertical"}),
+    "tickPosition": ("QSlider::", None),
+    "tabPosition": ("QTabWidget::", None),
+    "layoutMode": ("QListView::", None),
+}
+
+# 在 .ui 中以 <attribute> 而非 <property> 保存的属性
+ATTRIBUTE_PROPERTIES = {"horizontalHeaderVisible", "verticalHeaderVisible"}
+
+# 以 <item> 子元素保存的列表属性
+ITEM_PROPERTIES = {"items"}
+
+# 控件类没有对应的 Qt 属性、以动态属性（stdset="0"）保存的属性
+UI_DYNAMIC_PROPERTIES = {
+    "QLabel": {"uiClass"},
+    "QTableView": {"rowCount", "columnCount"},
+    "QListView": {"itemCount", "itemFile"},
+}
+
+# 已渲染属性片段的缓存上限
+PROPERTY_CACHE_SIZE = 4096
+
+# (缩进, 标签, 属性名, 是否动态属性, 值元素) -> 渲染好的 XML 片段
+_property_cache = {}
+
+
+def alignment_set(value):
+    """将 Qt::Alignment 标志位转换为 .ui 的 <set> 文本"""
+    names = [name for flag, name in ALIGNMENT_FLAGS if value & flag]
+    return "|".join(names) or "Qt::AlignLeft"
+
+
+class UiWriter:
+    """带缩进的流式 .ui XML 写入器"""
+
+    def __init__(self, out, depth=0):
+        from xml.sax.saxutils import XMLGenerator
+        self.gen = XMLGenerator(out, "UTF-8", short_empty_elements=True)
+        self.depth = depth
+        self._open = []  # 栈：每个打开的元素是否已有子元素
+
+    def start_document(self):
+        """写出 XML 声明"""
+        self.gen.startDocument()
+
+    def _newline(self):
+        self.gen.ignorableWhitespace("\n" + INDENT * self.depth)
+
+    def start(self, tag, attrs=None):
+        """打开一个元素"""
+        if self._open:
+            self._open[-1] = True
+        if self._open or self.depth:
+            self._newline()
+        self.gen.startElement(tag, attrs or {})
+        self._open.append(False)
+        self.depth += 1
+
+    def end(self, tag):
+        """关闭一个元素，有子元素时换行对齐"""
+        self.depth -= 1
+        if self._open.pop():
+            self._newline()
+        self.gen.endElement(tag)
+
+    def element(self, tag, text=None, attrs=None):
+        """写出一个只包含文本的元素"""
+        self.start(tag, attrs)
+        if text is not None:
+            self.gen.characters(str(text))
+        self.depth -= 1
+        self._open.pop()
+        self.gen.endElement(tag)
+
+    def rect(self, name, x, y, width, height):
+        """写出矩形属性"""
+        self.start("property", {"name": name})
+        self.start("rect")
+        self.element("x", x)
+        self.element("y", y)
+        self.element("width", width)
+        self.element("height", height)
+        self.end("rect")
+        self.end("property")
+
+    def string_property(self, name, text, tag="property"):
+        """写出字符串属性"""
+        self.start(tag, {"name": name})
+        self.element("string", text)
+        self.end(tag)
+
+    def raw(self, text):
+        """写出已经生成好的 XML 片段（作为当前元素的子元素）"""
+        if self._open:
+            self._open[-1] = True
+        self.gen.ignorableWhitespace(text)
+
+    def raw_start(self, text):
+        """写出以未闭合的开始标签为首的 XML 片段，之后由 end() 闭合"""
+        self.raw(text)
+        self._open.append(True)
+        self.depth += 1
+
+    def font(self, font):
+        """写出字体值"""
+        self.start("font")
+        self.element("family", font.family())
+        self.element("pointsize", font.pointSize())
+        self.element("bold", "true" if font.bold() else "false")
+        self.element("italic", "true" if font.italic() else "false")
+        self.end("font")
+
+    def widget_property(self, name, value, dynamic=False):
+        """写出控件的一个属性（包括 <attribute> 和列表项），无法表示的值被跳过
+
+        dynamic 为真时作为动态属性写出，加载 .ui 时通过 setProperty() 设置。
+        """
+        if value is None:
+            return
+        if name in ITEM_PROPERTIES:
+            for item in value:
+                self.start("item")
+                self.string_property("text", item)
+                self.end("item")
+            return
+
+        tag = "attribute" if name in ATTRIBUTE_PROPERTIES else "property"
+        attrs = {"name": name, "stdset": "0"} if dynamic else {"name": name}
+        if hasattr(value, "pointSize") and hasattr(value, "family"):
+            self.start(tag, attrs)
+            self.font(value)
+            self.end(tag)
+            return
+
+        element = value_element(name, value)
+        if element:
+            # 相同缩进下相同的属性渲染结果相同，大多数控件的属性取默认值，直接复用
+            key = (self.depth, tag, name, dynamic, element)
+            text = _property_cache.get(key)
+            if text is None:
+                if len(_property_cache) >= PROPERTY_CACHE_SIZE:
+                    _property_cache.clear()
+                buffer = io.StringIO()
+                writer = UiWriter(buffer, self.depth)
+                writer.start(tag, attrs)
+                writer.element(*element)
+                writer.end(tag)
+                text = _property_cache[key] = buffer.getvalue()
+            self.raw(text)
+
+
+def value_element(name, value):
+    """返回属性值对应的 (元素名, 文本)，无法在 .ui 中表示时返回 None"""
+    if isinstance(value, bool):
+        return ("bool", "true" if value else "false")
+    if name == "alignment":
+        return ("set", alignment_set(int(value)))
+    if name in ENUM_PROPERTIES and isinstance(value, str):
+        prefix, mapping = ENUM_PROPERTIES[name]
+        if mapping:
+            value = mapping.get(value.lower(), value)
+        return ("enum", prefix + value)
+    if isinstance(value, int):
+        return ("number", value)
+    if isinstance(value, float):
+        return ("double", repr(value))
+    if isinstance(value, str):
+        return ("string", value)
+    return None
+
+
+# 导入时不作为控件记录的类（窗体本身、菜单栏、状态栏等）
+SKIPPED_CLASSES = {"QMainWindow", "QMenuBar", "QStatusBar", "QToolBar", "QDockWidget"}
+
+# 不支持的控件类导入为占位控件（与 WidgetFactory.create_widget 的占位控件相同的标签），
+# 原来的类名保存在动态属性 uiClass 中，只保留标签也有的属性
+PLACEHOLDER_TYPE = "QLabel"
+PLACEHOLDER_CLASS_PROPERTY = "uiClass"
+PLACEHOLDER_PROPERTIES = {"objectName", "geometry", "enabled", "toolTip", "font"}
+
+# 由布局管理、没有 geometry 的控件在容器内依次向下排列的行高
+LAYOUT_ROW_HEIGHT = 40
+
+# .ui 中的对齐标志名 -> 标志位
+ALIGNMENT_VALUES = {name: flag for flag, name in ALIGNMENT_FLAGS}
+
+
+def _parse_value(name, element):
+    """将 .ui 中的属性值元素转换为项目记录中的属性值，无法识别时返回 None"""
+    tag = element.tag
+    text = element.text or ""
+    if tag == "string":
+        return text
+    if tag == "bool":
+        return text == "true"
+    if tag == "number":
+        return int(text)
+    if tag == "double":
+        return float(text)
+    if tag == "rect":
+        return {child.tag: int(child.text) for child in element}
+    if tag == "set" and name == "alignment":
+        return sum(ALIGNMENT_VALUES.get(part, 0) for part in text.split("|"))
+    if tag == "enum":
+        value = text.split("::")[-1]
+        mapping = ENUM_PROPERTIES.get(name, (None, None))[1]
+        if mapping:
+            value = next((k for k, v in mapping.items() if v == value), value)
+        return value
+    if tag == "font":
+        fields = {child.tag: child.text for child in element}
+        return {"__font__": "{},{},-1,5,{},{},0,0,0,0".format(
+            fields.get("family", ""), fields.get("pointsize", -1),
+            75 if fields.get("bold") == "true" else 50,
+            1 if fields.get("italic") == "true" else 0)}
+    return None
+
+
+class _OpenWidget:
+    """解析过程中一个尚未结束的 <widget> 元素"""
+
+    __slots__ = ("record", "origin", "emitted", "next_row", "container", "page", "pages")
+
+    def __init__(self, record, origin, container=None, page=None):
+        self.record = record        # 控件记录，窗体、选项卡页面等元素为 None
+        self.origin = origin        # 子控件几何的参考原点（相对窗体）
+        self.emitted = False        # 记录是否已经产出
+        self.next_row = 0           # 下一个由布局管理的子控件的纵向偏移
+        self.container = container  # 子控件记录的 parent
+        self.page = page            # 子控件所在的选项卡页码
+        self.pages = 0              # 已经出现的选项卡页面数
+
+
+def iter_ui_records(source, first_uid=1):
+    """增量解析 .ui 文件，逐个产出控件记录
+
+    记录格式与项目文件相同：{"uid", "widget_type", "properties", "parent"}，
+    嵌套控件的几何换算为相对窗体的绝对坐标，parent 指向外层控件记录的 uid，
+    选项卡页面中的控件还带有所在的页码 "page"。不支持的控件类（既不是内置控件类型也
+    不是插件控件）导入为占位标签，见 PLACEHOLDER_TYPE。
+    每个元素处理完后立即从其父元素中移除，解析大文件时内存占用保持平稳。
+    """
+    import xml.etree.ElementTree as ET
+    elements = []  # 当前打开的元素栈
+    widgets = []   # 当前打开的 _OpenWidget 栈
+    uid = first_uid
+
+    def emit(widget):
+        """补全布局管理控件的位置并标记为已产出"""
+        widget.emitted = True
+        properties = widget.record["properties"]
+        if "geometry" not in properties:
+            container = widgets[-2] if len(widgets) > 1 else None
+            x, y = container.origin if container else (0, 0)
+            offset = container.next_row if container else 0
+            properties["geometry"] = {"x": x, "y": y + offset}
+            widget.origin = (x, y + offset)
+            if container:
+                container.next_row += LAYOUT_ROW_HEIGHT
+        return widget.record
+
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if element.tag == "widget":
+                parent = widgets[-1] if widgets else None
+                parent_record = parent.record if parent else None
+
+                # 子控件出现前先产出父控件，保证父控件记录在前
+                if parent_record and not parent.emitted:
+                    yield emit(parent)
+
+                # 窗体本身、中央控件和选项卡页面只作为容器，不生成记录
+                widget_class = element.get("class", "")
+                origin = parent.origin if parent else (0, 0)
+                if (widget_class == "QWidget" and parent_record and
+                        parent_record["widget_type"] == "QTabWidget"):
+                    widgets.append(_OpenWidget(None, origin, parent_record["uid"], parent.pages))
+                    parent.pages += 1
+                elif widget_class in SKIPPED_CLASSES or (widget_class == "QWidget" and parent_record is None):
+                    # 其中的控件仍属于外层容器
+                    widgets.append(_OpenWidget(None, origin, parent.container if parent else None,
+                                               parent.page if parent else None))
+                else:
+                    record = {
+                        "uid": uid,
+                        "widget_type": widget_class,
+                        "properties": {"objectName": element.get("name", "")},
+                        "parent": parent.container if parent else None,
+                    }
+                    if widget_class not in WIDGET_TYPES and widget_class not in PLUGINS:
+                        record["widget_type"] = PLACEHOLDER_TYPE
+                        record["properties"].update({"text": f"未知控件: {widget_class}",
+                                                     PLACEHOLDER_CLASS_PROPERTY: widget_class})
+                    if parent and parent.page is not None:
+                        record["page"] = parent.page
+                    if record["widget_type"] == PLACEHOLDER_TYPE and widget_class != PLACEHOLDER_TYPE:
+                        # 占位控件不是容器，其中的控件仍属于外层容器
+                        widgets.append(_OpenWidget(record, origin, record["parent"], record.get("page")))
+                    else:
+                        widgets.append(_OpenWidget(record, origin, uid))
+                    uid += 1
+            elements.append(element)
+            continue
+
+        elements.pop()
+        parent = elements[-1] if elements else None
+        tag = element.tag
+
+        if tag == "widget":
+            widget = widgets[-1]
+            if widget.record and not widget.emitted:
+                yield emit(widget)
+            widgets.pop()
+        elif parent is not None and parent.tag == "widget" and widgets[-1].record:
+            widget = widgets[-1]
+            placeholder = PLACEHOLDER_CLASS_PROPERTY in widget.record["properties"]
+            if tag in ("property", "attribute") and len(element):
+                name = element.get("name")
+                value = _parse_value(name, element[0])
+                if placeholder and name not in PLACEHOLDER_PROPERTIES:
+                    value = None
+                if value is not None:
+                    if name == "geometry":
+                        # 换算为相对窗体的坐标，子控件以此为原点
+                        value["x"] += widget.origin[0]
+                        value["y"] += widget.origin[1]
+                        widget.origin = (value["x"], value["y"])
+                    widget.record["properties"][name] = value
+            elif tag == "item" and not placeholder:
+                text = element.find("property/string")
+                if text is not None:
+                    widget.record["properties"].setdefault("items", []).append(text.text or "")
+
+        # 已处理完的元素从所属的控件、布局或根元素中移除，释放内存
+        if parent is not None and parent.tag in ("widget", "layout", "ui"):
+            parent.remove(element)
@@ -0,0 +1,118 @@
+# 控件对象池模块 - 按类型缓存隐藏的、已恢复为默认状态的画布控件
+#
+# 新建、复制和加载控件时先从池中取出同类型的控件，删除控件和新建项目时把控件恢复为默认属性后
+# 放回池中，清空并重新加载大型项目时不必反复创建和销毁原生控件。池中控件占用的内存（按类型
+# 估算）不超过预算，超出预算的控件照常销毁；池中数量低于目标的类型在空闲时分片补足。
+#
+# 只有全部状态都由默认属性描述的控件类型进入对象池；选项卡（页面随控件加载增加）、
+# 带模型的视图、表格和插件控件照常创建和销毁。
+import time
+from collections import deque
+
+from PyQt5.QtCore import QObject, QTimer
+
+from components import WidgetFactory
+
+# 进入对象池的控件类型 -> 每个控件估算占用的内存（字节，offscreen 平台下实测后取整）
+POOL_WIDGET_COSTS = {
+    "QPushButton": 2048,
+    "QLabel": 2048,
+    "QLineEdit": 6144,
+    "QTextEdit": 28672,
+    "QCheckBox": 2048,
+    "QRadioButton": 2048,
+    "QComboBox": 8192,
+    "QSpinBox": 8192,
+    "QSlider": 2048,
+    "QGroupBox": 4096,
+    "QListWidget": 16384,
+}
+
+# 对象池的内存预算（字节）
+POOL_MEMORY_BUDGET = 16 * 1024 * 1024
+
+# 空闲时每种类型补足到的控件数
+POOL_REFILL_TARGET = 8
+
+# 空闲时每片补足的最长时间（毫秒）
+POOL_REFILL_SLICE = 4
+
+
+class WidgetPool(QObject):
+    """控件对象池 - 池中的控件是 owner 的隐藏子控件
+
+    reset(控件, 控件类型) 在控件放回池中之前把它恢复为新建时的状态。
+    """
+
+    def __init__(self, owner, reset, budget=POOL_MEMORY_BUDGET, target=POOL_REFILL_TARGET):
+        super().__init__(owner)
+        self.owner = owner
+        self.reset = reset
+        self.budget = budget
+        self.target = target
+        self.free = {widget_type: deque() for widget_type in POOL_WIDGET_COSTS}
+        self.memory = 0       # 池中控件估算占用的内存
+        self.hits = 0         # 从池中取出的次数
+        self.misses = 0       # 池中没有可用控件而新建的次数
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self._refill_slice)
+
+    def acquire(self, widget_type):
+        """取出一个控件（隐藏，默认状态），池中没有时新建"""
+        free = self.free.get(widget_type)
+        if free:
+            self.hits += 1
+            self.memory -= POOL_WIDGET_COSTS[widget_type]
+            widget = free.pop()
+            if len(free) < self.target:
+                self.schedule_refill()
+            return widget
+        if free is not None:
+            self.misses += 1
+            self.schedule_refill()
+        return WidgetFactory.create_widget(widget_type, self.owner)
+
+    def release(self, widget_type, widget):
+        """放回一个已从画布移除的控件：恢复默认状态后隐藏，不能放入池中时销毁"""
+        cost = POOL_WIDGET_COSTS.get(widget_type)
+        if cost is None or self.memory + cost > self.budget or widget.parent() is not self.owner:
+            widget.deleteLater()
+            return False
+        widget.hide()
+        self.reset(widget, widget_type)
+        self.free[widget_type].append(widget)
+        self.memory += cost
+        return True
+
+    def schedule_refill(self):
+        """在空闲时把各类型补足到目标数量"""
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def _refill_slice(self):
+        start = time.perf_counter()
+        deadline = start + POOL_REFILL_SLICE / 1000
+        for widget_type, free in self.free.items():
+            cost = POOL_WIDGET_COSTS[widget_type]
+            while len(free) < self.target and self.memory + cost <= self.budget:
+                widget = WidgetFactory.create_widget(widget_type, self.owner)
+                widget.hide()
+                free.append(widget)
+                self.memory += cost
+                if time.perf_counter() > deadline:
+                    return
+        self.timer.stop()
+
+    def size(self):
+        """池中的控件总数"""
+        return sum(len(free) for free in self.free.values())
+
+    def clear(self):
+        """销毁池中的全部控件"""
+        self.timer.stop()
+        for free in self.free.values():
+            while free:
+                free.pop().deleteLater()
+        self.memory = 0
@@ -0,0 +1,64 @@
+# 控件类型表 - 积木库中的控件类型、容器类型、模型控件和默认尺寸
+#
+# 这些表只是数据，界面（components、designer）和无界面的脚本接口（scripting）共用。
+# 插件控件类型由 components.load_plugins 加入 WIDGET_TYPES。
+#
+# 本模块不依赖 Qt。
+
+# 可用的控件类型 - 积木库
+WIDGET_TYPES = {
+    "QPushButton": {"icon": "🔘", "text": "按钮", "description": "可点击的按钮控件"},
+    "QLabel": {"icon": "🏷️", "text": "标签", "description": "显示文本或图像的标签"},
+    "QLineEdit": {"icon": "📝", "text": "单行文本框", "description": "输入单行文本的控件"},
+    "QTextEdit": {"icon": "📄", "text": "多行文本框", "description": "输入多行文本的控件"},
+    "QCheckBox": {"icon": "✅", "text": "复选框", "description": "可选中/取消选中的控件"},
+    "QRadioButton": {"icon": "⭕", "text": "单选按钮", "description": "互斥选择的单选按钮"},
+    "QComboBox": {"icon": "📋", "text": "下拉框", "description": "下拉选择控件"},
+    "QSpinBox": {"icon": "🔢", "text": "数字输入", "description": "输入数值的控件"},
+    "QSlider": {"icon": "📊", "text": "滑块", "description": "滑动选择数值的控件"},
+    "QGroupBox": {"icon": "📦", "text": "分组框", "description": "对控件进行分组的容器"},
+    "QTabWidget": {"icon": "📑", "text": "选项卡", "description": "带标签页切换的容器"},
+    "QTableWidget": {"icon": "🗓️", "text": "表格", "description": "表格数据控件"},
+    "QTableView": {"icon": "🧮", "text": "数据表格", "description": "按需加载数据的大型表格"},
+    "QListWidget": {"icon": "📜", "text": "列表", "description": "列表数据控件"},
+    "QListView": {"icon": "📃", "text": "数据列表", "description": "从文件或生成器按需加载的大型列表"},
+}
+
+# 可以包含其他控件的容器类型
+CONTAINER_TYPES = {"QGroupBox", "QTabWidget"}
+
+# 新建选项卡控件的默认页数
+TAB_PAGE_COUNT = 2
+
+# 由模型提供数据的控件类型 -> (模型类名, 设置在模型上的属性)；这些属性按顺序作为模型的构造参数
+MODEL_TYPES = {
+    "QTableView": ("LazyTableModel", ("rowCount", "columnCount")),
+    "QListView": ("LazyListModel", ("itemCount", "itemFile")),
+}
+MODEL_PROPERTIES = {name for _, names in MODEL_TYPES.values() for name in names}
+
+
+def tab_page_title(index):
+    """选项卡第 index 页（从 0 开始）的默认标题"""
+    return f"标签页{index + 1}"
+
+
+# 未注册尺寸的控件类型的默认尺寸 (宽, 高)
+DEFAULT_SIZE = (100, 30)
+
+# 控件类型 -> 默认尺寸 (宽, 高)，未列出的类型为 DEFAULT_SIZE
+DEFAULT_SIZES = {
+    "QTextEdit": (200, 120),
+    "QSlider": (150, 30),
+    "QGroupBox": (200, 150),
+    "QTabWidget": (250, 180),
+    "QTableWidget": (250, 200),
+    "QTableView": (250, 200),
+    "QListWidget": (150, 180),
+    "QListView": (150, 180),
+}
+
+
+def default_size(widget_type):
+    """控件类型的默认尺寸 (宽, 高)"""
+    return DEFAULT_SIZES.get(widget_type, DEFAULT_SIZE)